@@ -1,17 +1,90 @@
+import os
+from typing import Optional
+
 from domain.service.rag_service_impl import RAGServiceImpl
 from domain.port.media_repository import MediaRepository
-from config.rag_config import VECTOR_DB_CONFIG, TEXT_EMBEDDING_MODELS, PERFORMANCE_CONFIG
+from domain.port.vector_index import VectorIndex
+from domain.port.neighbour_graph import NeighbourGraph
+from domain.port.review_repository import ReviewRepository
+from domain.service.content_catalog_linker import ContentCatalogLinker
+from config.rag_config import VECTOR_DB_CONFIG, TEXT_EMBEDDING_MODELS, PERFORMANCE_CONFIG, SEARCH_CONFIG, GENERATION_CONFIG
+
+
+def create_vector_index(db_path: str, name: str, storage_mode: str) -> Optional[VectorIndex]:
+    """Build the compressed in-process index for a storage mode, None for the default ChromaDB float32 storage."""
+    if storage_mode == "float32":
+        return None
+
+    from infrastructure.adapter.quantized_vector_index import QuantizedVectorIndex
+
+    storage = VECTOR_DB_CONFIG["storage"]
+    return QuantizedVectorIndex(
+        os.path.join(db_path, f"{name}_{storage_mode}"),
+        mode=storage_mode,
+        pq_subvector_dim=storage["pq_subvector_dim"],
+        pq_centroids=storage["pq_centroids"],
+        rerank_candidates=storage["rerank_candidates"]
+    )
+
 
+def load_neighbour_graph(graph_path: Optional[str] = None) -> Optional[NeighbourGraph]:
+    """Open the offline kNN graph if it has been built, None otherwise."""
+    from infrastructure.adapter.knn_graph import KnnGraph
 
-def create_rag_service(media_repository: MediaRepository, db_path=None, text_model=None, enable_visual=False, batch_size=None, ensure_index=True) -> RAGServiceImpl:
+    graph_path = graph_path or SEARCH_CONFIG["similar_items"]["graph_path"]
+    if not KnnGraph.exists(graph_path):
+        return None
+    try:
+        return KnnGraph(graph_path)
+    except Exception as e:
+        print(f"Error loading kNN graph from {graph_path}: {e}")
+        return None
+
+
+def connect_social_graph(media_repository: MediaRepository, review_repository: Optional[ReviewRepository] = None) -> Optional[ReviewRepository]:
+    """Link the community Content nodes to the catalog and return the repository, None if Neo4j is unavailable."""
+    if not SEARCH_CONFIG["social_boost"]["enabled"]:
+        return None
+    try:
+        if review_repository is None:
+            from infrastructure.adapter.neo4j_review_repository import Neo4jReviewRepository
+            review_repository = Neo4jReviewRepository(ensure_schema=False)
+        linked = ContentCatalogLinker(media_repository, review_repository).sync()
+        if linked:
+            print(f"Updated the catalog link of {linked} community content nodes")
+        return review_repository
+    except Exception as e:
+        print(f"Social ranking disabled, Neo4j unavailable: {e}")
+        return None
+
+
+def create_rag_service(media_repository: MediaRepository, db_path=None, text_model=None, enable_visual=False, batch_size=None, ensure_index=True, storage_mode=None, social_graph: Optional[ReviewRepository] = None) -> RAGServiceImpl:
     """Factory that instantiates the default RAG service used by the UI and backend.
     Set ensure_index=False in the UI to avoid re-indexing on every instantiation.
+    Set storage_mode to 'float16' or 'pq' to keep compressed vectors in RAM instead of ChromaDB.
+    Pass social_graph (see connect_social_graph) to boost items the user's friends rated highly.
     """
+    db_path = db_path or VECTOR_DB_CONFIG["db_path"]
+    storage_mode = storage_mode or VECTOR_DB_CONFIG["storage"]["mode"]
+    social_boost = SEARCH_CONFIG["social_boost"]
+
     return RAGServiceImpl(
         media_repository,
-        db_path=db_path or VECTOR_DB_CONFIG["db_path"],
+        db_path=db_path,
         text_model=text_model or TEXT_EMBEDDING_MODELS["fast"],
         enable_visual=enable_visual,
         batch_size=batch_size or PERFORMANCE_CONFIG["batch_size"],
-        ensure_index=ensure_index
-    ) 
\ No newline at end of file
+        ensure_index=ensure_index,
+        text_index=create_vector_index(db_path, "text_embeddings", storage_mode),
+        visual_index=create_vector_index(db_path, "visual_embeddings", storage_mode) if enable_visual else None,
+        similar_items_table_size=SEARCH_CONFIG["similar_items"]["precomputed_items"],
+        similar_items_table_k=SEARCH_CONFIG["similar_items"]["precomputed_neighbours"],
+        neighbour_graph=load_neighbour_graph(),
+        generation_model=GENERATION_CONFIG["cohere"]["model"],
+        max_context_tokens=GENERATION_CONFIG["context"]["max_context_tokens"],
+        max_description_tokens=GENERATION_CONFIG["context"]["max_description_tokens"],
+        social_graph=social_graph,
+        social_boost_weight=social_boost["weight"],
+        social_candidate_factor=social_boost["candidate_factor"],
+        social_full_weight_ratings=social_boost["full_weight_ratings"]
+    )
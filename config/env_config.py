@@ -8,14 +8,26 @@ class EnvConfig:
     load_dotenv()
     _cohere_api_key = os.getenv("COHERE_API_KEY")
     _json_history_repository_path = os.getenv("JSON_HISTORY_REPOSITORY")
+    _history_backend = os.getenv("HISTORY_BACKEND", "json")
+    _history_fsync_policy = os.getenv("HISTORY_FSYNC_POLICY", "interval")
+    _history_sqlite_path = os.getenv("HISTORY_SQLITE_PATH")
+    _history_cache_size = int(os.getenv("HISTORY_CACHE_SIZE", "0"))
+    _history_flush_interval = float(os.getenv("HISTORY_FLUSH_INTERVAL", "2.0"))
     _api_host = os.getenv("API_HOST", "127.0.0.1")
     _api_port = os.getenv("API_PORT", "8000")
+    _api_workers = int(os.getenv("API_WORKERS", os.getenv("WEB_CONCURRENCY", "1")))
     _api_url = f"http://{_api_host}:{_api_port}"
     
     # Neo4j configuration
     _neo4j_uri = os.getenv("NEO4J_URI")
     _neo4j_user = os.getenv("NEO4J_USER")
     _neo4j_password = os.getenv("NEO4J_PASSWORD")
+    _neo4j_max_pool_size = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+    _neo4j_acquisition_timeout = float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "30"))
+    _neo4j_liveness_check_timeout = float(os.getenv("NEO4J_LIVENESS_CHECK_TIMEOUT", "30"))
+    _neo4j_max_connection_lifetime = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+    _graphql_cache_ttl = float(os.getenv("GRAPHQL_CACHE_TTL", "30"))
+    _graphql_cache_size = int(os.getenv("GRAPHQL_CACHE_SIZE", "1024"))
 
     @classmethod
     def get_cohere_api_key(cls) -> str:
@@ -29,6 +41,32 @@ class EnvConfig:
             raise ValueError("JSON_HISTORY_REPOSITORY environment variable is not set.")
         return cls._json_history_repository_path
     
+    @classmethod
+    def get_history_backend(cls) -> str:
+        """Chat history storage: 'json' (one JSON file per conversation), 'jsonl' (append-only) or 'sqlite'"""
+        return cls._history_backend
+
+    @classmethod
+    def get_history_fsync_policy(cls) -> str:
+        return cls._history_fsync_policy
+
+    @classmethod
+    def get_history_sqlite_path(cls, storage_folder: str) -> str:
+        """SQLite database of the 'sqlite' backend, history.db in the history folder by default"""
+        return cls._history_sqlite_path or os.path.join(storage_folder, "history.db")
+
+    @classmethod
+    def get_history_cache_size(cls) -> int:
+        """
+        Conversations kept in the write-back cache, 0 (default) disables it.
+        Opt-in: messages are only on disk after the next flush, and it needs a single API worker.
+        """
+        return cls._history_cache_size
+
+    @classmethod
+    def get_history_flush_interval(cls) -> float:
+        return cls._history_flush_interval
+    
     @classmethod
     def get_api_host(cls) -> str:
         return cls._api_host
@@ -41,6 +79,11 @@ class EnvConfig:
     def get_api_port_int(cls) -> int:
         return int(cls._api_port)
 
+    @classmethod
+    def get_api_workers(cls) -> int:
+        """Number of REST API worker processes (API_WORKERS, or uvicorn's WEB_CONCURRENCY)"""
+        return cls._api_workers
+
     @classmethod
     def get_api_url(cls) -> str:
         return cls._api_url
@@ -57,6 +100,29 @@ class EnvConfig:
     def get_neo4j_password(cls) -> str:
         return cls._neo4j_password
     
+    @classmethod
+    def get_neo4j_pool_config(cls) -> dict:
+        """
+        Connection pool options of the Neo4j drivers: pool size, seconds to wait for a free
+        connection, idle seconds after which a connection is checked before use, and
+        seconds after which a connection is replaced
+        """
+        return {
+            "max_connection_pool_size": cls._neo4j_max_pool_size,
+            "connection_acquisition_timeout": cls._neo4j_acquisition_timeout,
+            "liveness_check_timeout": cls._neo4j_liveness_check_timeout,
+            "max_connection_lifetime": cls._neo4j_max_connection_lifetime,
+        }
+
+    @classmethod
+    def get_graphql_cache_ttl(cls) -> float:
+        """Seconds a cached community read may live; bounds staleness across GraphQL workers, 0 disables the cache"""
+        return cls._graphql_cache_ttl
+
+    @classmethod
+    def get_graphql_cache_size(cls) -> int:
+        return cls._graphql_cache_size
+
     @classmethod
     def is_neo4j_configured(cls) -> bool:
         """Check if Neo4j is properly configured"""
@@ -4,6 +4,12 @@ VECTOR_DB_CONFIG = {
         "hnsw_space": "cosine",  # cosine, l2, ip
         "hnsw_construction_ef": 200,  # Higher = better quality, slower build
         "hnsw_search_ef": 100,  # Higher = better recall, slower search
+    },
+    "storage": {
+        "mode": "float32",  # float32 (ChromaDB), float16 or pq (compressed in-process index)
+        "pq_subvector_dim": 8,  # Dimensions per PQ code byte (384-dim text vectors -> 48 bytes)
+        "pq_centroids": 256,  # Centroids per PQ sub-space (max 256)
+        "rerank_candidates": 50,  # Approximate candidates re-scored with exact float32 vectors
     }
 }
 
@@ -30,6 +36,20 @@ SEARCH_CONFIG = {
     "visual_search": {
         "top_k": 8,  # Number of visual results
         "min_similarity": 0.2,
+    },
+    "similar_items": {
+        "top_k": 5,  # Neighbours returned by get_similar_items
+        "precomputed_items": 200,  # Most popular items with a precomputed neighbour table
+        "precomputed_neighbours": 20,  # Neighbours stored per precomputed item
+        "graph_path": "./chroma_db/knn_graph",  # Offline kNN graph (scripts/build_knn_graph.py)
+        "graph_k": 50,  # Neighbours stored per item in the kNN graph
+        "graph_block_size": 2048,  # Rows/columns per matrix multiplication block
+    },
+    "social_boost": {
+        "enabled": True,  # Re-rank results with the friends' ratings from Neo4j (when a user is given)
+        "weight": 0.15,  # Similarity added for a 10/10 average, removed for 0/10
+        "candidate_factor": 3,  # Vector candidates fetched per result before re-ranking
+        "full_weight_ratings": 3,  # Friend ratings needed for the full weight
     }
 }
 
@@ -41,6 +61,10 @@ GENERATION_CONFIG = {
         "max_tokens": 800,
         "k": 5,
         "p": 0.75,
+    },
+    "context": {
+        "max_context_tokens": 1500,  # Token budget of the retrieved items in the preamble
+        "max_description_tokens": 120,  # Token budget of one item description
     }
 }
 
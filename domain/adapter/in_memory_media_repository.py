@@ -2,16 +2,20 @@ from typing import List, Optional
 import numpy as np
 from domain.port.media_repository import MediaRepository
 from domain.model.media_item import MediaItem
+from domain.model.media_filter import MediaFilter
+from domain.adapter.media_metadata_index import MediaMetadataIndex
 
 class InMemoryMediaRepository(MediaRepository):
     def __init__(self):
         self.items: List[MediaItem] = []
         self.embedding_dim = 1024  # Match Cohere's embedding dimension
+        self._metadata_index: Optional[MediaMetadataIndex] = None
         # Initialize with some synthetic data
         self._initialize_synthetic_data()
 
     def add_item(self, item: MediaItem) -> None:
         self.items.append(item)
+        self._metadata_index = None
 
     def get_item_by_id(self, item_id: str) -> Optional[MediaItem]:
         for item in self.items:
@@ -57,6 +61,11 @@ class InMemoryMediaRepository(MediaRepository):
     def get_all_items(self) -> List[MediaItem]:
         return self.items
 
+    def filter_item_ids(self, media_filter: Optional[MediaFilter]) -> Optional[List[str]]:
+        if self._metadata_index is None:
+            self._metadata_index = MediaMetadataIndex(self.items)
+        return self._metadata_index.candidate_ids(media_filter)
+
     def _initialize_synthetic_data(self):
         # Add some synthetic movies and games
         synthetic_data = [
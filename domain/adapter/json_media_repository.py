@@ -1,7 +1,9 @@
 import json
-from typing import List, Optional
+from typing import Dict, List, Optional
 from domain.model.media_item import MediaItem
+from domain.model.media_filter import MediaFilter
 from domain.port.media_repository import MediaRepository
+from domain.adapter.media_metadata_index import MediaMetadataIndex
 import numpy as np
 from numpy.linalg import norm
 
@@ -15,6 +17,8 @@ class JSONMediaRepository(MediaRepository):
             games_path: Path to the JSON file containing game items
         """
         self.media_items: List[MediaItem] = []
+        self._items_by_id: Dict[str, MediaItem] = {}
+        self._metadata_index: Optional[MediaMetadataIndex] = None
         
         # Load movies if path provided
         if movies_path:
@@ -55,6 +59,8 @@ class JSONMediaRepository(MediaRepository):
                 content_for_embedding=item["content_for_embedding"]
             )
             self.media_items.append(media_item)
+            self._items_by_id[media_item.id] = media_item
+        self._metadata_index = None
     
     def _compute_similarity(self, query_embedding: np.ndarray, item_embedding: np.ndarray) -> float:
         """
@@ -142,18 +148,33 @@ class JSONMediaRepository(MediaRepository):
     
     def get_item_by_id(self, id: str) -> Optional[MediaItem]:
         """Get media item by ID."""
-        for item in self.media_items:
-            if item.id == id:
-                return item
-        return None
+        return self._items_by_id.get(id)
     
     def add_item(self, item: MediaItem) -> None:
         """Add a new media item."""
         self.media_items.append(item)
+        self._items_by_id[item.id] = item
+        self._metadata_index = None
     
     def update_item(self, item: MediaItem) -> None:
         """Update an existing media item."""
         for i, existing_item in enumerate(self.media_items):
             if existing_item.id == item.id:
                 self.media_items[i] = item
-                break 
\ No newline at end of file
+                self._items_by_id[item.id] = item
+                self._metadata_index = None
+                break
+    
+    def filter_item_ids(self, media_filter: Optional[MediaFilter]) -> Optional[List[str]]:
+        """
+        Resolve structured filters to item IDs using the precomputed metadata index.
+        
+        Args:
+            media_filter: Type, genres, release year range, rating and popularity thresholds
+            
+        Returns:
+            None if the filter does not restrict anything, otherwise the matching IDs
+        """
+        if self._metadata_index is None:
+            self._metadata_index = MediaMetadataIndex(self.media_items)
+        return self._metadata_index.candidate_ids(media_filter) 
\ No newline at end of file
@@ -0,0 +1,85 @@
+from typing import Dict, List, Optional
+import numpy as np
+from domain.model.media_item import MediaItem
+from domain.model.media_filter import MediaFilter
+
+class MediaMetadataIndex:
+    """
+    Precomputed filter indexes over a list of media items.
+    - type and genre: one bitmap (boolean array) per value
+    - release year, vote average, popularity: sorted postings, so a range is
+      resolved with a binary search instead of a scan
+    """
+
+    def __init__(self, items: List[MediaItem]):
+        self.ids = np.array([item.id for item in items], dtype=object)
+        n = len(items)
+
+        self._type_bitmaps: Dict[str, np.ndarray] = {}
+        self._genre_bitmaps: Dict[str, np.ndarray] = {}
+        for row, item in enumerate(items):
+            self._type_bitmaps.setdefault(item.type, np.zeros(n, dtype=bool))[row] = True
+            for genre in item.genres:
+                key = self._normalize_genre(genre)
+                if key:
+                    self._genre_bitmaps.setdefault(key, np.zeros(n, dtype=bool))[row] = True
+
+        self._years = self._sorted_postings([self._release_year(item) for item in items])
+        self._vote_averages = self._sorted_postings([item.vote_average for item in items])
+        self._popularities = self._sorted_postings([item.popularity for item in items])
+
+    @staticmethod
+    def _normalize_genre(genre: str) -> str:
+        return genre.strip().lower()
+
+    @staticmethod
+    def _release_year(item: MediaItem) -> float:
+        try:
+            return float(str(item.release_date)[:4])
+        except ValueError:
+            return np.nan
+
+    @staticmethod
+    def _sorted_postings(values: List[float]):
+        """Values sorted ascending with the matching item rows (missing values excluded)"""
+        values = np.asarray(values, dtype=np.float64)
+        rows = np.flatnonzero(~np.isnan(values))
+        order = rows[np.argsort(values[rows], kind="stable")]
+        return values[order], order
+
+    def _range_bitmap(self, postings, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        sorted_values, rows = postings
+        start = 0 if low is None else np.searchsorted(sorted_values, low, side="left")
+        end = len(sorted_values) if high is None else np.searchsorted(sorted_values, high, side="right")
+        bitmap = np.zeros(len(self.ids), dtype=bool)
+        bitmap[rows[start:end]] = True
+        return bitmap
+
+    def _genre_bitmap(self, genres: List[str], match_all: bool) -> np.ndarray:
+        empty = np.zeros(len(self.ids), dtype=bool)
+        bitmaps = [self._genre_bitmaps.get(self._normalize_genre(g), empty) for g in genres]
+        return np.logical_and.reduce(bitmaps) if match_all else np.logical_or.reduce(bitmaps)
+
+    def candidate_ids(self, media_filter: Optional[MediaFilter]) -> Optional[List[str]]:
+        """
+        Resolve a filter to the ids of matching items.
+
+        Returns:
+            None when the filter does not restrict anything, else the matching ids
+        """
+        if media_filter is None or media_filter.is_empty():
+            return None
+
+        bitmap = np.ones(len(self.ids), dtype=bool)
+        if media_filter.media_type:
+            bitmap &= self._type_bitmaps.get(media_filter.media_type, np.zeros(len(self.ids), dtype=bool))
+        if media_filter.genres:
+            bitmap &= self._genre_bitmap(media_filter.genres, media_filter.match_all_genres)
+        if media_filter.release_year_min is not None or media_filter.release_year_max is not None:
+            bitmap &= self._range_bitmap(self._years, media_filter.release_year_min, media_filter.release_year_max)
+        if media_filter.min_vote_average is not None:
+            bitmap &= self._range_bitmap(self._vote_averages, media_filter.min_vote_average, None)
+        if media_filter.min_popularity is not None:
+            bitmap &= self._range_bitmap(self._popularities, media_filter.min_popularity, None)
+
+        return self.ids[bitmap].tolist()
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
 
 @dataclass
 class Content:
@@ -7,3 +7,47 @@ class Content:
     type_: str
     platform: str
     posterUrl: Optional[str] = None
+    # Maintained on the Content node by review writes
+    ratingSum: int = 0
+    ratingCount: int = 0
+    # Id of the matching catalog MediaItem, set by ContentCatalogLinker
+    mediaId: Optional[str] = None
+
+    @property
+    def averageRating(self) -> Optional[float]:
+        return self.ratingSum / self.ratingCount if self.ratingCount else None
+
+@dataclass
+class TrendingContent:
+    """Content ranked by the reviews it received over a recent window of days"""
+    content: Content
+    recentReviews: int
+    recentRatingSum: int
+
+    @property
+    def recentAverageRating(self) -> Optional[float]:
+        return self.recentRatingSum / self.recentReviews if self.recentReviews else None
+
+@dataclass
+class Recommendation:
+    """Content scored by the high ratings it received from a user's network"""
+    content: Content
+    score: float
+    recommenders: int
+
+@dataclass
+class Recommendations:
+    items: List[Recommendation] = field(default_factory=list)
+    # Users (friends and friends of friends) whose reviews were considered
+    peers: List[str] = field(default_factory=list)
+
+@dataclass
+class FriendRating:
+    """Ratings a user's friends gave to one catalog item"""
+    mediaId: str
+    ratingSum: int
+    ratingCount: int
+
+    @property
+    def averageRating(self) -> Optional[float]:
+        return self.ratingSum / self.ratingCount if self.ratingCount else None
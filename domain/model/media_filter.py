@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Optional, List
+
+@dataclass
+class MediaFilter:
+    media_type: Optional[str] = None  # 'movie' or 'game'
+    genres: Optional[List[str]] = None
+    match_all_genres: bool = False  # False: any of the genres, True: all of them
+    release_year_min: Optional[int] = None
+    release_year_max: Optional[int] = None
+    min_vote_average: Optional[float] = None
+    min_popularity: Optional[float] = None
+
+    def is_empty(self) -> bool:
+        return not any([
+            self.media_type,
+            self.genres,
+            self.release_year_min is not None,
+            self.release_year_max is not None,
+            self.min_vote_average is not None,
+            self.min_popularity is not None,
+        ])
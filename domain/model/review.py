@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 from domain.model.content import Content
 from domain.model.user import User
 
@@ -14,4 +14,11 @@ class Review:
 @dataclass
 class FriendReview:
     friend: User
-    review: Review
\ No newline at end of file
+    review: Review
+
+@dataclass
+class ReviewPage:
+    """One page of a review feed (Review or FriendReview items), newest first"""
+    items: List
+    end_cursor: Optional[str] = None
+    has_next_page: bool = False
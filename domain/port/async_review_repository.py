@@ -0,0 +1,76 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+from domain.model.user import User
+from domain.model.content import Content, TrendingContent, Recommendations
+from domain.model.review import Review, FriendReview, ReviewPage
+
+class AsyncReviewRepository(ABC):
+    """Coroutine counterpart of ReviewRepository, used by the ASGI GraphQL server"""
+
+    @abstractmethod
+    async def get_all_users(self) -> List[User]:
+        pass
+
+    @abstractmethod
+    async def get_user_friends(self, username: str) -> List[User]:
+        pass
+
+    @abstractmethod
+    async def get_friend_reviews(self, username: str) -> List[FriendReview]:
+        pass
+
+    @abstractmethod
+    async def get_user_reviews(self, username: str) -> List[Review]:
+        pass
+
+    @abstractmethod
+    async def get_public_reviews(self) -> List[Review]:
+        pass
+
+    @abstractmethod
+    async def get_all_content(self) -> List[Content]:
+        pass
+
+    @abstractmethod
+    async def get_trending_content(self, window_days: int = 7, first: int = 10) -> List[TrendingContent]:
+        pass
+
+    @abstractmethod
+    async def get_recommended_content(self, username: str, k: int = 10) -> Recommendations:
+        pass
+
+    @abstractmethod
+    async def add_friend(self, username: str, friend_name: str) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    async def remove_friend(self, username: str, friend_name: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def create_review(self, username: str, content_title: str, rating: int, comment: str) -> Optional[Review]:
+        pass
+
+    @abstractmethod
+    async def delete_review(self, review_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_friends_for_users(self, usernames: List[str]) -> Dict[str, List[User]]:
+        pass
+
+    @abstractmethod
+    async def get_reviews_for_users(self, usernames: List[str]) -> Dict[str, List[Review]]:
+        pass
+
+    @abstractmethod
+    async def get_friend_reviews_page(self, username: str, first: int = 20, after: Optional[str] = None) -> ReviewPage:
+        pass
+
+    @abstractmethod
+    async def get_user_reviews_page(self, username: str, first: int = 20, after: Optional[str] = None) -> ReviewPage:
+        pass
+
+    @abstractmethod
+    async def get_public_reviews_page(self, first: int = 20, after: Optional[str] = None) -> ReviewPage:
+        pass
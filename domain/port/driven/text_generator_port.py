@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
 from domain.model.chat_history import ChatHistory
 
 class TextGeneratorPort(ABC):
     @abstractmethod
-    def get_generated_text(self, chat_history: ChatHistory) -> str:
+    def get_generated_text(self, chat_history: ChatHistory, conversation_id: Optional[str] = None) -> str:
         pass
 
     @abstractmethod
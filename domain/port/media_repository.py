@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
 from domain.model.media_item import MediaItem
+from domain.model.media_filter import MediaFilter
 import numpy as np
 
 class MediaRepository(ABC):
@@ -65,4 +66,16 @@ class MediaRepository(ABC):
         Returns:
             List of all media items matching the filter
         """
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def filter_item_ids(self, media_filter: Optional[MediaFilter]) -> Optional[List[str]]:
+        """Resolve structured filters (type, genres, release years, rating, popularity) to item IDs
+        
+        Args:
+            media_filter: The filter to apply
+            
+        Returns:
+            None if the filter does not restrict anything, otherwise the IDs of matching items
+        """
+        pass
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+class NeighbourGraph(ABC):
+    """Port for precomputed item-item neighbour lookups following hexagonal architecture"""
+
+    @abstractmethod
+    def neighbours(self, item_id: str, k: Optional[int] = None) -> Optional[List[Tuple[str, float]]]:
+        """Get the precomputed nearest neighbours of an item
+
+        Args:
+            item_id: The unique identifier of the item
+            k: Maximum number of neighbours, None for all stored neighbours
+
+        Returns:
+            List of (item_id, cosine similarity) pairs best first, None if the item is not in the graph
+        """
+        pass
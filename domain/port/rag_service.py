@@ -1,17 +1,20 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
 from domain.model.media_item import MediaItem
+from domain.model.media_filter import MediaFilter
 
 class RAGService(ABC):
     """Port for RAG service operations following hexagonal architecture"""
     
     @abstractmethod
-    def query_with_text(self, query: str, media_type: Optional[str] = None) -> str:
+    def query_with_text(self, query: str, media_type: Optional[str] = None, filters: Optional[MediaFilter] = None, username: Optional[str] = None) -> str:
         """Process a text query using RAG and return a response
         
         Args:
             query: The text query to process
             media_type: Optional filter for media type ('movie', 'game', or None for all)
+            filters: Optional structured filters (genres, release years, rating, popularity)
+            username: Optional community user whose friends' ratings boost the ranking
         
         Returns:
             The RAG response as a string
@@ -19,12 +22,14 @@ class RAGService(ABC):
         pass
 
     @abstractmethod
-    def query_with_image(self, image_url: str, media_type: Optional[str] = None) -> str:
+    def query_with_image(self, image_url: str, media_type: Optional[str] = None, filters: Optional[MediaFilter] = None, username: Optional[str] = None) -> str:
         """Process an image query using RAG and return a response
         
         Args:
             image_url: The URL or path to the image
             media_type: Optional filter for media type ('movie', 'game', or None for all)
+            filters: Optional structured filters (genres, release years, rating, popularity)
+            username: Optional community user whose friends' ratings boost the ranking
         
         Returns:
             The RAG response as a string
@@ -32,14 +37,44 @@ class RAGService(ABC):
         pass
 
     @abstractmethod
-    def get_relevant_context(self, query: str, media_type: Optional[str] = None) -> List[MediaItem]:
+    def get_relevant_context(self, query: str, media_type: Optional[str] = None, filters: Optional[MediaFilter] = None, username: Optional[str] = None) -> List[MediaItem]:
         """Get relevant media items for a given query
         
         Args:
             query: The search query
             media_type: Optional filter for media type ('movie', 'game', or None for all)
+            filters: Optional structured filters (genres, release years, rating, popularity)
+            username: Optional community user whose friends' ratings boost the ranking
         
         Returns:
             List of relevant media items
         """
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_similar_items(self, item_id: str, k: int = 5, media_type: Optional[str] = None) -> List[MediaItem]:
+        """Get the media items most similar to an indexed item
+        
+        Args:
+            item_id: The unique identifier of the reference item
+            k: Number of similar items to return
+            media_type: Optional filter for media type ('movie', 'game', or None for all)
+        
+        Returns:
+            List of similar media items, the reference item excluded
+        """
+        pass
+
+    @abstractmethod
+    def query_about_item(self, query: str, item_id: str, media_type: Optional[str] = None) -> str:
+        """Answer a question about an item, using the item and its most similar items as context
+        
+        Args:
+            query: The question about the item
+            item_id: The unique identifier of the item
+            media_type: Optional filter for media type of the similar items ('movie', 'game', or None for all)
+        
+        Returns:
+            The RAG response as a string (a plain text query if the item is unknown)
+        """
+        pass
@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from domain.model.user import User
-from domain.model.content import Content
-from domain.model.review import Review, FriendReview
+from domain.model.content import Content, TrendingContent, Recommendations, FriendRating
+from domain.model.review import Review, FriendReview, ReviewPage
 
 class ReviewRepository(ABC):
 
@@ -30,6 +30,22 @@ class ReviewRepository(ABC):
     def get_all_content(self) -> List[Content]:
         pass
 
+    @abstractmethod
+    def get_trending_content(self, window_days: int = 7, first: int = 10) -> List[TrendingContent]:
+        pass
+
+    @abstractmethod
+    def get_recommended_content(self, username: str, k: int = 10) -> Recommendations:
+        pass
+
+    @abstractmethod
+    def get_friend_ratings_for_media(self, username: str, media_ids: List[str]) -> Dict[str, FriendRating]:
+        pass
+
+    @abstractmethod
+    def link_content_to_media(self, links: Dict[str, Optional[str]]) -> int:
+        pass
+
     @abstractmethod
     def add_friend(self, username: str, friend_name: str) -> Optional[User]:
         pass
@@ -45,3 +61,31 @@ class ReviewRepository(ABC):
     @abstractmethod
     def delete_review(self, review_id: str) -> bool:
         pass
+
+    @abstractmethod
+    def add_friends_bulk(self, friendships: List[Tuple[str, str]]) -> int:
+        pass
+
+    @abstractmethod
+    def create_reviews_bulk(self, reviews: List[Dict]) -> int:
+        pass
+
+    @abstractmethod
+    def get_friends_for_users(self, usernames: List[str]) -> Dict[str, List[User]]:
+        pass
+
+    @abstractmethod
+    def get_reviews_for_users(self, usernames: List[str]) -> Dict[str, List[Review]]:
+        pass
+
+    @abstractmethod
+    def get_friend_reviews_page(self, username: str, first: int = 20, after: Optional[str] = None) -> ReviewPage:
+        pass
+
+    @abstractmethod
+    def get_user_reviews_page(self, username: str, first: int = 20, after: Optional[str] = None) -> ReviewPage:
+        pass
+
+    @abstractmethod
+    def get_public_reviews_page(self, first: int = 20, after: Optional[str] = None) -> ReviewPage:
+        pass
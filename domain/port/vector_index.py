@@ -0,0 +1,50 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+class VectorIndex(ABC):
+    """Port for in-process vector indexes following hexagonal architecture"""
+
+    @abstractmethod
+    def add(self, ids: List[str], embeddings: np.ndarray) -> None:
+        """Add vectors to the index
+
+        Args:
+            ids: Item identifiers, one per row of embeddings
+            embeddings: Matrix of shape (len(ids), dim), L2-normalized
+        """
+        pass
+
+    @abstractmethod
+    def search(self, query: np.ndarray, k: int = 5, candidate_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """Search the nearest neighbours of a query vector
+
+        Args:
+            query: L2-normalized query vector
+            k: Number of neighbours to return
+            candidate_ids: Optional restriction of the search to these items
+
+        Returns:
+            List of (item_id, cosine similarity) pairs, best first
+        """
+        pass
+
+    @abstractmethod
+    def get_vector(self, item_id: str) -> Optional[np.ndarray]:
+        """Get the stored vector of an item, None if it is not indexed"""
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of indexed items"""
+        pass
+
+    @abstractmethod
+    def save(self) -> None:
+        """Persist pending changes"""
+        pass
+
+    @abstractmethod
+    def memory_report(self) -> Dict[str, Any]:
+        """Describe the storage footprint of the index (mode, bytes per item, ...)"""
+        pass
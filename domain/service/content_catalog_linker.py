@@ -0,0 +1,84 @@
+import re
+import threading
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+from domain.model.content import Content
+from domain.port.media_repository import MediaRepository
+from domain.port.review_repository import ReviewRepository
+
+class ContentCatalogLinker:
+    """
+    Joins the community graph to the media catalog: Content nodes are keyed by title,
+    MediaItems by id. The catalog id is stored on each Content node (mediaId), so the
+    join is computed once per title; sync() re-checks every link against the current
+    catalog and only writes the ones that changed.
+
+    Titles are compared normalized (accents, case and punctuation ignored), with the
+    content type first and the title alone as a fallback. When several catalog items
+    share a title, the most popular one wins.
+    """
+
+    _NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+    def __init__(self, media_repository: MediaRepository, review_repository: ReviewRepository):
+        self.media_repository = media_repository
+        self.review_repository = review_repository
+        self._lock = threading.Lock()
+        self._by_title_and_type: Optional[Dict[Tuple[str, str], str]] = None
+        self._by_title: Dict[str, str] = {}
+
+    @classmethod
+    def normalize_title(cls, title: str) -> str:
+        title = unicodedata.normalize("NFKD", title or "")
+        title = "".join(char for char in title if not unicodedata.combining(char))
+        return cls._NON_ALNUM.sub(" ", title.casefold()).strip()
+
+    def _build_index(self):
+        by_title_and_type, by_title = {}, {}
+        items = sorted(self.media_repository.get_all_items(), key=lambda item: item.popularity)
+        # Least popular first, so the most popular item of a title is written last
+        for item in items:
+            title = self.normalize_title(item.title)
+            if title:
+                by_title_and_type[(title, item.type)] = item.id
+                by_title[title] = item.id
+        self._by_title_and_type, self._by_title = by_title_and_type, by_title
+
+    def match(self, content: Content) -> Optional[str]:
+        """
+        Args:
+            content: Community content to find in the catalog
+
+        Returns:
+            The catalog id of the content, None if no item has its title
+        """
+        with self._lock:
+            if self._by_title_and_type is None:
+                self._build_index()
+        title = self.normalize_title(content.title)
+        return self._by_title_and_type.get((title, content.type_)) or self._by_title.get(title)
+
+    def invalidate(self):
+        """Rebuild the title index on next use, after catalog items were added or renamed"""
+        with self._lock:
+            self._by_title_and_type = None
+
+    def sync(self) -> int:
+        """
+        Bring the content links up to date with the catalog: link new content, move links
+        whose item was renamed or re-imported under another id, drop links to removed items.
+
+        Returns:
+            Number of content nodes whose link changed
+        """
+        # The catalog may have changed since the index was built
+        self.invalidate()
+        links = {}
+        for content in self.review_repository.get_all_content():
+            media_id = self.match(content)
+            if media_id != content.mediaId:
+                links[content.title] = media_id
+        if not links:
+            return 0
+        return self.review_repository.link_content_to_media(links)
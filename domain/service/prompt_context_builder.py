@@ -0,0 +1,93 @@
+import re
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from domain.model.media_item import MediaItem
+
+@dataclass
+class PromptContext:
+    """Context block assembled for a prompt, with its token accounting"""
+    text: str
+    items: List[MediaItem] = field(default_factory=list)
+    context_tokens: int = 0
+    truncated_items: int = 0
+    dropped_items: int = 0
+
+class PromptContextBuilder:
+    """
+    Assembles retrieved items into a prompt context under a token budget.
+    Items are taken in ranking order (best first); descriptions are cut at a
+    sentence boundary when they exceed their own budget, and items that no
+    longer fit are dropped.
+    """
+
+    _SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+    def __init__(self, token_counter: Callable[[str], int], max_context_tokens: int = 1500,
+                 max_description_tokens: int = 120):
+        """
+        Args:
+            token_counter: Counts tokens with the generation model's tokenizer
+            max_context_tokens: Budget of the whole context block
+            max_description_tokens: Budget of a single item description
+        """
+        self.count_tokens = token_counter
+        self.max_context_tokens = max_context_tokens
+        self.max_description_tokens = max_description_tokens
+
+    def truncate(self, text: str, max_tokens: Optional[int] = None) -> str:
+        """Shorten text to max_tokens, preferring whole sentences"""
+        max_tokens = self.max_description_tokens if max_tokens is None else max_tokens
+        if not text or self.count_tokens(text) <= max_tokens:
+            return text
+
+        kept = ""
+        for sentence in self._SENTENCE_END.split(text):
+            candidate = f"{kept} {sentence}".strip()
+            if self.count_tokens(candidate) > max_tokens:
+                break
+            kept = candidate
+        if kept:
+            return kept
+
+        # First sentence alone is too long: keep as many words as fit
+        words = text.split()
+        low, high = 0, len(words)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count_tokens(" ".join(words[:middle]) + "...") <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return " ".join(words[:low]) + "..."
+
+    def build(self, items: List[MediaItem], formatter: Callable[[MediaItem, str], str]) -> PromptContext:
+        """
+        Build the context block for ranked items.
+
+        Args:
+            items: Retrieved items, best first
+            formatter: Formats an item given its (possibly truncated) description
+
+        Returns:
+            The context text and what was kept, truncated or dropped
+        """
+        context = PromptContext(text="")
+        parts = []
+        for item in items:
+            description = self.truncate(item.description or "")
+            part = formatter(item, description)
+            part_tokens = self.count_tokens(part) + 1  # joining newline
+
+            if context.context_tokens + part_tokens > self.max_context_tokens:
+                context.dropped_items += 1
+                continue
+
+            parts.append(part)
+            context.items.append(item)
+            context.context_tokens += part_tokens
+            if description != (item.description or ""):
+                context.truncated_items += 1
+
+        context.text = "\n".join(parts)
+        return context
@@ -1,5 +1,6 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import os
+import heapq
 import numpy as np
 import time
 from pathlib import Path
@@ -24,7 +25,13 @@ except ImportError:
 
 from domain.port.rag_service import RAGService
 from domain.port.media_repository import MediaRepository
+from domain.port.vector_index import VectorIndex
+from domain.port.neighbour_graph import NeighbourGraph
+from domain.port.review_repository import ReviewRepository
 from domain.model.media_item import MediaItem
+from domain.model.media_filter import MediaFilter
+from domain.service.prompt_context_builder import PromptContextBuilder, PromptContext
+from dataclasses import replace
 
 load_dotenv()
 
@@ -34,16 +41,40 @@ class RAGServiceImpl(RAGService):
     - Text: SentenceTransformer + ChromaDB
     - Visual: CLIP (optional) + ChromaDB
     - LLM: COHERE for response generation
+    - Optional compressed VectorIndex (float16 / PQ) replacing the ChromaDB collections
+    - Optional social re-ranking: candidates rated highly by the user's friends move up
     """
     
+    # Largest id list sent to ChromaDB as a `$in` filter (one SQLite variable per id);
+    # larger candidate sets are queried in chunks of this size
+    CHROMA_MAX_ID_FILTER = 500
+    # Broad filters first try one query this many times larger than needed, filtered afterwards
+    CHROMA_OVERFETCH_FACTOR = 4
+    
     def __init__(self, media_repository: MediaRepository, db_path: str = "./chroma_db", 
                  text_model: str = "all-MiniLM-L6-v2", enable_visual: bool = False, 
-                 batch_size: int = 32, ensure_index: bool = True):
+                 batch_size: int = 32, ensure_index: bool = True,
+                 text_index: Optional[VectorIndex] = None, visual_index: Optional[VectorIndex] = None,
+                 similar_items_table_size: int = 200, similar_items_table_k: int = 20,
+                 neighbour_graph: Optional[NeighbourGraph] = None, generation_model: str = "command-r",
+                 max_context_tokens: int = 1500, max_description_tokens: int = 120,
+                 social_graph: Optional[ReviewRepository] = None, social_boost_weight: float = 0.15,
+                 social_candidate_factor: int = 3, social_full_weight_ratings: int = 3):
         self.media_repository = media_repository
         self.batch_size = batch_size
         self.enable_visual = enable_visual
         self.db_path = db_path
         self.text_model = text_model
+        self.text_index = text_index
+        self.visual_index = visual_index
+        self.similar_items_table_size = similar_items_table_size
+        self.similar_items_table_k = similar_items_table_k
+        self.neighbour_graph = neighbour_graph
+        self.generation_model = generation_model
+        self.social_graph = social_graph
+        self.social_boost_weight = social_boost_weight
+        self.social_candidate_factor = social_candidate_factor
+        self.social_full_weight_ratings = social_full_weight_ratings
         
         # Initialize COHERE client
         cohere_api_key = os.getenv('COHERE_API_KEY')
@@ -51,26 +82,46 @@ class RAGServiceImpl(RAGService):
             raise ValueError("COHERE_API_KEY not found in environment variables")
         self.cohere_client = cohere.Client(cohere_api_key)
         
+        # Token-budgeted context assembly, shared by the text and visual paths
+        self._offline_tokenizer_available = True
+        # Per-instance cache: a cache on the method would be shared by every service and keep them alive
+        self._count_tokens = lru_cache(maxsize=4096)(self._count_tokens_uncached)
+        self.context_builder = PromptContextBuilder(
+            self._count_tokens,
+            max_context_tokens=max_context_tokens,
+            max_description_tokens=max_description_tokens
+        )
+        self.last_prompt_stats: Dict[str, Any] = {}
+        
         # Device setup
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         
         # Threading locks for thread safety
         self.embedding_lock = threading.Lock()
         self.db_lock = threading.Lock()
+        self.similar_items_lock = threading.Lock()
+        
+        # Neighbour table of the most popular items, filled in the background on first use
+        self._similar_items_table: Dict[str, List[Tuple[str, float]]] = {}
+        self._similar_items_table_started = False
         
-        # Initialize ChromaDB
+        # Initialize ChromaDB (collections are only used when no compressed index is given)
         self.chroma_client = chromadb.PersistentClient(path=db_path)
-        self.text_collection = self.chroma_client.get_or_create_collection(
-            name="text_embeddings",
-            metadata={"hnsw:space": "cosine"}
-        )
+        self.text_collection = None
+        if self.text_index is None:
+            self.text_collection = self.chroma_client.get_or_create_collection(
+                name="text_embeddings",
+                metadata={"hnsw:space": "cosine"}
+            )
         
         # Only create visual collection if enabled
         if self.enable_visual:
-            self.visual_collection = self.chroma_client.get_or_create_collection(
-                name="visual_embeddings",
-                metadata={"hnsw:space": "cosine"}
-            )
+            self.visual_collection = None
+            if self.visual_index is None:
+                self.visual_collection = self.chroma_client.get_or_create_collection(
+                    name="visual_embeddings",
+                    metadata={"hnsw:space": "cosine"}
+                )
             # Initialize CLIP if available
             if CLIP_AVAILABLE:
                 self.clip_model, self.clip_preprocess = clip.load("ViT-B/32", device=self.device)
@@ -88,23 +139,38 @@ class RAGServiceImpl(RAGService):
         if ensure_index:
             self._ensure_data_indexed()
 
+    def _has_visual_store(self) -> bool:
+        return self.enable_visual and (self.visual_index is not None or self.visual_collection is not None)
+
+    def _store_count(self, visual: bool = False) -> int:
+        """Number of vectors in the active text or visual store"""
+        index = self.visual_index if visual else self.text_index
+        if index is not None:
+            return index.count()
+        collection = self.visual_collection if visual else self.text_collection
+        return collection.count()
+
     def _ensure_data_indexed(self):
         """Ensure all media items are indexed in the vector database"""
         media_items = self.media_repository.get_all_items()
-        text_count = self.text_collection.count()
+        text_count = self._store_count()
         
         # Index text embeddings if needed
         if text_count < len(media_items):
             print(f"Indexing {len(media_items) - text_count} new text embeddings...")
             self._index_text_embeddings(media_items)
+            if self.text_index is not None:
+                self.text_index.save()
         
         # Index visual embeddings if enabled and needed
-        if self.enable_visual and self.visual_collection:
-            visual_count = self.visual_collection.count()
+        if self._has_visual_store():
+            visual_count = self._store_count(visual=True)
             items_with_posters = [i for i in media_items if getattr(i, 'poster_url', None)]
             if visual_count < len(items_with_posters):
                 print(f"Indexing {len(items_with_posters) - visual_count} new visual embeddings...")
                 self._index_visual_embeddings(media_items)
+                if self.visual_index is not None:
+                    self.visual_index.save()
 
     def _index_text_embeddings(self, media_items: List[MediaItem]):
         """Index text embeddings for media items"""
@@ -123,10 +189,16 @@ class RAGServiceImpl(RAGService):
                     normalize_embeddings=True
                 )
             
+            # Hand the NumPy buffer over as-is, no per-float Python objects
+            embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+            
             # Add to collection
             with self.db_lock:
+                if self.text_index is not None:
+                    self.text_index.add([item.id for item in batch], embeddings)
+                    continue
                 self.text_collection.add(
-                    embeddings=embeddings.tolist(),
+                    embeddings=embeddings,
                     documents=texts,
                     metadatas=metadatas,
                     ids=ids
@@ -134,25 +206,30 @@ class RAGServiceImpl(RAGService):
 
     def _index_visual_embeddings(self, media_items: List[MediaItem]):
         """Index visual embeddings for media items with posters"""
-        if not self.enable_visual or not self.visual_collection:
+        if not self._has_visual_store():
             return
             
         items_with_posters = [item for item in media_items if getattr(item, 'poster_url', None)]
         
         for i in range(0, len(items_with_posters), self.batch_size):
             batch = items_with_posters[i:i+self.batch_size]
-            embeddings, ids, metadatas, docs = [], [], [], []
+            embeddings, ids, metadatas, docs, item_ids = [], [], [], [], []
             
             for item in batch:
                 emb = self._get_visual_embedding(item.poster_url)
                 if emb is not None:
-                    embeddings.append(emb.tolist())
+                    embeddings.append(emb)
                     ids.append(f"visual_{item.id}")
                     metadatas.append(self._create_metadata(item))
                     docs.append(f"{item.title} - {item.type}")
+                    item_ids.append(item.id)
             
             if embeddings:
+                embeddings = np.vstack(embeddings).astype(np.float32, copy=False)
                 with self.db_lock:
+                    if self.visual_index is not None:
+                        self.visual_index.add(item_ids, embeddings)
+                        continue
                     self.visual_collection.add(
                         embeddings=embeddings,
                         documents=docs,
@@ -204,26 +281,121 @@ class RAGServiceImpl(RAGService):
             print(f"Error processing image {image_url}: {e}")
             return None
 
-    def query_with_text(self, query: str, media_type: Optional[str] = None) -> str:
+    def _search(self, query_embedding: np.ndarray, n_results: int, media_type: Optional[str] = None,
+                visual: bool = False, filters: Optional[MediaFilter] = None) -> List[Tuple[str, float]]:
+        """Search the active text or visual store, returning (item_id, similarity) pairs.
+        Structured filters are resolved by the repository indexes; the in-process index only
+        scores the candidates, ChromaDB gets them as a metadata filter or filters its results.
+        """
+        index = self.visual_index if visual else self.text_index
+        media_filter = filters or MediaFilter()
+        if media_type:
+            media_filter = replace(media_filter, media_type=media_type)
+
+        candidate_ids = self.media_repository.filter_item_ids(media_filter)
+        if candidate_ids is not None and not candidate_ids:
+            return []
+
+        if index is not None:
+            return index.search(query_embedding, k=n_results, candidate_ids=candidate_ids)
+
+        collection = self.visual_collection if visual else self.text_collection
+        type_filter = {"type": media_filter.media_type} if media_filter.media_type else None
+        if candidate_ids is None or media_filter == MediaFilter(media_type=media_filter.media_type):
+            # No filter, or a type-only filter answered by the stored metadata
+            return self._query_collection(collection, query_embedding, n_results, type_filter)
+        if len(candidate_ids) <= self.CHROMA_MAX_ID_FILTER:
+            return self._query_collection(collection, query_embedding, n_results, {"id": {"$in": candidate_ids}})
+        return self._query_and_filter(collection, query_embedding, n_results, candidate_ids, type_filter)
+
+    @staticmethod
+    def _query_collection(collection, query_embedding: np.ndarray, n_results: int,
+                          where_filter: Optional[Dict[str, Any]]) -> List[Tuple[str, float]]:
+        results = collection.query(
+            query_embeddings=np.ascontiguousarray(query_embedding, dtype=np.float32).reshape(1, -1),
+            n_results=n_results,
+            where=where_filter,
+            include=["metadatas", "distances"]
+        )
+        # Cosine distance -> similarity
+        return [
+            (metadata['id'], 1.0 - distance)
+            for metadata, distance in zip(results['metadatas'][0], results['distances'][0])
+        ]
+
+    def _query_and_filter(self, collection, query_embedding: np.ndarray, n_results: int, candidate_ids: List[str],
+                          where_filter: Optional[Dict[str, Any]]) -> List[Tuple[str, float]]:
+        """Search a candidate set too large for one `$in` filter, with a bounded number of queries.
+        A broad set usually fills the results from one over-fetched query; otherwise each chunk of
+        ids is queried with its own `$in` filter and the best hits of all chunks are kept.
+        """
+        fetch = n_results * self.CHROMA_OVERFETCH_FACTOR
+        total = collection.count()
+        if len(candidate_ids) * self.CHROMA_OVERFETCH_FACTOR >= total:
+            allowed = set(candidate_ids)
+            hits = [hit for hit in self._query_collection(collection, query_embedding, min(fetch, total), where_filter)
+                    if hit[0] in allowed]
+            if len(hits) >= n_results:
+                return hits[:n_results]
+
+        hits = []
+        for start in range(0, len(candidate_ids), self.CHROMA_MAX_ID_FILTER):
+            chunk = candidate_ids[start:start + self.CHROMA_MAX_ID_FILTER]
+            hits.extend(self._query_collection(collection, query_embedding, n_results, {"id": {"$in": chunk}}))
+        return heapq.nlargest(n_results, hits, key=lambda hit: hit[1])
+
+    def _retrieve(self, query_embedding: np.ndarray, n_results: int, media_type: Optional[str] = None,
+                  visual: bool = False, filters: Optional[MediaFilter] = None,
+                  username: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Vector search, re-ranked by the ratings of the user's friends when a social graph is set"""
+        if self.social_graph is None or not username:
+            return self._search(query_embedding, n_results, media_type=media_type, visual=visual, filters=filters)
+        # Over-fetch so that well-rated items just below the cut can move up
+        hits = self._search(query_embedding, n_results * self.social_candidate_factor,
+                            media_type=media_type, visual=visual, filters=filters)
+        return self._boost_by_friend_ratings(hits, username)[:n_results]
+
+    def _boost_by_friend_ratings(self, hits: List[Tuple[str, float]], username: str) -> List[Tuple[str, float]]:
+        """Add the friends' rating signal to the similarities, with one graph read for all the hits"""
+        try:
+            ratings = self.social_graph.get_friend_ratings_for_media(username, [item_id for item_id, _ in hits])
+        except Exception as e:
+            print(f"Friend ratings unavailable, keeping the semantic ranking: {e}")
+            return hits
+        
+        boosted = []
+        for item_id, similarity in hits:
+            rating = ratings.get(item_id)
+            if rating is not None and rating.ratingCount:
+                # Ratings are out of 10 (5 is neutral); full weight once enough friends rated the item
+                confidence = min(rating.ratingCount, self.social_full_weight_ratings) / self.social_full_weight_ratings
+                similarity += self.social_boost_weight * confidence * (rating.averageRating - 5) / 5
+            boosted.append((item_id, similarity))
+        # Stable sort: items without friend ratings keep their vector order
+        return sorted(boosted, key=lambda hit: hit[1], reverse=True)
+
+    def _items_for_hits(self, hits: List[Tuple[str, float]]) -> List[MediaItem]:
+        """Convert search hits to MediaItem objects, keeping the ranking"""
+        relevant_items = []
+        for item_id, _ in hits:
+            item = self.media_repository.get_item_by_id(item_id)
+            if item:
+                relevant_items.append(item)
+        return relevant_items
+
+    def query_with_text(self, query: str, media_type: Optional[str] = None, filters: Optional[MediaFilter] = None,
+                        username: Optional[str] = None) -> str:
         """Query the RAG system with text input"""
+        self.last_prompt_stats = {}
         try:
             # Generate query embedding
             query_embedding = self.text_encoder.encode([query], normalize_embeddings=True)[0]
             
             # Search in vector database
-            where_filter = {"type": media_type} if media_type else None
-            results = self.text_collection.query(
-                query_embeddings=[query_embedding.tolist()],
-                n_results=5,
-                where=where_filter
-            )
+            hits = self._retrieve(query_embedding, n_results=5, media_type=media_type, filters=filters, username=username)
             
             # Convert results to MediaItem objects
-            relevant_items = []
-            for i, metadata in enumerate(results['metadatas'][0]):
-                item = self.media_repository.get_item_by_id(metadata['id'])
-                if item:
-                    relevant_items.append(item)
+            relevant_items = self._items_for_hits(hits)
             
             # Generate response using COHERE
             return self._generate_response(query, relevant_items, media_type)
@@ -232,9 +404,11 @@ class RAGServiceImpl(RAGService):
             print(f"Error in text query: {e}")
             return "I'm experiencing technical difficulties. Could you please rephrase your question?"
 
-    def query_with_image(self, image_data, media_type: Optional[str] = None) -> str:
+    def query_with_image(self, image_data, media_type: Optional[str] = None, filters: Optional[MediaFilter] = None,
+                         username: Optional[str] = None) -> str:
         """Query the RAG system with image input"""
-        if not self.enable_visual or not self.visual_collection:
+        self.last_prompt_stats = {}
+        if not self._has_visual_store():
             return "Visual search is not enabled. Please use text search instead."
             
         try:
@@ -260,19 +434,11 @@ class RAGServiceImpl(RAGService):
                 return "Visual search requires CLIP. Please use text search instead."
             
             # Search in visual database
-            where_filter = {"type": media_type} if media_type else None
-            results = self.visual_collection.query(
-                query_embeddings=[query_embedding.tolist()],
-                n_results=5,
-                where=where_filter
-            )
+            hits = self._retrieve(query_embedding, n_results=5, media_type=media_type, visual=True, filters=filters,
+                                  username=username)
             
             # Convert results to MediaItem objects
-            relevant_items = []
-            for metadata in results['metadatas'][0]:
-                item = self.media_repository.get_item_by_id(metadata['id'])
-                if item:
-                    relevant_items.append(item)
+            relevant_items = self._items_for_hits(hits)
             
             return self._generate_visual_response(relevant_items, media_type, method)
             
@@ -280,23 +446,61 @@ class RAGServiceImpl(RAGService):
             print(f"Error in image query: {e}")
             return "I had trouble analyzing this image. Please try a different one."
 
+    def _count_tokens_uncached(self, text: str) -> int:
+        """Count tokens with the generation model's tokenizer (downloaded once, run locally)"""
+        if self._offline_tokenizer_available:
+            try:
+                return len(self.cohere_client.tokenize(text=text, model=self.generation_model, offline=True).tokens)
+            except Exception as e:
+                print(f"Cohere offline tokenizer unavailable, estimating token counts: {e}")
+                self._offline_tokenizer_available = False
+        # Rough estimate for English text
+        return max(1, len(text) // 4)
+
+    def _build_context(self, items: List[MediaItem]) -> PromptContext:
+        return self.context_builder.build(items, self._format_media_item)
+
+    def _record_prompt_stats(self, kind: str, context: PromptContext, message: str, preamble: str, response=None):
+        """Keep and log the prompt token counts of the last request"""
+        stats = {
+            "kind": kind,
+            "context_tokens": context.context_tokens,
+            "prompt_tokens": self._count_tokens(message) + self._count_tokens(preamble),
+            "items": len(context.items),
+            "truncated_items": context.truncated_items,
+            "dropped_items": context.dropped_items,
+        }
+        billed_units = getattr(getattr(response, "meta", None), "billed_units", None)
+        if getattr(billed_units, "input_tokens", None) is not None:
+            stats["billed_input_tokens"] = billed_units.input_tokens
+        self.last_prompt_stats = stats
+        print(f"Prompt tokens ({kind}): {stats['prompt_tokens']} "
+              f"(context {stats['context_tokens']}, {stats['items']} items, "
+              f"{stats['truncated_items']} truncated, {stats['dropped_items']} dropped)")
+
     def _generate_response(self, query: str, items: List[MediaItem], media_type: Optional[str]) -> str:
         """Generate response using COHERE"""
+        self.last_prompt_stats = {}
         if not items:
             return "I couldn't find any relevant content for your search. Please try different keywords."
         
-        # Create context from retrieved items
-        context = "\n".join([self._format_media_item(item) for item in items])
+        # Create context from retrieved items, best first, within the token budget
+        prompt_context = self._build_context(items)
+        context = prompt_context.text
         content_type = 'movies' if media_type == 'movie' else 'games' if media_type == 'game' else 'movies and games'
         
+        message = f"User question: '{query}'\n\nPlease provide a helpful and engaging answer using the provided context."
+        preamble = f"""You are an expert assistant in {content_type}.\n\nGuidelines:\n- Be conversational and engaging\n- Reference specific titles from the context\n- Clearly explain your recommendations\n- Connect information between multiple items when relevant\n- Provide insights on themes, genres, or trends\n- Respond in English\n\nContext:\n{context}"""
+        
         # Generate response with COHERE
         try:
             response = self.cohere_client.chat(
-                message=f"User question: '{query}'\n\nPlease provide a helpful and engaging answer using the provided context.",
-                preamble=f"""You are an expert assistant in {content_type}.\n\nGuidelines:\n- Be conversational and engaging\n- Reference specific titles from the context\n- Clearly explain your recommendations\n- Connect information between multiple items when relevant\n- Provide insights on themes, genres, or trends\n- Respond in English\n\nContext:\n{context}""",
+                message=message,
+                preamble=preamble,
                 temperature=0.8,
                 max_tokens=800
             )
+            self._record_prompt_stats("text", prompt_context, message, preamble, response)
             return response.text
         except Exception as e:
             print(f"Error generating COHERE response: {e}")
@@ -304,70 +508,166 @@ class RAGServiceImpl(RAGService):
 
     def _generate_visual_response(self, items: List[MediaItem], media_type: Optional[str], method: str) -> str:
         """Generate visual analysis response using COHERE"""
+        self.last_prompt_stats = {}
         if not items:
             return "I couldn't find any visually similar content to your image."
         
-        context = "\n".join([self._format_media_item(item) for item in items])
+        prompt_context = self._build_context(items)
+        context = prompt_context.text
         content_type = 'movies' if media_type == 'movie' else 'games' if media_type == 'game' else 'entertainment content'
+        message = f"Analyze the visual similarities between the uploaded image and these matches using {method}. Focus on visual elements, styles, and aesthetic connections."
+        preamble = f"""You are a visual analysis expert for {content_type}.\n\nAnalyze the visual connections focusing on:\n- Color palettes and lighting\n- Composition and style\n- Character design or poster aesthetics\n- Visual genre cues\n- Mood and atmosphere\n- Respond in English\n\nAnalysis method: {method}\nMost similar items found:\n{context}"""
         
         try:
             response = self.cohere_client.chat(
-                message=f"Analyze the visual similarities between the uploaded image and these matches using {method}. Focus on visual elements, styles, and aesthetic connections.",
-                preamble=f"""You are a visual analysis expert for {content_type}.\n\nAnalyze the visual connections focusing on:\n- Color palettes and lighting\n- Composition and style\n- Character design or poster aesthetics\n- Visual genre cues\n- Mood and atmosphere\n- Respond in English\n\nAnalysis method: {method}\nMost similar items found:\n{context}""",
+                message=message,
+                preamble=preamble,
                 temperature=0.8,
                 max_tokens=800
             )
+            self._record_prompt_stats("visual", prompt_context, message, preamble, response)
             return response.text
         except Exception as e:
             print(f"Error generating visual COHERE response: {e}")
             return f"Visual analysis with {method}:\n\n" + context
 
-    def _format_media_item(self, item: MediaItem) -> str:
-        """Format media item for display"""
+    def _format_media_item(self, item: MediaItem, description: Optional[str] = None) -> str:
+        """Format media item for display, optionally with a shortened description"""
+        description = item.description if description is None else description
         if item.type == "game":
-            return f"Title: {item.title} (Game)\nRelease: {getattr(item, 'release_date', '')}\nRating: {getattr(item, 'vote_average', 0)}/10\nGenres: {', '.join(getattr(item, 'genres', []))}\nSummary: {item.description}"
+            return f"Title: {item.title} (Game)\nRelease: {getattr(item, 'release_date', '')}\nRating: {getattr(item, 'vote_average', 0)}/10\nGenres: {', '.join(getattr(item, 'genres', []))}\nSummary: {description}"
         else:
-            return f"Title: {item.title} (Movie)\nRelease: {getattr(item, 'release_date', '')}\nRating: {getattr(item, 'vote_average', 0)}/10 ({getattr(item, 'vote_count', 0)} votes)\nGenres: {', '.join(getattr(item, 'genres', []))}\nSummary: {item.description}"
+            return f"Title: {item.title} (Movie)\nRelease: {getattr(item, 'release_date', '')}\nRating: {getattr(item, 'vote_average', 0)}/10 ({getattr(item, 'vote_count', 0)} votes)\nGenres: {', '.join(getattr(item, 'genres', []))}\nSummary: {description}"
 
-    def get_relevant_context(self, query: str, media_type: Optional[str] = None) -> List[MediaItem]:
+    def get_relevant_context(self, query: str, media_type: Optional[str] = None, filters: Optional[MediaFilter] = None,
+                             username: Optional[str] = None) -> List[MediaItem]:
         """Get relevant media items for a given query"""
         try:
             # Generate query embedding
             query_embedding = self.text_encoder.encode([query], normalize_embeddings=True)[0]
             
-            # Search in vector database
-            where_filter = {"type": media_type} if media_type else None
-            results = self.text_collection.query(
-                query_embeddings=[query_embedding.tolist()],
-                n_results=10,  # Get more items for context
-                where=where_filter
-            )
+            # Search in vector database, getting more items for context
+            hits = self._retrieve(query_embedding, n_results=10, media_type=media_type, filters=filters, username=username)
             
             # Convert results to MediaItem objects
-            relevant_items = []
-            for metadata in results['metadatas'][0]:
-                item = self.media_repository.get_item_by_id(metadata['id'])
-                if item:
-                    relevant_items.append(item)
-            
-            return relevant_items
+            return self._items_for_hits(hits)
             
         except Exception as e:
             print(f"Error getting relevant context: {e}")
             return []
 
+    def _stored_vector(self, item_id: str) -> Optional[np.ndarray]:
+        """Fetch the indexed text vector of an item instead of re-encoding its text"""
+        if self.text_index is not None:
+            return self.text_index.get_vector(item_id)
+        result = self.text_collection.get(ids=[f"text_{item_id}"], include=["embeddings"])
+        embeddings = result.get("embeddings")
+        if embeddings is None or len(embeddings) == 0:
+            return None
+        return np.asarray(embeddings[0], dtype=np.float32)
+
+    def _nearest_to_item(self, item_id: str, k: int, media_type: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Query the neighbours of a stored vector, excluding the item itself"""
+        vector = self._stored_vector(item_id)
+        if vector is None:
+            return []
+        hits = self._search(vector, n_results=k + 1, media_type=media_type)
+        return [hit for hit in hits if hit[0] != item_id][:k]
+
+    def export_text_embeddings(self, page_size: int = 5000) -> Tuple[List[str], np.ndarray]:
+        """Export every indexed text vector as (item ids, float32 matrix), e.g. for offline jobs"""
+        if self.text_index is not None:
+            ids = [item.id for item in self.media_repository.get_all_items()]
+            vectors = [(item_id, self.text_index.get_vector(item_id)) for item_id in ids]
+            vectors = [(item_id, vector) for item_id, vector in vectors if vector is not None]
+            if not vectors:
+                return [], np.empty((0, 0), dtype=np.float32)
+            return [item_id for item_id, _ in vectors], np.vstack([vector for _, vector in vectors])
+        
+        ids, blocks = [], []
+        total = self.text_collection.count()
+        for offset in range(0, total, page_size):
+            page = self.text_collection.get(limit=page_size, offset=offset, include=["embeddings", "metadatas"])
+            ids.extend(metadata['id'] for metadata in page['metadatas'])
+            blocks.append(np.asarray(page['embeddings'], dtype=np.float32))
+        if not blocks:
+            return [], np.empty((0, 0), dtype=np.float32)
+        return ids, np.vstack(blocks)
+
+    def precompute_similar_items(self, limit: Optional[int] = None) -> int:
+        """Precompute the neighbour table of the most popular items, returns the number of items"""
+        limit = self.similar_items_table_size if limit is None else limit
+        popular = sorted(self.media_repository.get_all_items(), key=lambda x: x.popularity, reverse=True)[:limit]
+        
+        table = {}
+        for item in popular:
+            table[item.id] = self._nearest_to_item(item.id, self.similar_items_table_k)
+        
+        with self.similar_items_lock:
+            self._similar_items_table = table
+        return len(table)
+
+    def _start_similar_items_table(self):
+        with self.similar_items_lock:
+            if self._similar_items_table_started:
+                return
+            self._similar_items_table_started = True
+        threading.Thread(target=self.precompute_similar_items, daemon=True).start()
+
+    def get_similar_items(self, item_id: str, k: int = 5, media_type: Optional[str] = None) -> List[MediaItem]:
+        """Get the items closest to an indexed item, using its stored vector"""
+        try:
+            # Offline kNN graph first (O(1) read), then the popular items table,
+            # each used only when it holds enough matches for the requested type
+            neighbour_sources = []
+            if self.neighbour_graph is not None:
+                neighbour_sources.append(self.neighbour_graph.neighbours(item_id))
+            else:
+                self._start_similar_items_table()
+            neighbour_sources.append(self._similar_items_table.get(item_id))
+            
+            for neighbours in neighbour_sources:
+                if neighbours is None:
+                    continue
+                items = self._items_for_hits(neighbours)
+                if media_type:
+                    items = [item for item in items if item.type == media_type]
+                if len(items) >= k:
+                    return items[:k]
+            
+            return self._items_for_hits(self._nearest_to_item(item_id, k, media_type))
+            
+        except Exception as e:
+            print(f"Error getting similar items: {e}")
+            return []
+
+    def query_about_item(self, query: str, item_id: str, media_type: Optional[str] = None) -> str:
+        """Answer a question about an item using the item and its stored-vector neighbours as context"""
+        item = self.media_repository.get_item_by_id(item_id)
+        if item is None:
+            return self.query_with_text(query, media_type=media_type)
+        
+        similar_items = self.get_similar_items(item_id, k=4, media_type=media_type)
+        return self._generate_response(query, [item] + similar_items, media_type)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get system statistics"""
         stats = {
-            "text_embeddings": self.text_collection.count(),
+            "text_embeddings": self._store_count(),
             "model": self.text_model,
-            "vector_db": "ChromaDB",
+            "vector_db": "ChromaDB" if self.text_index is None else "In-process compressed index",
             "visual_enabled": self.enable_visual,
             "clip_available": self.clip_available,
+            "social_boost": self.social_graph is not None,
             "status": "ready"
         }
         
-        if self.enable_visual and self.visual_collection:
-            stats["visual_embeddings"] = self.visual_collection.count()
+        if self.text_index is not None:
+            stats["text_storage"] = self.text_index.memory_report()
+        
+        if self._has_visual_store():
+            stats["visual_embeddings"] = self._store_count(visual=True)
+            if self.visual_index is not None:
+                stats["visual_storage"] = self.visual_index.memory_report()
         
         return stats 
\ No newline at end of file
@@ -0,0 +1,154 @@
+from typing import Callable, Dict, List, Optional
+from domain.model.user import User
+from domain.model.content import Content, TrendingContent, Recommendations
+from domain.model.review import Review, FriendReview, ReviewPage
+from domain.port.async_review_repository import AsyncReviewRepository
+from infrastructure.adapter import neo4j_queries as queries
+from infrastructure.adapter.neo4j_driver import get_async_driver
+
+class AsyncNeo4jReviewRepository(AsyncReviewRepository):
+    """
+    Review repository over the Neo4j async driver: a query awaits the database
+    instead of holding a thread, so one event loop serves many concurrent requests.
+    Runs the same Cypher as Neo4jReviewRepository (see neo4j_queries).
+    """
+
+    def __init__(self, driver=None, batch_size: int = 500):
+        """
+        Args:
+            driver: Neo4j AsyncDriver, the process-wide one (neo4j_driver.get_async_driver) when None
+            batch_size: Usernames sent per UNWIND statement by the *_for_users reads
+        """
+        self._driver = driver
+        self.batch_size = batch_size
+
+    @property
+    def driver(self):
+        # Resolved on first query, so importing the GraphQL schema opens no connection
+        return self._driver if self._driver is not None else get_async_driver()
+
+    async def ensure_schema(self) -> bool:
+        """
+        Create the constraints and indexes the queries rely on (no-op when they exist).
+        Call once at startup, e.g. from the ASGI lifespan.
+
+        Returns:
+            True if the schema is in place
+        """
+        try:
+            async with self.driver.session() as session:
+                for statement in queries.SCHEMA_STATEMENTS:
+                    await (await session.run(statement)).consume()
+                for backfill in (queries.BACKFILL_REVIEW_IDS, queries.BACKFILL_CONTENT_AGGREGATES):
+                    while True:
+                        result = await session.run(backfill, batchSize=self.batch_size)
+                        updated = (await result.single())["count"]
+                        if updated < self.batch_size:
+                            break
+            return True
+        except Exception as e:
+            # Neo4j down or duplicate names/titles: queries still work, through label scans
+            print(f"Could not ensure the Neo4j schema: {e}")
+            return False
+
+    async def _read(self, query: str, **params) -> list:
+        """Run a read query in a managed transaction (retried on transient errors)"""
+        async def work(tx):
+            result = await tx.run(query, **params)
+            return [record async for record in result]
+
+        async with self.driver.session() as session:
+            return await session.execute_read(work)
+
+    async def _write_single(self, query: str, **params):
+        async def work(tx):
+            result = await tx.run(query, **params)
+            return await result.single()
+
+        async with self.driver.session() as session:
+            return await session.execute_write(work)
+
+    async def get_all_users(self) -> List[User]:
+        return [queries.user_from_record(record) for record in await self._read(queries.ALL_USERS)]
+
+    async def get_user_friends(self, username: str) -> List[User]:
+        records = await self._read(queries.USER_FRIENDS, username=username)
+        return [queries.user_from_record(record) for record in records]
+
+    async def get_all_content(self) -> List[Content]:
+        return [queries.content_from_record(record) for record in await self._read(queries.ALL_CONTENT)]
+
+    async def get_friend_reviews(self, username: str) -> List[FriendReview]:
+        records = await self._read(queries.FRIEND_REVIEWS, username=username)
+        return [queries.friend_review_from_record(record) for record in records]
+
+    async def get_user_reviews(self, username: str) -> List[Review]:
+        records = await self._read(queries.USER_REVIEWS, username=username)
+        return [queries.review_from_record(record) for record in records]
+
+    async def get_public_reviews(self) -> List[Review]:
+        return [queries.review_from_record(record) for record in await self._read(queries.PUBLIC_REVIEWS)]
+
+    async def add_friend(self, username: str, friend_name: str) -> Optional[User]:
+        record = await self._write_single(queries.ADD_FRIEND, username=username, friendName=friend_name)
+        return queries.user_from_record(record) if record else None
+
+    async def remove_friend(self, username: str, friend_name: str) -> bool:
+        record = await self._write_single(queries.REMOVE_FRIEND, username=username, friendName=friend_name)
+        return bool(record and record["deleted_count"] > 0)
+
+    async def create_review(self, username: str, content_title: str, rating: int, comment: str) -> Optional[Review]:
+        record = await self._write_single(
+            queries.CREATE_REVIEW, username=username, contentTitle=content_title, rating=rating, comment=comment
+        )
+        return queries.review_from_record(record) if record else None
+
+    async def delete_review(self, review_id: str) -> bool:
+        record = await self._write_single(queries.DELETE_REVIEW, review_id=str(review_id))
+        return bool(record and record["deleted_count"] > 0)
+
+    async def get_trending_content(self, window_days: int = 7, first: int = 10) -> List[TrendingContent]:
+        records = await self._read(queries.TRENDING_CONTENT, window=window_days, first=first)
+        return [queries.trending_from_record(record) for record in records]
+
+    async def get_recommended_content(self, username: str, k: int = 10) -> Recommendations:
+        records = await self._read(queries.RECOMMENDED_CONTENT, **queries.recommendation_parameters(username, k))
+        return queries.recommendations_from_record(records[0] if records else None)
+
+    # ------------------------------------------------------------------
+    # Cursor-paginated feeds (keyset on createdAt, id)
+    # ------------------------------------------------------------------
+    async def _fetch_page(self, query: str, first: int, after: Optional[str], to_item: Callable, to_review: Callable = lambda item: item, **params) -> ReviewPage:
+        first, page_params = queries.page_parameters(first, after)
+        records = await self._read(query, **page_params, **params)
+        return queries.build_page(records, first, to_item, to_review)
+
+    async def get_friend_reviews_page(self, username: str, first: int = 20, after: Optional[str] = None) -> ReviewPage:
+        return await self._fetch_page(
+            queries.FRIEND_REVIEWS_PAGE, first, after, queries.friend_review_from_record,
+            lambda friend_review: friend_review.review, username=username
+        )
+
+    async def get_user_reviews_page(self, username: str, first: int = 20, after: Optional[str] = None) -> ReviewPage:
+        return await self._fetch_page(queries.USER_REVIEWS_PAGE, first, after, queries.review_from_record, username=username)
+
+    async def get_public_reviews_page(self, first: int = 20, after: Optional[str] = None) -> ReviewPage:
+        return await self._fetch_page(queries.PUBLIC_REVIEWS_PAGE, first, after, queries.review_from_record)
+
+    # ------------------------------------------------------------------
+    # Batched reads for the DataLoaders
+    # ------------------------------------------------------------------
+    async def _read_for_users(self, query: str, usernames: List[str], to_item: Callable) -> Dict[str, list]:
+        unique = list(dict.fromkeys(usernames))
+        records = []
+        for start in range(0, len(unique), self.batch_size):
+            records.extend(await self._read(query, usernames=unique[start:start + self.batch_size]))
+        return queries.group_by_username(records, to_item, usernames)
+
+    async def get_friends_for_users(self, usernames: List[str]) -> Dict[str, List[User]]:
+        """Friends by username (users without friends map to an empty list)"""
+        return await self._read_for_users(queries.FRIENDS_FOR_USERS, usernames, queries.user_from_record)
+
+    async def get_reviews_for_users(self, usernames: List[str]) -> Dict[str, List[Review]]:
+        """Reviews by username, newest first (users without reviews map to an empty list)"""
+        return await self._read_for_users(queries.REVIEWS_FOR_USERS, usernames, queries.review_from_record)
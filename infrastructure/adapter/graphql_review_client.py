@@ -1,15 +1,71 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pprint
 
 GRAPHQL_ENDPOINT = "http://localhost:5050/graphql"
+# (connect, read) seconds
+TIMEOUT = (3.05, 15)
+POOL_SIZE = 16
 
-def execute_query(query, variables=None):
-    response = requests.post(
-        GRAPHQL_ENDPOINT,
-        json={"query": query, "variables": variables}
-    )
+def _create_session(retry: Retry) -> requests.Session:
+    """Keep-alive session: connections to the GraphQL server are reused between calls"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Queries are idempotent: retry them on connection errors and gateway errors, with backoff
+_query_session = _create_session(Retry(
+    total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({"POST"}), raise_on_status=False
+))
+# Mutations are only retried when the connection could not be made (nothing was sent)
+_mutation_session = _create_session(Retry(total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.2))
+
+_executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="graphql-client")
+
+def fetch_concurrently(**calls):
+    """
+    Run independent client calls in parallel, e.g.
+    fetch_concurrently(dashboard=lambda: get_community_dashboard(name), trending=get_trending_content)
+
+    Returns:
+        Results by keyword; the first failing call's exception is raised
+    """
+    futures = {name: _executor.submit(call) for name, call in calls.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+@lru_cache(maxsize=None)
+def _query_hash(query):
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+def _post(payload, session):
+    response = session.post(GRAPHQL_ENDPOINT, json=payload, timeout=TIMEOUT)
     response.raise_for_status()
-    return response.json()["data"]
+    return response.json()
+
+def _persisted_query_not_found(result):
+    return any(error.get("message") == "PersistedQueryNotFound" for error in result.get("errors") or [])
+
+def execute_query(query, variables=None):
+    """
+    Run a query as an automatic persisted query: only its sha256 hash is sent,
+    the text follows once when the server does not know the hash yet.
+    """
+    session = _mutation_session if query.lstrip().startswith("mutation") else _query_session
+    payload = {
+        "variables": variables,
+        "extensions": {"persistedQuery": {"version": 1, "sha256Hash": _query_hash(query)}}
+    }
+    result = _post(payload, session)
+    if _persisted_query_not_found(result):
+        result = _post({**payload, "query": query}, session)
+    return result["data"]
 
 # --- QUERIES ---
 
@@ -105,6 +161,136 @@ def get_my_reviews(username):
 
 
 
+REVIEW_FIELDS = """
+    id
+    rating
+    comment
+    createdAt
+    content {
+      title
+      type
+      platform
+      posterUrl
+    }
+"""
+
+def _connection_page(connection):
+    """Flatten a GraphQL connection into {"items", "endCursor", "hasNextPage"}"""
+    return {
+        "items": [edge["node"] for edge in connection["edges"]],
+        "endCursor": connection["pageInfo"]["endCursor"],
+        "hasNextPage": connection["pageInfo"]["hasNextPage"]
+    }
+
+def get_friend_reviews_page(username, first=20, after=None):
+    query = """
+    query($username: String!, $first: Int, $after: String) {
+      friendReviewsConnection(username: $username, first: $first, after: $after) {
+        edges {
+          node {
+            friend {
+              name
+              avatarUrl
+            }
+            review {%s}
+          }
+        }
+        pageInfo {
+          endCursor
+          hasNextPage
+        }
+      }
+    }
+    """ % REVIEW_FIELDS
+    variables = {"username": username, "first": first, "after": after}
+    return _connection_page(execute_query(query, variables)["friendReviewsConnection"])
+
+def get_my_reviews_page(username, first=20, after=None):
+    query = """
+    query($username: String!, $first: Int, $after: String) {
+      userReviewsConnection(username: $username, first: $first, after: $after) {
+        edges {
+          node {%s}
+        }
+        pageInfo {
+          endCursor
+          hasNextPage
+        }
+      }
+    }
+    """ % REVIEW_FIELDS
+    variables = {"username": username, "first": first, "after": after}
+    return _connection_page(execute_query(query, variables)["userReviewsConnection"])
+
+def get_public_reviews_page(first=20, after=None):
+    query = """
+    query($first: Int, $after: String) {
+      publicReviewsConnection(first: $first, after: $after) {
+        edges {
+          node {%s}
+        }
+        pageInfo {
+          endCursor
+          hasNextPage
+        }
+      }
+    }
+    """ % REVIEW_FIELDS
+    return _connection_page(execute_query(query, {"first": first, "after": after})["publicReviewsConnection"])
+
+def get_community_dashboard(username, first=10):
+    """Everything the Community page renders, in one request"""
+    query = """
+    query($username: String!, $first: Int) {
+      communityDashboard(username: $username) {
+        allUsers {
+          name
+          avatarUrl
+        }
+        friends {
+          name
+          avatarUrl
+        }
+        friendReviews(first: $first) {
+          edges {
+            node {
+              friend {
+                name
+                avatarUrl
+              }
+              review {%s}
+            }
+          }
+          pageInfo {
+            endCursor
+            hasNextPage
+          }
+        }
+        myReviews(first: $first) {
+          edges {
+            node {%s}
+          }
+          pageInfo {
+            endCursor
+            hasNextPage
+          }
+        }
+        allContent {
+          title
+        }
+      }
+    }
+    """ % (REVIEW_FIELDS, REVIEW_FIELDS)
+    dashboard = execute_query(query, {"username": username, "first": first})["communityDashboard"]
+    return {
+        "allUsers": dashboard["allUsers"],
+        "friends": dashboard["friends"],
+        "friendReviews": _connection_page(dashboard["friendReviews"]),
+        "myReviews": _connection_page(dashboard["myReviews"]),
+        "allContent": [item["title"] for item in dashboard["allContent"] if item]
+    }
+
+
 def get_all_content():
     query = """
     {
@@ -117,6 +303,45 @@ def get_all_content():
     return [item["title"] for item in result.get("allContent", []) if item]
 
 
+def get_trending_content(window=7, first=5):
+    """Content with the most reviews over the last `window` days, with their average ratings"""
+    query = """
+    query($window: Int, $first: Int) {
+      trendingContent(window: $window, first: $first) {
+        content {
+          title
+          type
+          platform
+          posterUrl
+          averageRating
+          reviewCount
+        }
+        recentReviews
+        recentAverageRating
+      }
+    }
+    """
+    return execute_query(query, {"window": window, "first": first})["trendingContent"]
+
+def get_recommended_content(username, k=5):
+    """Content rated highly by the user's friends and friends of friends"""
+    query = """
+    query($username: String!, $k: Int) {
+      recommendedContent(username: $username, k: $k) {
+        content {
+          title
+          type
+          platform
+          posterUrl
+          averageRating
+          reviewCount
+        }
+        score
+        recommenders
+      }
+    }
+    """
+    return execute_query(query, {"username": username, "k": k})["recommendedContent"]
 
 # --- MUTATIONS ---
 
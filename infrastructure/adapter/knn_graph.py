@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+from multiprocessing import Pool
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from domain.port.neighbour_graph import NeighbourGraph
+
+class KnnGraph(NeighbourGraph):
+    """
+    Read side of the offline item-item kNN graph.
+    Neighbour rows are memory-mapped, so a lookup is a single row read.
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, "meta.json"), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.path = path
+        self.k = meta["k"]
+        self.ids: List[str] = meta["ids"]
+        self._rows: Dict[str, int] = {item_id: row for row, item_id in enumerate(self.ids)}
+        shape = (len(self.ids), self.k)
+        self._neighbours = np.memmap(os.path.join(path, "neighbours.i32"), dtype=np.int32, mode='r', shape=shape)
+        self._scores = np.memmap(os.path.join(path, "scores.f16"), dtype=np.float16, mode='r', shape=shape)
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(os.path.join(path, "meta.json"))
+
+    def neighbours(self, item_id: str, k: Optional[int] = None) -> Optional[List[Tuple[str, float]]]:
+        row = self._rows.get(item_id)
+        if row is None:
+            return None
+        k = self.k if k is None else min(k, self.k)
+        return [
+            (self.ids[neighbour], float(score))
+            for neighbour, score in zip(self._neighbours[row, :k], self._scores[row, :k])
+            if neighbour >= 0
+        ]
+
+
+def _knn_block(task) -> int:
+    """Top-k neighbours of one block of rows, scanning the catalog block by block"""
+    embeddings_path, n, dim, output_path, row_start, row_end, k, block_size = task
+    embeddings = np.memmap(embeddings_path, dtype=np.float32, mode='r', shape=(n, dim))
+    rows = np.asarray(embeddings[row_start:row_end])
+    row_ids = np.arange(row_start, row_end)
+
+    best_scores = np.full((rows.shape[0], k), -np.inf, dtype=np.float32)
+    best_ids = np.full((rows.shape[0], k), -1, dtype=np.int64)
+
+    for col_start in range(0, n, block_size):
+        col_end = min(col_start + block_size, n)
+        scores = rows @ np.asarray(embeddings[col_start:col_end]).T
+
+        # An item is not its own neighbour
+        overlap = (row_ids >= col_start) & (row_ids < col_end)
+        scores[np.flatnonzero(overlap), row_ids[overlap] - col_start] = -np.inf
+
+        merged_scores = np.concatenate([best_scores, scores], axis=1)
+        merged_ids = np.concatenate([best_ids, np.broadcast_to(np.arange(col_start, col_end), scores.shape)], axis=1)
+        top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(merged_scores, top, axis=1)
+        best_ids = np.take_along_axis(merged_ids, top, axis=1)
+
+    order = np.argsort(-best_scores, axis=1)
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    best_ids = np.take_along_axis(best_ids, order, axis=1)
+    best_ids[~np.isfinite(best_scores)] = -1
+
+    neighbours = np.memmap(os.path.join(output_path, "neighbours.i32"), dtype=np.int32, mode='r+', shape=(n, k))
+    scores_out = np.memmap(os.path.join(output_path, "scores.f16"), dtype=np.float16, mode='r+', shape=(n, k))
+    neighbours[row_start:row_end] = best_ids
+    scores_out[row_start:row_end] = np.where(np.isfinite(best_scores), best_scores, 0.0)
+    neighbours.flush()
+    scores_out.flush()
+    return row_end - row_start
+
+
+def build_knn_graph(ids: List[str], embeddings: np.ndarray, output_path: str, k: int = 50,
+                    block_size: int = 2048, workers: int = 4) -> KnnGraph:
+    """
+    Compute the top-k neighbours of every item with blocked matrix multiplication.
+
+    Args:
+        ids: Item identifiers, one per row of embeddings
+        embeddings: L2-normalized matrix of shape (len(ids), dim)
+        output_path: Directory receiving the memory-mapped graph
+        k: Neighbours stored per item
+        block_size: Rows and columns per matrix multiplication block
+        workers: Worker processes sharing the row blocks
+
+    Returns:
+        The graph opened for reading
+    """
+    n, dim = embeddings.shape
+    k = min(k, max(n - 1, 1))
+    os.makedirs(output_path, exist_ok=True)
+
+    # Pre-size the outputs, workers fill their own row ranges in place
+    np.memmap(os.path.join(output_path, "neighbours.i32"), dtype=np.int32, mode='w+', shape=(n, k)).flush()
+    np.memmap(os.path.join(output_path, "scores.f16"), dtype=np.float16, mode='w+', shape=(n, k)).flush()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Workers map the embeddings from disk instead of receiving a pickled copy each
+        embeddings_path = os.path.join(tmp_dir, "embeddings.f32")
+        np.ascontiguousarray(embeddings, dtype=np.float32).tofile(embeddings_path)
+
+        tasks = [
+            (embeddings_path, n, dim, output_path, start, min(start + block_size, n), k, block_size)
+            for start in range(0, n, block_size)
+        ]
+        with Pool(processes=max(1, workers)) as pool:
+            done = 0
+            for count in pool.imap_unordered(_knn_block, tasks):
+                done += count
+                print(f"   {done:,}/{n:,} items")
+
+    tmp_meta = os.path.join(output_path, "meta.json.tmp")
+    with open(tmp_meta, 'w', encoding='utf-8') as f:
+        json.dump({"k": k, "ids": list(ids)}, f)
+    os.replace(tmp_meta, os.path.join(output_path, "meta.json"))
+
+    return KnnGraph(output_path)
@@ -0,0 +1,160 @@
+"""
+One Neo4j driver per process (and one async driver for the ASGI event loop), configured
+from the environment and closed on shutdown. Repositories borrow them instead of
+building their own connection pools.
+"""
+import atexit
+import threading
+from typing import Dict, Optional
+
+from neo4j import AsyncGraphDatabase, GraphDatabase
+from config.env_config import EnvConfig
+
+class _SessionMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.active = 0
+        self.peak_active = 0
+
+    def acquire(self):
+        with self._lock:
+            self.opened += 1
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+
+    def release(self):
+        with self._lock:
+            self.active -= 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {"sessions_opened": self.opened, "sessions_active": self.active, "sessions_peak": self.peak_active}
+
+class _MeteredSession:
+    """Counts a session as active until it is closed; everything else goes to the real session"""
+
+    def __init__(self, session, metrics: _SessionMetrics):
+        self._session = session
+        self._metrics = metrics
+        self._released = False
+        metrics.acquire()
+
+    def _release(self):
+        if not self._released:
+            self._released = True
+            self._metrics.release()
+
+    def __enter__(self):
+        return self._session.__enter__()
+
+    def __exit__(self, *exc_info):
+        try:
+            return self._session.__exit__(*exc_info)
+        finally:
+            self._release()
+
+    async def __aenter__(self):
+        return await self._session.__aenter__()
+
+    async def __aexit__(self, *exc_info):
+        try:
+            return await self._session.__aexit__(*exc_info)
+        finally:
+            self._release()
+
+    def close(self):
+        try:
+            return self._session.close()
+        finally:
+            self._release()
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+class ManagedDriver:
+    """Neo4j driver (sync or async) whose sessions are counted for pool_metrics()"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.metrics = _SessionMetrics()
+
+    def session(self, **kwargs):
+        return _MeteredSession(self.driver.session(**kwargs), self.metrics)
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+_lock = threading.Lock()
+_driver: Optional[ManagedDriver] = None
+_async_driver: Optional[ManagedDriver] = None
+
+def _auth():
+    return EnvConfig.get_neo4j_user(), EnvConfig.get_neo4j_password()
+
+def get_driver() -> ManagedDriver:
+    """The process-wide sync driver, created on first use and closed at exit"""
+    global _driver
+    with _lock:
+        if _driver is None:
+            _driver = ManagedDriver(GraphDatabase.driver(
+                EnvConfig.get_neo4j_uri(), auth=_auth(), **EnvConfig.get_neo4j_pool_config()
+            ))
+        return _driver
+
+def get_async_driver() -> ManagedDriver:
+    """
+    The process-wide async driver, created on first use. It belongs to the event loop
+    that first uses it: close it from that loop with close_async_driver() (ASGI lifespan).
+    """
+    global _async_driver
+    with _lock:
+        if _async_driver is None:
+            _async_driver = ManagedDriver(AsyncGraphDatabase.driver(
+                EnvConfig.get_neo4j_uri(), auth=_auth(), **EnvConfig.get_neo4j_pool_config()
+            ))
+        return _async_driver
+
+def close_driver():
+    global _driver
+    with _lock:
+        driver, _driver = _driver, None
+    if driver is not None:
+        driver.close()
+
+async def close_async_driver():
+    global _async_driver
+    with _lock:
+        driver, _async_driver = _async_driver, None
+    if driver is not None:
+        await driver.close()
+
+atexit.register(close_driver)
+
+def pool_metrics() -> Dict[str, Dict]:
+    """
+    Session counters of the shared drivers, plus in-use / idle connections per server
+    when the driver's pool exposes them.
+
+    Returns:
+        {"sync": {...}, "async": {...}} for the drivers created so far
+    """
+    metrics = {}
+    for name, driver in (("sync", _driver), ("async", _async_driver)):
+        if driver is None:
+            continue
+        stats = {"max_pool_size": EnvConfig.get_neo4j_pool_config()["max_connection_pool_size"]}
+        stats.update(driver.metrics.snapshot())
+        stats.update(_connection_counts(driver.driver))
+        metrics[name] = stats
+    return metrics
+
+def _connection_counts(driver) -> Dict[str, int]:
+    # The pool is internal to the driver: report nothing rather than fail if it changes
+    try:
+        connections = driver._pool.connections
+        in_use = sum(1 for pool in connections.values() for connection in pool if connection.in_use)
+        total = sum(len(pool) for pool in connections.values())
+        return {"connections_in_use": in_use, "connections_idle": total - in_use}
+    except Exception:
+        return {}
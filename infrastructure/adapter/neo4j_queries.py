@@ -0,0 +1,436 @@
+"""
+Cypher statements and record mapping shared by the sync and async Neo4j review repositories.
+"""
+import json
+import base64
+from typing import Callable, Dict, List, Optional, Tuple
+
+from domain.model.user import User
+from domain.model.content import Content, TrendingContent, Recommendation, Recommendations, FriendRating
+from domain.model.review import Review, FriendReview, ReviewPage
+
+MAX_PAGE_SIZE = 100
+
+# Traversal caps of recommendedContent: friends expanded, friends expanded per friend,
+# most recent high ratings read per peer
+RECOMMENDATION_MAX_FRIENDS = 100
+RECOMMENDATION_MAX_FRIENDS_PER_FRIEND = 50
+RECOMMENDATION_REVIEWS_PER_PEER = 20
+RECOMMENDATION_MIN_RATING = 7
+
+# Idempotent schema (Neo4j 4.4+): the uniqueness constraints also back the {name} / {title} / {id}
+# lookups with an index; a plain index on createdAt is a range index
+SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT user_name_unique IF NOT EXISTS FOR (u:User) REQUIRE u.name IS UNIQUE",
+    "CREATE CONSTRAINT content_title_unique IF NOT EXISTS FOR (c:Content) REQUIRE c.title IS UNIQUE",
+    "CREATE CONSTRAINT review_id_unique IF NOT EXISTS FOR (r:Review) REQUIRE r.id IS UNIQUE",
+    "CREATE INDEX review_created_at IF NOT EXISTS FOR (r:Review) ON (r.createdAt)",
+    "CREATE INDEX content_activity_day IF NOT EXISTS FOR (a:ContentActivity) ON (a.day)",
+]
+
+BACKFILL_REVIEW_IDS = """
+    MATCH (r:Review) WHERE r.id IS NULL
+    WITH r LIMIT $batchSize
+    SET r.id = randomUUID()
+    RETURN count(r) AS count
+"""
+
+# Content aggregates and daily activity buckets of c, computed from `reviews` (a list)
+_SET_AGGREGATES_FROM_REVIEWS = """
+    SET c.ratingSum = reduce(total = 0, review IN reviews | total + coalesce(review.rating, 0)),
+        c.ratingCount = size(reviews)
+    WITH c, reviews
+    CALL {
+        WITH c, reviews
+        UNWIND reviews AS review
+        WITH c, date(review.createdAt) AS day, count(review) AS dayReviews, sum(review.rating) AS dayRatingSum
+        WHERE day IS NOT NULL
+        MERGE (c)-[:HAS_ACTIVITY]->(a:ContentActivity {day: day})
+        SET a.reviews = dayReviews, a.ratingSum = dayRatingSum
+    }
+"""
+
+# Content aggregates computed from the reviews written before they were maintained
+BACKFILL_CONTENT_AGGREGATES = f"""
+    MATCH (c:Content) WHERE c.ratingCount IS NULL
+    WITH c LIMIT $batchSize
+    OPTIONAL MATCH (r:Review)-[:REVIEWS]->(c)
+    WITH c, collect(r) AS reviews
+    {_SET_AGGREGATES_FROM_REVIEWS}
+    RETURN count(c) AS count
+"""
+
+_CONTENT_COLUMNS = """
+    c.title AS title, c.type AS type, c.platform AS platform, c.posterUrl AS posterUrl,
+    coalesce(c.ratingSum, 0) AS ratingSum, coalesce(c.ratingCount, 0) AS ratingCount, c.mediaId AS mediaId
+"""
+
+_REVIEW_COLUMNS = f"""
+    r.id AS reviewId, r.rating AS rating, r.comment AS comment,
+    toString(r.createdAt) AS createdAt, {_CONTENT_COLUMNS}
+"""
+
+# Count a new review (r) in the aggregates of its content (c) and in the day's activity bucket,
+# in the statement that creates it. A unit subquery keeps one row per review.
+# Content not backfilled yet (no ratingCount) is first recounted from its earlier reviews:
+# those created before this statement, since datetime() is the same for all of its rows.
+_TRACK_NEW_REVIEW = f"""
+    CALL {{
+        WITH r, c
+        WITH r, c WHERE c.ratingCount IS NULL
+        OPTIONAL MATCH (earlier:Review)-[:REVIEWS]->(c)
+        WHERE earlier.createdAt IS NULL OR earlier.createdAt < r.createdAt
+        WITH c, collect(earlier) AS reviews
+        {_SET_AGGREGATES_FROM_REVIEWS}
+    }}
+    SET c.ratingSum = c.ratingSum + r.rating, c.ratingCount = c.ratingCount + 1
+    WITH r, c
+    CALL {{
+        WITH r, c
+        MERGE (c)-[:HAS_ACTIVITY]->(a:ContentActivity {{day: date(r.createdAt)}})
+        ON CREATE SET a.reviews = 0, a.ratingSum = 0
+        SET a.reviews = a.reviews + 1, a.ratingSum = a.ratingSum + r.rating
+    }}
+"""
+
+# Keyset condition for feeds ordered by (createdAt DESC, id DESC)
+_AFTER_CURSOR = """
+    ($afterCreatedAt IS NULL
+     OR r.createdAt < datetime($afterCreatedAt)
+     OR (r.createdAt = datetime($afterCreatedAt) AND r.id < $afterId))
+"""
+
+# ----------------------------------------------------------------------
+# Reads
+# ----------------------------------------------------------------------
+ALL_USERS = """
+    MATCH (u:User)
+    RETURN u.name AS name, u.avatarUrl AS avatarUrl
+    ORDER BY u.name
+"""
+
+USER_FRIENDS = """
+    MATCH (:User {name: $username})-[:FRIENDS_WITH]->(f:User)
+    RETURN f.name AS name, f.avatarUrl AS avatarUrl
+    ORDER BY f.name
+"""
+
+ALL_CONTENT = f"""
+    MATCH (c:Content)
+    RETURN {_CONTENT_COLUMNS}
+    ORDER BY c.title
+"""
+
+FRIEND_REVIEWS = f"""
+    MATCH (:User {{name: $username}})-[:FRIENDS_WITH]->(f:User)-[:WROTE]->(r:Review)-[:REVIEWS]->(c:Content)
+    RETURN f.name AS friendName, f.avatarUrl AS friendAvatar, {_REVIEW_COLUMNS}
+    ORDER BY r.createdAt DESC
+"""
+
+USER_REVIEWS = f"""
+    MATCH (:User {{name: $username}})-[:WROTE]->(r:Review)-[:REVIEWS]->(c:Content)
+    RETURN {_REVIEW_COLUMNS}
+    ORDER BY r.createdAt DESC
+"""
+
+PUBLIC_REVIEWS = f"""
+    MATCH (r:Review)-[:REVIEWS]->(c:Content)
+    RETURN {_REVIEW_COLUMNS}
+    ORDER BY r.createdAt DESC
+    LIMIT 50
+"""
+
+FRIEND_REVIEWS_PAGE = f"""
+    MATCH (:User {{name: $username}})-[:FRIENDS_WITH]->(f:User)-[:WROTE]->(r:Review)-[:REVIEWS]->(c:Content)
+    WHERE {_AFTER_CURSOR}
+    RETURN f.name AS friendName, f.avatarUrl AS friendAvatar, {_REVIEW_COLUMNS}
+    ORDER BY r.createdAt DESC, r.id DESC
+    LIMIT $limit
+"""
+
+USER_REVIEWS_PAGE = f"""
+    MATCH (:User {{name: $username}})-[:WROTE]->(r:Review)-[:REVIEWS]->(c:Content)
+    WHERE {_AFTER_CURSOR}
+    RETURN {_REVIEW_COLUMNS}
+    ORDER BY r.createdAt DESC, r.id DESC
+    LIMIT $limit
+"""
+
+# Starting from Review with a createdAt predicate lets the planner walk the createdAt index in order
+PUBLIC_REVIEWS_PAGE = f"""
+    MATCH (r:Review)-[:REVIEWS]->(c:Content)
+    WHERE r.createdAt IS NOT NULL AND {_AFTER_CURSOR}
+    RETURN {_REVIEW_COLUMNS}
+    ORDER BY r.createdAt DESC, r.id DESC
+    LIMIT $limit
+"""
+
+FRIENDS_FOR_USERS = """
+    UNWIND $usernames AS username
+    MATCH (:User {name: username})-[:FRIENDS_WITH]->(f:User)
+    RETURN username, f.name AS name, f.avatarUrl AS avatarUrl
+    ORDER BY f.name
+"""
+
+REVIEWS_FOR_USERS = f"""
+    UNWIND $usernames AS username
+    MATCH (:User {{name: username}})-[:WROTE]->(r:Review)-[:REVIEWS]->(c:Content)
+    RETURN username, {_REVIEW_COLUMNS}
+    ORDER BY r.createdAt DESC
+"""
+
+# Range scan of the day index: only the buckets inside the window are read
+TRENDING_CONTENT = f"""
+    MATCH (a:ContentActivity)
+    WHERE a.day > date() - duration({{days: $window}})
+    MATCH (c:Content)-[:HAS_ACTIVITY]->(a)
+    WITH c, sum(a.reviews) AS recentReviews, sum(a.ratingSum) AS recentRatingSum
+    WHERE recentReviews > 0
+    RETURN {_CONTENT_COLUMNS}, recentReviews, recentRatingSum
+    ORDER BY recentReviews DESC, recentRatingSum DESC, title
+    LIMIT $first
+"""
+
+# Two hops at most, each capped: (me)->friends (weight 1), friends->their friends (weight 0.5).
+# Only each peer's recent high ratings count; content the user already reviewed is skipped.
+# Always returns one row, so the peers are known even without recommendations.
+RECOMMENDED_CONTENT = f"""
+    MATCH (me:User {{name: $username}})
+    CALL {{
+        WITH me
+        MATCH (me)-[:FRIENDS_WITH]->(f:User)
+        WITH f LIMIT $maxFriends
+        RETURN collect(f) AS friends
+    }}
+    CALL {{
+        WITH me, friends
+        UNWIND friends AS f
+        CALL {{
+            WITH f
+            MATCH (f)-[:FRIENDS_WITH]->(fof:User)
+            RETURN fof LIMIT $maxFriendsPerFriend
+        }}
+        WITH me, friends, fof
+        WHERE fof <> me AND NOT fof IN friends
+        RETURN collect(DISTINCT fof) AS friendsOfFriends
+    }}
+    CALL {{
+        WITH me, friends, friendsOfFriends
+        UNWIND [f IN friends | [f, 1.0]] + [fof IN friendsOfFriends | [fof, 0.5]] AS peerWeight
+        WITH me, peerWeight[0] AS peer, peerWeight[1] AS weight
+        CALL {{
+            WITH peer
+            MATCH (peer)-[:WROTE]->(r:Review)
+            WHERE r.rating >= $minRating
+            RETURN r ORDER BY r.createdAt DESC LIMIT $reviewsPerPeer
+        }}
+        MATCH (r)-[:REVIEWS]->(c:Content)
+        WHERE NOT EXISTS {{ (me)-[:WROTE]->(:Review)-[:REVIEWS]->(c) }}
+        WITH c, sum(weight * (r.rating - $minRating + 1)) AS score, count(DISTINCT peer) AS recommenders
+        ORDER BY score DESC, c.title
+        LIMIT $k
+        RETURN collect(c {{
+            .title, .type, .platform, .posterUrl, .mediaId,
+            ratingSum: coalesce(c.ratingSum, 0), ratingCount: coalesce(c.ratingCount, 0),
+            score: score, recommenders: recommenders
+        }}) AS recommendations
+    }}
+    RETURN [peer IN friends + friendsOfFriends | peer.name] AS peers, recommendations
+"""
+
+# Ratings of the user's (capped) friends on a set of catalog items: bounded by the
+# user's network, not by how many reviews a popular item has overall
+FRIEND_RATINGS_FOR_MEDIA = """
+    MATCH (:User {name: $username})-[:FRIENDS_WITH]->(f:User)
+    WITH f LIMIT $maxFriends
+    MATCH (f)-[:WROTE]->(r:Review)-[:REVIEWS]->(c:Content)
+    WHERE c.mediaId IN $mediaIds
+    RETURN c.mediaId AS mediaId, sum(r.rating) AS ratingSum, count(r) AS ratingCount
+"""
+
+# ----------------------------------------------------------------------
+# Writes
+# ----------------------------------------------------------------------
+ADD_FRIEND = """
+    MATCH (u:User {name: $username})
+    MATCH (f:User {name: $friendName})
+    MERGE (u)-[:FRIENDS_WITH]->(f)
+    RETURN f.name AS name, f.avatarUrl AS avatarUrl
+"""
+
+REMOVE_FRIEND = """
+    MATCH (u:User {name: $username})-[r:FRIENDS_WITH]->(f:User {name: $friendName})
+    DELETE r
+    RETURN count(r) AS deleted_count
+"""
+
+CREATE_REVIEW = f"""
+    MATCH (u:User {{name: $username}})
+    MATCH (c:Content {{title: $contentTitle}})
+    CREATE (r:Review {{id: randomUUID(), rating: $rating, comment: $comment, createdAt: datetime()}})
+    CREATE (u)-[:WROTE]->(r)
+    CREATE (r)-[:REVIEWS]->(c)
+    {_TRACK_NEW_REVIEW}
+    RETURN {_REVIEW_COLUMNS}
+"""
+
+DELETE_REVIEW = """
+    MATCH (r:Review {id: $review_id})
+    OPTIONAL MATCH (r)-[:REVIEWS]->(c:Content)
+    CALL {
+        WITH r, c
+        OPTIONAL MATCH (c)-[:HAS_ACTIVITY]->(a:ContentActivity {day: date(r.createdAt)})
+        WITH r, c, a LIMIT 1
+        SET c.ratingSum = c.ratingSum - r.rating, c.ratingCount = c.ratingCount - 1
+        SET a.reviews = a.reviews - 1, a.ratingSum = a.ratingSum - r.rating
+    }
+    DETACH DELETE r
+    RETURN count(r) AS deleted_count
+"""
+
+UPSERT_USERS = """
+    UNWIND $rows AS row
+    MERGE (u:User {name: row.name})
+    SET u.avatarUrl = row.avatarUrl
+    RETURN count(u) AS count
+"""
+
+UPSERT_CONTENT = """
+    UNWIND $rows AS row
+    MERGE (c:Content {title: row.title})
+    SET c.type = row.type, c.platform = row.platform, c.posterUrl = row.posterUrl,
+        c.mediaId = coalesce(row.mediaId, c.mediaId)
+    RETURN count(c) AS count
+"""
+
+LINK_CONTENT_TO_MEDIA = """
+    UNWIND $rows AS row
+    MATCH (c:Content {title: row.title})
+    SET c.mediaId = row.mediaId
+    RETURN count(c) AS count
+"""
+
+ADD_FRIENDS = """
+    UNWIND $rows AS row
+    MATCH (u:User {name: row.username})
+    MATCH (f:User {name: row.friendName})
+    MERGE (u)-[:FRIENDS_WITH]->(f)
+    RETURN count(f) AS count
+"""
+
+CREATE_REVIEWS = f"""
+    UNWIND $rows AS row
+    MATCH (u:User {{name: row.username}})
+    MATCH (c:Content {{title: row.contentTitle}})
+    CREATE (r:Review {{id: randomUUID(), rating: row.rating, comment: row.comment, createdAt: datetime()}})
+    CREATE (u)-[:WROTE]->(r)
+    CREATE (r)-[:REVIEWS]->(c)
+    {_TRACK_NEW_REVIEW}
+    RETURN count(r) AS count
+"""
+
+# ----------------------------------------------------------------------
+# Record mapping
+# ----------------------------------------------------------------------
+def user_from_record(record) -> User:
+    return User(name=record["name"], avatarUrl=record["avatarUrl"])
+
+def content_from_record(record) -> Content:
+    return Content(
+        title=record["title"],
+        type_=record["type"],
+        platform=record["platform"],
+        posterUrl=record["posterUrl"],
+        ratingSum=record.get("ratingSum") or 0,
+        ratingCount=record.get("ratingCount") or 0,
+        mediaId=record.get("mediaId")
+    )
+
+def trending_from_record(record) -> TrendingContent:
+    return TrendingContent(
+        content=content_from_record(record),
+        recentReviews=record["recentReviews"],
+        recentRatingSum=record["recentRatingSum"]
+    )
+
+def recommendations_from_record(record) -> Recommendations:
+    if record is None:  # unknown user
+        return Recommendations()
+    return Recommendations(
+        items=[
+            Recommendation(content=content_from_record(item), score=item["score"], recommenders=item["recommenders"])
+            for item in record["recommendations"]
+        ],
+        peers=list(record["peers"])
+    )
+
+def recommendation_parameters(username: str, k: int) -> Dict:
+    return {
+        "username": username,
+        "k": max(1, min(k, MAX_PAGE_SIZE)),
+        "maxFriends": RECOMMENDATION_MAX_FRIENDS,
+        "maxFriendsPerFriend": RECOMMENDATION_MAX_FRIENDS_PER_FRIEND,
+        "reviewsPerPeer": RECOMMENDATION_REVIEWS_PER_PEER,
+        "minRating": RECOMMENDATION_MIN_RATING,
+    }
+
+def friend_rating_from_record(record) -> FriendRating:
+    return FriendRating(
+        mediaId=record["mediaId"],
+        ratingSum=record["ratingSum"],
+        ratingCount=record["ratingCount"]
+    )
+
+def review_from_record(record) -> Review:
+    return Review(
+        id=str(record["reviewId"]),
+        rating=record["rating"],
+        comment=record["comment"],
+        createdAt=record["createdAt"],
+        content=content_from_record(record)
+    )
+
+def friend_review_from_record(record) -> FriendReview:
+    return FriendReview(
+        friend=User(name=record["friendName"], avatarUrl=record["friendAvatar"]),
+        review=review_from_record(record)
+    )
+
+def group_by_username(records, to_item: Callable, usernames: List[str]) -> Dict[str, list]:
+    """Group UNWIND results by their `username` column, keeping users without rows"""
+    grouped: Dict[str, list] = {username: [] for username in usernames}
+    for record in records:
+        grouped[record["username"]].append(to_item(record))
+    return grouped
+
+# ----------------------------------------------------------------------
+# Cursor pagination
+# ----------------------------------------------------------------------
+def encode_cursor(review: Review) -> str:
+    """Opaque feed cursor pointing just after a review"""
+    return base64.urlsafe_b64encode(json.dumps([review.createdAt, review.id]).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Return (createdAt, id) of a cursor, (None, None) for the first page"""
+    if not cursor:
+        return None, None
+    try:
+        created_at, review_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return created_at, review_id
+
+def page_parameters(first: int, after: Optional[str]) -> Tuple[int, Dict]:
+    """Clamp the page size and build the keyset parameters of a page query"""
+    first = max(1, min(first, MAX_PAGE_SIZE))
+    after_created_at, after_id = decode_cursor(after)
+    # One extra row tells whether another page exists
+    return first, {"afterCreatedAt": after_created_at, "afterId": after_id, "limit": first + 1}
+
+def build_page(records: list, first: int, to_item: Callable, to_review: Callable = lambda item: item) -> ReviewPage:
+    items = [to_item(record) for record in records[:first]]
+    return ReviewPage(
+        items=items,
+        end_cursor=encode_cursor(to_review(items[-1])) if items else None,
+        has_next_page=len(records) > first
+    )
@@ -1,200 +1,282 @@
-from typing import List, Optional
-from config.env_config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
-from neo4j import GraphDatabase
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from domain.model.user import User
-from domain.model.content import Content
-from domain.model.review import Review, FriendReview
+from domain.model.content import Content, TrendingContent, Recommendations, FriendRating
+from domain.model.review import Review, FriendReview, ReviewPage
 from domain.port.review_repository import ReviewRepository
-
+from infrastructure.adapter import neo4j_queries as queries
+from infrastructure.adapter.neo4j_driver import get_driver
+from infrastructure.adapter.neo4j_queries import SCHEMA_STATEMENTS
 
 class Neo4jReviewRepository(ReviewRepository):
-    def __init__(self, driver=None):
-        if driver is None:
-            self.driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-        else:
-            self.driver = driver
+    def __init__(self, driver=None, batch_size: int = 500, ensure_schema: bool = True):
+        """
+        Args:
+            driver: Neo4j driver, the process-wide one (neo4j_driver.get_driver) when None
+            batch_size: Rows sent per UNWIND statement by the bulk methods
+            ensure_schema: Create the constraints and indexes at startup
+        """
+        self.driver = driver if driver is not None else get_driver()
+        self.batch_size = batch_size
+        if ensure_schema:
+            self.ensure_schema()
+
+    def ensure_schema(self) -> bool:
+        """
+        Create the constraints and indexes the queries rely on (no-op when they exist).
+
+        Returns:
+            True if the schema is in place
+        """
+        try:
+            with self.driver.session() as session:
+                for statement in SCHEMA_STATEMENTS:
+                    session.run(statement).consume()
+            self.backfill_review_ids()
+            self.backfill_content_aggregates()
+            return True
+        except Exception as e:
+            # Neo4j down or duplicate names/titles: queries still work, through label scans
+            print(f"Could not ensure the Neo4j schema: {e}")
+            return False
+
+    def _batches(self, rows: list) -> Iterator[list]:
+        for start in range(0, len(rows), self.batch_size):
+            yield rows[start:start + self.batch_size]
+
+    @staticmethod
+    def _run_count(tx, query: str, rows: list) -> int:
+        """Transaction function: run one UNWIND statement, return its `count` column"""
+        record = tx.run(query, rows=rows).single()
+        return record["count"] if record else 0
+
+    def _write_in_batches(self, query: str, rows: list) -> int:
+        """One managed write transaction (retried on transient errors) per batch"""
+        total = 0
+        with self.driver.session() as session:
+            for batch in self._batches(rows):
+                total += session.execute_write(self._run_count, query, batch)
+        return total
+
+    def _backfill(self, query: str) -> int:
+        """Run a batched backfill statement until it updates fewer nodes than a batch"""
+        total = 0
+        with self.driver.session() as session:
+            while True:
+                updated = session.execute_write(lambda tx: tx.run(
+                    query, batchSize=self.batch_size
+                ).single()["count"])
+                total += updated
+                if updated < self.batch_size:
+                    break
+        return total
+
+    def backfill_review_ids(self) -> int:
+        """
+        Give a UUID to reviews created before reviews had an id property.
+
+        Returns:
+            Number of reviews updated
+        """
+        total = self._backfill(queries.BACKFILL_REVIEW_IDS)
+        if total:
+            print(f"Assigned ids to {total} existing reviews")
+        return total
+
+    def backfill_content_aggregates(self) -> int:
+        """
+        Compute rating aggregates and activity buckets of content created before they were maintained.
+
+        Returns:
+            Number of content nodes updated
+        """
+        total = self._backfill(queries.BACKFILL_CONTENT_AGGREGATES)
+        if total:
+            print(f"Computed rating aggregates of {total} existing contents")
+        return total
 
     def get_all_users(self) -> List[User]:
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (u:User)
-                RETURN u.name AS name, u.avatarUrl AS avatarUrl
-                ORDER BY u.name
-            """)
-            return [User(**record.data()) for record in result]
+            return [queries.user_from_record(record) for record in session.run(queries.ALL_USERS)]
 
     def get_user_friends(self, username: str) -> List[User]:
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (:User {name: $username})-[:FRIENDS_WITH]->(f:User)
-                RETURN f.name AS name, f.avatarUrl AS avatarUrl
-                ORDER BY f.name
-            """, username=username)
-            return [User(**record.data()) for record in result]
+            result = session.run(queries.USER_FRIENDS, username=username)
+            return [queries.user_from_record(record) for record in result]
 
     def get_all_content(self) -> List[Content]:
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (c:Content)
-                RETURN c.title AS title, c.type AS type, c.platform AS platform, c.posterUrl AS posterUrl
-                ORDER BY c.title
-            """)
-            return [
-                Content(
-                    title=record["title"],
-                    type_=record["type"],
-                    platform=record["platform"],
-                    posterUrl=record["posterUrl"]
-                )
-                for record in result
-            ]
+            return [queries.content_from_record(record) for record in session.run(queries.ALL_CONTENT)]
 
     def get_friend_reviews(self, username: str) -> List[FriendReview]:
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (:User {name: $username})-[:FRIENDS_WITH]->(f:User)-[:WROTE]->(r:Review)-[:REVIEWS]->(c:Content)
-                RETURN 
-                    f.name AS friendName, f.avatarUrl AS friendAvatar,
-                    id(r) AS reviewId, r.rating AS rating, r.comment AS comment, 
-                    toString(r.createdAt) AS createdAt,
-                    c.title AS title, c.type AS type, c.platform AS platform, c.posterUrl AS posterUrl
-                ORDER BY r.createdAt DESC
-            """, username=username)
-
-            reviews = []
-            for record in result:
-                friend = User(name=record["friendName"], avatarUrl=record["friendAvatar"])
-                content = Content(
-                    title=record["title"],
-                    type_=record["type"],
-                    platform=record["platform"],
-                    posterUrl=record["posterUrl"]
-                )
-                review = Review(
-                    id=str(record["reviewId"]),
-                    rating=record["rating"],
-                    comment=record["comment"],
-                    createdAt=record["createdAt"],
-                    content=content
-                )
-                reviews.append(FriendReview(friend=friend, review=review))
-            return reviews
+            result = session.run(queries.FRIEND_REVIEWS, username=username)
+            return [queries.friend_review_from_record(record) for record in result]
 
     def get_user_reviews(self, username: str) -> List[Review]:
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (:User {name: $username})-[:WROTE]->(r:Review)-[:REVIEWS]->(c:Content)
-                RETURN 
-                    id(r) AS reviewId, r.rating AS rating, r.comment AS comment,
-                    toString(r.createdAt) AS createdAt,
-                    c.title AS title, c.type AS type, c.platform AS platform, c.posterUrl AS posterUrl
-                ORDER BY r.createdAt DESC
-            """, username=username)
-
-            reviews = []
-            for record in result:
-                content = Content(
-                    title=record["title"],
-                    type_=record["type"],
-                    platform=record["platform"],
-                    posterUrl=record["posterUrl"]
-                )
-                review = Review(
-                    id=str(record["reviewId"]),
-                    rating=record["rating"],
-                    comment=record["comment"],
-                    createdAt=record["createdAt"],
-                    content=content
-                )
-                reviews.append(review)
-            return reviews
+            result = session.run(queries.USER_REVIEWS, username=username)
+            return [queries.review_from_record(record) for record in result]
 
     def get_public_reviews(self) -> List[Review]:
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (r:Review)-[:REVIEWS]->(c:Content)
-                RETURN 
-                    id(r) AS reviewId, r.rating AS rating, r.comment AS comment,
-                    toString(r.createdAt) AS createdAt,
-                    c.title AS title, c.type AS type, c.platform AS platform, c.posterUrl AS posterUrl
-                ORDER BY r.createdAt DESC
-                LIMIT 50
-            """)
-            reviews = []
-            for record in result:
-                content = Content(
-                    title=record["title"],
-                    type_=record["type"],
-                    platform=record["platform"],
-                    posterUrl=record["posterUrl"]
-                )
-                review = Review(
-                    id=str(record["reviewId"]),
-                    rating=record["rating"],
-                    comment=record["comment"],
-                    createdAt=record["createdAt"],
-                    content=content
-                )
-                reviews.append(review)
-            return reviews
+            return [queries.review_from_record(record) for record in session.run(queries.PUBLIC_REVIEWS)]
 
     def add_friend(self, username: str, friend_name: str) -> Optional[User]:
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (u:User {name: $username})
-                MATCH (f:User {name: $friendName})
-                MERGE (u)-[:FRIENDS_WITH]->(f)
-                RETURN f.name AS name, f.avatarUrl AS avatarUrl
-            """, username=username, friendName=friend_name).single()
-            return User(**result.data()) if result else None
+            result = session.run(queries.ADD_FRIEND, username=username, friendName=friend_name).single()
+            return queries.user_from_record(result) if result else None
 
     def remove_friend(self, username: str, friend_name: str) -> bool:
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (u:User {name: $username})-[r:FRIENDS_WITH]->(f:User {name: $friendName})
-                DELETE r
-                RETURN count(r) AS deleted_count
-            """, username=username, friendName=friend_name).single()
+            result = session.run(queries.REMOVE_FRIEND, username=username, friendName=friend_name).single()
             return result and result["deleted_count"] > 0
 
     def create_review(self, username: str, content_title: str, rating: int, comment: str) -> Optional[Review]:
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (u:User {name: $username})
-                MATCH (c:Content {title: $contentTitle})
-                CREATE (r:Review {rating: $rating, comment: $comment, createdAt: datetime()})
-                CREATE (u)-[:WROTE]->(r)
-                CREATE (r)-[:REVIEWS]->(c)
-                RETURN 
-                    id(r) AS reviewId, r.rating AS rating, r.comment AS comment,
-                    toString(r.createdAt) AS createdAt,
-                    c.title AS title, c.type AS type, c.platform AS platform, c.posterUrl AS posterUrl
-            """, username=username, contentTitle=content_title, rating=rating, comment=comment).single()
-
-            if result:
-                content = Content(
-                    title=result["title"],
-                    type_=result["type"],
-                    platform=result["platform"],
-                    posterUrl=result["posterUrl"]
-                )
-                return Review(
-                    id=str(result["reviewId"]),
-                    rating=result["rating"],
-                    comment=result["comment"],
-                    createdAt=result["createdAt"],
-                    content=content
-                )
-            return None
+            result = session.run(
+                queries.CREATE_REVIEW, username=username, contentTitle=content_title, rating=rating, comment=comment
+            ).single()
+            return queries.review_from_record(result) if result else None
 
     def delete_review(self, review_id: str) -> bool:
-        try:
-            with self.driver.session() as session:
-                result = session.run("""
-                    MATCH (r:Review) WHERE id(r) = $review_id
-                    DETACH DELETE r
-                    RETURN count(r) AS deleted_count
-                """, review_id=int(review_id)).single()
-            return result and result["deleted_count"] > 0
-        except (ValueError, TypeError):
-            return False
+        with self.driver.session() as session:
+            result = session.run(queries.DELETE_REVIEW, review_id=str(review_id)).single()
+        return result and result["deleted_count"] > 0
+
+    def get_trending_content(self, window_days: int = 7, first: int = 10) -> List[TrendingContent]:
+        """
+        Content with the most reviews over the last window_days days (today included),
+        read from the daily activity buckets.
+        """
+        with self.driver.session() as session:
+            result = session.run(queries.TRENDING_CONTENT, window=window_days, first=first)
+            return [queries.trending_from_record(record) for record in result]
+
+    def get_recommended_content(self, username: str, k: int = 10) -> Recommendations:
+        """
+        Content rated highly by the user's friends and friends of friends, best score first.
+        The traversal is capped (see the RECOMMENDATION_* constants of neo4j_queries).
+        """
+        with self.driver.session() as session:
+            record = session.execute_read(lambda tx: tx.run(
+                queries.RECOMMENDED_CONTENT, **queries.recommendation_parameters(username, k)
+            ).single())
+        return queries.recommendations_from_record(record)
+
+    def get_friend_ratings_for_media(self, username: str, media_ids: List[str]) -> Dict[str, FriendRating]:
+        """
+        Ratings the user's friends gave to catalog items, in one read for all the items.
+
+        Returns:
+            Friend ratings by catalog id (items no friend reviewed are left out)
+        """
+        if not media_ids:
+            return {}
+        with self.driver.session() as session:
+            records = session.execute_read(lambda tx: list(tx.run(
+                queries.FRIEND_RATINGS_FOR_MEDIA, username=username, mediaIds=list(dict.fromkeys(media_ids)),
+                maxFriends=queries.RECOMMENDATION_MAX_FRIENDS
+            )))
+        return {record["mediaId"]: queries.friend_rating_from_record(record) for record in records}
+
+    # ------------------------------------------------------------------
+    # Cursor-paginated feeds (keyset on createdAt, id)
+    # ------------------------------------------------------------------
+    def _fetch_page(self, query: str, first: int, after: Optional[str], to_item: Callable, to_review: Callable = lambda item: item, **params) -> ReviewPage:
+        first, page_params = queries.page_parameters(first, after)
+        with self.driver.session() as session:
+            records = list(session.run(query, **page_params, **params))
+        return queries.build_page(records, first, to_item, to_review)
+
+    def get_friend_reviews_page(self, username: str, first: int = 20, after: Optional[str] = None) -> ReviewPage:
+        return self._fetch_page(
+            queries.FRIEND_REVIEWS_PAGE, first, after, queries.friend_review_from_record,
+            lambda friend_review: friend_review.review, username=username
+        )
+
+    def get_user_reviews_page(self, username: str, first: int = 20, after: Optional[str] = None) -> ReviewPage:
+        return self._fetch_page(queries.USER_REVIEWS_PAGE, first, after, queries.review_from_record, username=username)
+
+    def get_public_reviews_page(self, first: int = 20, after: Optional[str] = None) -> ReviewPage:
+        return self._fetch_page(queries.PUBLIC_REVIEWS_PAGE, first, after, queries.review_from_record)
+
+    # ------------------------------------------------------------------
+    # Bulk operations: one UNWIND round trip per batch
+    # ------------------------------------------------------------------
+    def upsert_users_bulk(self, users: List[User]) -> int:
+        """Create or update users by name, returns the number of rows written"""
+        rows = [{"name": u.name, "avatarUrl": u.avatarUrl} for u in users]
+        return self._write_in_batches(queries.UPSERT_USERS, rows)
+
+    def upsert_content_bulk(self, contents: List[Content]) -> int:
+        """Create or update content by title, returns the number of rows written"""
+        rows = [
+            {"title": c.title, "type": c.type_, "platform": c.platform, "posterUrl": c.posterUrl, "mediaId": c.mediaId}
+            for c in contents
+        ]
+        return self._write_in_batches(queries.UPSERT_CONTENT, rows)
+
+    def link_content_to_media(self, links: Dict[str, Optional[str]]) -> int:
+        """Set the catalog id of content by title (None unlinks), returns the number of content nodes updated"""
+        rows = [{"title": title, "mediaId": media_id} for title, media_id in links.items()]
+        return self._write_in_batches(queries.LINK_CONTENT_TO_MEDIA, rows)
+
+    def add_friends_bulk(self, friendships: List[Tuple[str, str]]) -> int:
+        """
+        Add FRIENDS_WITH relationships.
+
+        Args:
+            friendships: (username, friend_name) pairs; pairs naming unknown users are skipped
+
+        Returns:
+            Number of pairs linked
+        """
+        rows = [{"username": username, "friendName": friend_name} for username, friend_name in friendships]
+        return self._write_in_batches(queries.ADD_FRIENDS, rows)
+
+    def create_reviews_bulk(self, reviews: List[Dict]) -> int:
+        """
+        Create reviews.
+
+        Args:
+            reviews: Dicts with username, content_title, rating and comment;
+                rows naming an unknown user or content are skipped
+
+        Returns:
+            Number of reviews created
+        """
+        rows = [
+            {
+                "username": review["username"],
+                "contentTitle": review["content_title"],
+                "rating": review["rating"],
+                "comment": review["comment"]
+            }
+            for review in reviews
+        ]
+        return self._write_in_batches(queries.CREATE_REVIEWS, rows)
+
+    def _read_for_users(self, query: str, usernames: List[str], to_item: Callable) -> Dict[str, list]:
+        records = []
+        with self.driver.session() as session:
+            for batch in self._batches(list(dict.fromkeys(usernames))):
+                records.extend(session.execute_read(lambda tx: list(tx.run(query, usernames=batch))))
+        return queries.group_by_username(records, to_item, usernames)
+
+    def get_friends_for_users(self, usernames: List[str]) -> Dict[str, List[User]]:
+        """
+        Friends of several users, by name, in one read per batch.
+
+        Returns:
+            Friends by username (users without friends map to an empty list)
+        """
+        return self._read_for_users(queries.FRIENDS_FOR_USERS, usernames, queries.user_from_record)
+
+    def get_reviews_for_users(self, usernames: List[str]) -> Dict[str, List[Review]]:
+        """
+        Reviews written by several users, newest first, in one read per batch.
+
+        Returns:
+            Reviews by username (users without reviews map to an empty list)
+        """
+        return self._read_for_users(queries.REVIEWS_FOR_USERS, usernames, queries.review_from_record)
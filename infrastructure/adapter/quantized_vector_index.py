@@ -0,0 +1,265 @@
+import json
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+from domain.port.vector_index import VectorIndex
+
+STORAGE_MODES = ("float16", "pq")
+
+class QuantizedVectorIndex(VectorIndex):
+    """
+    Compressed in-process vector index.
+    - float16: half-precision copy of every vector kept in RAM
+    - pq: product-quantized codes (one byte per sub-vector) kept in RAM
+    Full-precision vectors stay on disk (memory-mapped) and are only read
+    to re-score the best approximate candidates exactly.
+    """
+
+    _BLOCK_ROWS = 65536
+
+    def __init__(self, path: str, mode: str = "float16", pq_subvector_dim: int = 8,
+                 pq_centroids: int = 256, rerank_candidates: int = 50, train_sample: int = 20000):
+        """
+        Args:
+            path: Directory holding the index files
+            mode: 'float16' or 'pq'
+            pq_subvector_dim: Dimensions per PQ sub-vector (the vector dim must be a multiple)
+            pq_centroids: Centroids per PQ sub-space (at most 256, codes are uint8)
+            rerank_candidates: Approximate candidates re-scored with the float32 vectors
+            train_sample: Maximum number of vectors used to train the PQ codebooks
+        """
+        if mode not in STORAGE_MODES:
+            raise ValueError(f"Unknown storage mode: {mode}. Available: {list(STORAGE_MODES)}")
+        if not 1 <= pq_centroids <= 256:
+            raise ValueError("pq_centroids must be between 1 and 256")
+
+        self.path = path
+        self.mode = mode
+        self.pq_subvector_dim = pq_subvector_dim
+        self.pq_centroids = pq_centroids
+        self.rerank_candidates = rerank_candidates
+        self.train_sample = train_sample
+
+        os.makedirs(path, exist_ok=True)
+        self._raw_path = os.path.join(path, "vectors.f32")
+        self._meta_path = os.path.join(path, "meta.json")
+        self._codes_path = os.path.join(path, f"codes.{mode}.npy")
+        self._codebooks_path = os.path.join(path, "codebooks.npy")
+
+        self.dim: Optional[int] = None
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._codes: Optional[np.ndarray] = None
+        self._codebooks: Optional[np.ndarray] = None
+        self._raw: Optional[np.memmap] = None
+
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _load(self):
+        """Load a previously saved index, dropping rows written after the last save"""
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.dim = meta["dim"]
+        self.ids = meta["ids"]
+        self._rows = {item_id: row for row, item_id in enumerate(self.ids)}
+
+        expected_size = len(self.ids) * self.dim * 4
+        if os.path.exists(self._raw_path) and os.path.getsize(self._raw_path) > expected_size:
+            with open(self._raw_path, 'r+b') as f:
+                f.truncate(expected_size)
+
+        if os.path.exists(self._codes_path):
+            codes = np.load(self._codes_path)
+            self._codes = codes[:len(self.ids)]
+        if self.mode == "pq" and os.path.exists(self._codebooks_path):
+            self._codebooks = np.load(self._codebooks_path)
+
+    def save(self) -> None:
+        """Encode pending rows and persist codes, codebooks and ids"""
+        if self.dim is None:
+            return
+        self._ensure_codes()
+        np.save(self._codes_path, self._codes)
+        if self._codebooks is not None:
+            np.save(self._codebooks_path, self._codebooks)
+
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"dim": self.dim, "mode": self.mode, "ids": self.ids}, f)
+        os.replace(tmp_path, self._meta_path)
+
+    # ------------------------------------------------------------------
+    # Port implementation
+    # ------------------------------------------------------------------
+    def add(self, ids: List[str], embeddings: np.ndarray) -> None:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[np.newaxis, :]
+        if vectors.shape[0] != len(ids):
+            raise ValueError("ids and embeddings must have the same length")
+        if len(set(ids)) != len(ids):
+            # Chroma rejects a batch with duplicate ids as well
+            duplicates = sorted(item_id for item_id, count in Counter(ids).items() if count > 1)
+            raise ValueError(f"Duplicate ids in batch: {duplicates[:10]}")
+
+        if self.dim is None:
+            if self.mode == "pq" and vectors.shape[1] % self.pq_subvector_dim:
+                raise ValueError(f"Vector dim {vectors.shape[1]} is not a multiple of pq_subvector_dim={self.pq_subvector_dim}")
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dim {self.dim}, got {vectors.shape[1]}")
+
+        # Already indexed ids are skipped, like Chroma does for duplicate ids
+        keep = [i for i, item_id in enumerate(ids) if item_id not in self._rows]
+        if not keep:
+            return
+        if len(keep) < len(ids):
+            vectors = vectors[keep]
+
+        with open(self._raw_path, 'ab') as f:
+            np.ascontiguousarray(vectors).tofile(f)
+        for i in keep:
+            self._rows[ids[i]] = len(self.ids)
+            self.ids.append(ids[i])
+        self._raw = None
+
+    def search(self, query: np.ndarray, k: int = 5, candidate_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        if not self.ids or k <= 0:
+            return []
+        self._ensure_codes()
+        q = np.asarray(query, dtype=np.float32).ravel()
+
+        rows = None
+        if candidate_ids is not None:
+            rows = np.fromiter((self._rows[i] for i in candidate_ids if i in self._rows), dtype=np.int64)
+            if rows.size == 0:
+                return []
+
+        approx = self._approximate_scores(q, rows)
+        shortlist = min(max(k, self.rerank_candidates), approx.shape[0])
+        top = np.argpartition(-approx, shortlist - 1)[:shortlist]
+        top_rows = np.sort(top if rows is None else rows[top])
+
+        # Exact re-scoring of the shortlist with the full-precision vectors
+        exact = self._raw_vectors()[top_rows] @ q
+        order = np.argsort(-exact)[:k]
+        return [(self.ids[top_rows[i]], float(exact[i])) for i in order]
+
+    def get_vector(self, item_id: str) -> Optional[np.ndarray]:
+        row = self._rows.get(item_id)
+        if row is None:
+            return None
+        return np.array(self._raw_vectors()[row])
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def memory_report(self) -> Dict[str, Any]:
+        n = len(self.ids)
+        if n:
+            self._ensure_codes()
+        code_bytes = self._codes.nbytes if self._codes is not None else 0
+        codebook_bytes = self._codebooks.nbytes if self._codebooks is not None else 0
+        float32_bytes = (self.dim or 0) * 4
+        bytes_per_item = code_bytes / n if n else 0.0
+        return {
+            "mode": self.mode,
+            "items": n,
+            "dim": self.dim,
+            "bytes_per_item": bytes_per_item,
+            "float32_bytes_per_item": float32_bytes,
+            "compression_ratio": float32_bytes / bytes_per_item if bytes_per_item else 0.0,
+            "resident_bytes": code_bytes + codebook_bytes,
+            "on_disk_bytes": os.path.getsize(self._raw_path) if os.path.exists(self._raw_path) else 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _raw_vectors(self) -> np.memmap:
+        """Memory-mapped float32 vectors, pages are only loaded when touched"""
+        if self._raw is None or self._raw.shape[0] != len(self.ids):
+            self._raw = np.memmap(self._raw_path, dtype=np.float32, mode='r', shape=(len(self.ids), self.dim))
+        return self._raw
+
+    def _ensure_codes(self):
+        """Encode rows added since the last call"""
+        n = len(self.ids)
+        encoded = 0 if self._codes is None else self._codes.shape[0]
+        if encoded >= n:
+            return
+        raw = self._raw_vectors()
+        if self.mode == "float16":
+            new_codes = raw[encoded:n].astype(np.float16)
+        else:
+            if self._codebooks is None:
+                self._codebooks = self._train_codebooks(raw)
+            new_codes = self._encode(raw[encoded:n])
+        self._codes = new_codes if self._codes is None else np.concatenate([self._codes, new_codes])
+
+    def _approximate_scores(self, q: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Inner products computed from the compressed codes, block by block"""
+        codes = self._codes if rows is None else self._codes[rows]
+        if self.mode == "float16":
+            return np.concatenate([
+                codes[i:i + self._BLOCK_ROWS].astype(np.float32) @ q
+                for i in range(0, codes.shape[0], self._BLOCK_ROWS)
+            ])
+
+        # Asymmetric distance computation: one lookup table per sub-space
+        m, _, dsub = self._codebooks.shape
+        tables = np.einsum('mkd,md->mk', self._codebooks, q.reshape(m, dsub))
+        subspaces = np.arange(m)
+        return np.concatenate([
+            tables[subspaces, codes[i:i + self._BLOCK_ROWS]].sum(axis=1)
+            for i in range(0, codes.shape[0], self._BLOCK_ROWS)
+        ])
+
+    def _train_codebooks(self, raw: np.ndarray) -> np.ndarray:
+        """Train one k-means codebook per sub-space on a sample of the vectors"""
+        rng = np.random.default_rng(0)
+        n = raw.shape[0]
+        sample_rows = np.sort(rng.choice(n, size=min(n, self.train_sample), replace=False))
+        sample = np.asarray(raw[sample_rows], dtype=np.float32)
+
+        dsub = self.pq_subvector_dim
+        m = self.dim // dsub
+        ksub = min(self.pq_centroids, sample.shape[0])
+        codebooks = np.empty((m, ksub, dsub), dtype=np.float32)
+        for s in range(m):
+            codebooks[s] = self._kmeans(sample[:, s * dsub:(s + 1) * dsub], ksub, rng)
+        return codebooks
+
+    @staticmethod
+    def _kmeans(x: np.ndarray, k: int, rng: np.random.Generator, iterations: int = 20) -> np.ndarray:
+        centroids = x[rng.choice(x.shape[0], size=k, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = QuantizedVectorIndex._nearest_centroid(x, centroids)
+            counts = np.bincount(assignment, minlength=k)
+            sums = np.stack([np.bincount(assignment, weights=x[:, d], minlength=k) for d in range(x.shape[1])], axis=1)
+            nonempty = counts > 0
+            centroids[nonempty] = sums[nonempty] / counts[nonempty, None]
+        return centroids
+
+    @staticmethod
+    def _nearest_centroid(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        distances = (centroids * centroids).sum(axis=1) - 2.0 * (x @ centroids.T)
+        return np.argmin(distances, axis=1)
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        m, _, dsub = self._codebooks.shape
+        codes = np.empty((vectors.shape[0], m), dtype=np.uint8)
+        for start in range(0, vectors.shape[0], self._BLOCK_ROWS):
+            block = np.asarray(vectors[start:start + self._BLOCK_ROWS], dtype=np.float32)
+            for s in range(m):
+                codes[start:start + block.shape[0], s] = self._nearest_centroid(
+                    block[:, s * dsub:(s + 1) * dsub], self._codebooks[s]
+                )
+        return codes
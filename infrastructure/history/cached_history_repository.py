@@ -0,0 +1,283 @@
+import atexit
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from domain.model.chat_history import ChatHistory
+from domain.model.role_message import RoleMessage
+from domain.port.driven.chat_history_persistence_port import ChatHistoryPersistencePort
+from infrastructure.history.json_history_repository import ConcurrentModificationError
+
+@dataclass
+class _CachedConversation:
+    messages: List[RoleMessage] = field(default_factory=list)
+    persisted: int = 0  # leading messages already written to the backend
+    clear_pending: bool = False  # backend still holds messages cleared in memory
+    generation: int = 0  # bumped by clear_history, invalidates in-flight flushes
+    version: Optional[int] = None  # backend version the messages are based on (versioned backends)
+
+    @property
+    def dirty(self) -> bool:
+        return self.clear_pending or self.persisted < len(self.messages)
+
+class CachedHistoryRepository(ChatHistoryPersistencePort):
+    """
+    Write-back LRU cache of active conversations in front of another history repository.
+    Reads and appends are served from memory; new messages are flushed to the backend
+    in batches every flush_interval seconds, when the cache is full and at shutdown.
+    Messages written since the last flush are lost if the process is killed, and other
+    processes do not see them: only use it with a single API worker.
+    With a versioned backend (replace_history), a flush writes the conversation with one
+    optimistic replace; when someone else wrote it meanwhile, the new messages are rebased
+    on the stored history and retried on the next flush instead of overwriting it.
+    """
+
+    def __init__(self, backend: ChatHistoryPersistencePort, capacity: int = 256, flush_interval: float = 2.0):
+        """
+        Args:
+            backend: Repository the conversations are persisted to
+            capacity: Conversations kept in memory (dirty ones are never evicted before their flush)
+            flush_interval: Seconds between two background flushes
+        """
+        self.backend = backend
+        self.versioned = hasattr(backend, "replace_history")
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+
+        self._conversations: "OrderedDict[str, _CachedConversation]" = OrderedDict()
+        self._metrics: Dict[str, int] = {
+            "hits": 0, "misses": 0, "evictions": 0, "flushes": 0, "flushed_messages": 0, "conflicts": 0
+        }
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="history-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Port implementation
+    # ------------------------------------------------------------------
+    def get_all_conversations(self) -> list[str]:
+        # Conversations are created on the backend, so its listing is complete
+        return self.backend.get_all_conversations()
+
+    def create_conversation(self) -> str:
+        conversation_guid = self.backend.create_conversation()
+        with self._lock:
+            self._insert(conversation_guid, _CachedConversation(version=0 if self.versioned else None))
+        return conversation_guid
+
+    def get_history(self, conversation_guid: str) -> Optional[ChatHistory]:
+        conversation = self._load(conversation_guid)
+        if conversation is None:
+            return None
+        with self._lock:
+            return ChatHistory(list(conversation.messages))
+
+    def add_message_to_history(self, conversation_guid: str, role_message: RoleMessage) -> Optional[ChatHistory]:
+        def append(conversation: _CachedConversation) -> ChatHistory:
+            conversation.messages.append(role_message)
+            return ChatHistory(list(conversation.messages))
+        return self._update(conversation_guid, append)
+
+    def clear_history(self, conversation_guid: str) -> Optional[ChatHistory]:
+        def clear(conversation: _CachedConversation) -> ChatHistory:
+            conversation.messages = []
+            conversation.persisted = 0
+            conversation.clear_pending = True
+            conversation.generation += 1
+            return ChatHistory(messages=[])
+        return self._update(conversation_guid, clear)
+
+    # ------------------------------------------------------------------
+    # Paginated and ranged reads
+    # ------------------------------------------------------------------
+    def list_conversations(self, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        return self.backend.list_conversations(limit=limit, cursor=cursor)
+
+    def get_messages(self, conversation_guid: str, since: int = 0, limit: Optional[int] = None) -> Optional[List[RoleMessage]]:
+        """Served from memory when the conversation is cached, by the backend's ranged read otherwise"""
+        with self._lock:
+            conversation = self._conversations.get(conversation_guid)
+            if conversation is not None:
+                self._conversations.move_to_end(conversation_guid)
+                self._metrics["hits"] += 1
+                return conversation.messages[since:None if limit is None else since + limit]
+            self._metrics["misses"] += 1
+        # Polling a cold conversation does not pull its whole history into the cache
+        return self.backend.get_messages(conversation_guid, since=since, limit=limit)
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+    def flush(self) -> int:
+        """
+        Write every dirty conversation to the backend.
+
+        Returns:
+            Number of messages written
+        """
+        with self._flush_lock:
+            with self._lock:
+                pending = [
+                    (guid, conversation, conversation.generation, conversation.clear_pending,
+                     list(conversation.messages), conversation.persisted)
+                    for guid, conversation in self._conversations.items()
+                    if conversation.dirty
+                ]
+
+            written = 0
+            for guid, conversation, generation, clear_pending, messages, persisted in pending:
+                new_messages = messages[persisted:]
+                try:
+                    if conversation.version is not None:
+                        # One atomic rewrite, refused if another writer got there first
+                        version = self.backend.replace_history(guid, ChatHistory(messages), conversation.version)
+                    else:
+                        if clear_pending:
+                            self.backend.clear_history(guid)
+                        if new_messages:
+                            # One backend write per conversation (one file rewrite / append / transaction)
+                            self.backend.add_messages_to_history(guid, new_messages)
+                        version = None
+                except ConcurrentModificationError as e:
+                    print(f"Conflict flushing conversation {guid}, rebasing on the stored history: {e}")
+                    self._rebase(guid, conversation)
+                    continue
+                except Exception as e:
+                    # Left dirty, retried on the next flush
+                    print(f"Error flushing conversation {guid}: {e}")
+                    continue
+
+                written += len(new_messages)
+                with self._lock:
+                    conversation.version = version
+                    # A clear during the write means the backend must be cleared again
+                    if conversation.generation == generation:
+                        conversation.persisted = max(conversation.persisted, len(messages))
+                        conversation.clear_pending = False
+
+            with self._lock:
+                self._metrics["flushes"] += 1
+                self._metrics["flushed_messages"] += written
+                self._evict()
+        if written:
+            self._log_stats(f"flushed {written} messages")
+        return written
+
+    def close(self):
+        """Stop the background flusher and write the remaining changes"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._flush_requested.set()
+        self._flusher.join(timeout=self.flush_interval + 5)
+        self.flush()
+        # Conversations rebased after a conflict are still dirty: write them once more
+        if self.stats()["dirty_conversations"]:
+            self.flush()
+
+    def _log_stats(self, event: str):
+        stats = self.stats()
+        print(f"History cache: {event}; hit rate {stats['hit_rate']:.1%} "
+              f"({stats['hits']} hits, {stats['misses']} misses), {stats['cached_conversations']} cached, "
+              f"{stats['dirty_conversations']} dirty, {stats['evictions']} evictions, {stats['conflicts']} conflicts")
+
+    def stats(self) -> Dict[str, float]:
+        """Cache hit/miss counters and current occupancy"""
+        with self._lock:
+            stats = dict(self._metrics)
+            stats["cached_conversations"] = len(self._conversations)
+            stats["dirty_conversations"] = sum(1 for c in self._conversations.values() if c.dirty)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _flush_loop(self):
+        while not self._closed.is_set():
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            if self._closed.is_set():
+                break
+            self.flush()
+
+    def _load(self, conversation_guid: str) -> Optional[_CachedConversation]:
+        with self._lock:
+            conversation = self._conversations.get(conversation_guid)
+            if conversation is not None:
+                self._conversations.move_to_end(conversation_guid)
+                self._metrics["hits"] += 1
+                return conversation
+            self._metrics["misses"] += 1
+
+        history, version = self._read_backend(conversation_guid)
+        if history is None:
+            return None
+        with self._lock:
+            # Another thread may have loaded it meanwhile: keep the first copy
+            conversation = self._conversations.get(conversation_guid)
+            if conversation is None:
+                conversation = _CachedConversation(
+                    messages=list(history.messages), persisted=len(history.messages), version=version
+                )
+                self._insert(conversation_guid, conversation)
+            return conversation
+
+    def _read_backend(self, conversation_guid: str) -> Tuple[Optional[ChatHistory], Optional[int]]:
+        if self.versioned:
+            return self.backend.get_history_with_version(conversation_guid)
+        return self.backend.get_history(conversation_guid), None
+
+    def _rebase(self, conversation_guid: str, conversation: _CachedConversation):
+        """Replay the unwritten messages on top of the stored history, after a version conflict"""
+        history, version = self._read_backend(conversation_guid)
+        with self._lock:
+            self._metrics["conflicts"] += 1
+            if history is None:
+                # Deleted by someone else: nothing left to write to
+                if self._conversations.get(conversation_guid) is conversation:
+                    del self._conversations[conversation_guid]
+                return
+            if not conversation.clear_pending:
+                # A pending clear still wins over what was stored meanwhile
+                stored = list(history.messages)
+                conversation.messages = stored + conversation.messages[conversation.persisted:]
+                conversation.persisted = len(stored)
+            conversation.version = version
+
+    def _update(self, conversation_guid: str, change: Callable[[_CachedConversation], ChatHistory]) -> Optional[ChatHistory]:
+        """Apply a change to a cached conversation, reloading it if it was evicted meanwhile"""
+        while True:
+            conversation = self._load(conversation_guid)
+            if conversation is None:
+                return None
+            with self._lock:
+                if self._conversations.get(conversation_guid) is conversation:
+                    return change(conversation)
+
+    def _insert(self, conversation_guid: str, conversation: _CachedConversation):
+        """Add a conversation, caller holds the lock"""
+        self._conversations[conversation_guid] = conversation
+        self._conversations.move_to_end(conversation_guid)
+        self._evict()
+
+    def _evict(self):
+        """Drop least recently used clean conversations, caller holds the lock"""
+        overflow = len(self._conversations) - self.capacity
+        if overflow <= 0:
+            return
+        # The most recent entry is the one being inserted or used: never evict it
+        most_recent = next(reversed(self._conversations))
+        clean = [guid for guid, c in self._conversations.items() if not c.dirty and guid != most_recent]
+        for guid in clean[:overflow]:
+            del self._conversations[guid]
+            self._metrics["evictions"] += 1
+        if len(self._conversations) > self.capacity:
+            # Only dirty conversations left: flush early so they can be evicted
+            self._flush_requested.set()
@@ -0,0 +1,23 @@
+import os
+import heapq
+from typing import Iterator, List, Optional, Tuple
+
+def list_conversation_page(storage_folder: str, suffix: str, limit: int, cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+    """
+    Page through the conversations stored as `<id><suffix>` files, in id order.
+    One directory scan: ids up to the cursor are skipped during the scan and only the
+    limit + 1 smallest remaining ones are kept in a heap, the listing is never sorted.
+
+    Returns:
+        (conversation ids, cursor of the next page or None on the last page)
+    """
+    def ids_after_cursor() -> Iterator[str]:
+        with os.scandir(storage_folder) as entries:
+            for entry in entries:
+                if entry.name.endswith(suffix):
+                    conversation_id = entry.name[:-len(suffix)]
+                    if cursor is None or conversation_id > cursor:
+                        yield conversation_id
+
+    page = heapq.nsmallest(limit + 1, ids_after_cursor())
+    return page[:limit], (page[limit - 1] if len(page) > limit else None)
@@ -0,0 +1,37 @@
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+@contextmanager
+def conversation_lock(file_path: str, shared: bool = False):
+    """
+    Advisory lock on a conversation file, held through a `<file>.lock` sidecar
+    so the data file itself can be replaced while the lock is held.
+    Locks are taken per open file, so they exclude other threads as well as other processes.
+
+    Args:
+        file_path: Conversation file to lock
+        shared: Take a shared lock (several holders) instead of an exclusive one.
+            Windows only has exclusive locks.
+    """
+    fd = os.open(file_path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
@@ -1,52 +1,170 @@
 import os
 import json
 import uuid
-from typing import Optional
+import tempfile
+from typing import List, Optional, Tuple
 from dataclasses import asdict
 
 from domain.model.chat_history import ChatHistory
 from domain.model.role_message import RoleMessage
 from domain.port.driven.chat_history_persistence_port import ChatHistoryPersistencePort
+from infrastructure.history.file_lock import conversation_lock
+from infrastructure.history.conversation_files import list_conversation_page
+
+class ConcurrentModificationError(Exception):
+    """The conversation changed since the version the caller read"""
 
 class JsonHistoryRepository(ChatHistoryPersistencePort):
+    """
+    One JSON file per conversation, safe to share between processes:
+    - files are replaced atomically (temp file + rename), readers never see a partial write
+    - read-modify-write cycles hold a per-conversation advisory lock
+    - every write bumps a "version" field, checked by replace_history
+    """
+
     def __init__(self, storage_folder: str):
         self.storage_folder = storage_folder
         os.makedirs(self.storage_folder, exist_ok=True)
 
+    def _file_path(self, conversation_guid: str) -> str:
+        return os.path.join(self.storage_folder, f"{conversation_guid}.json")
+
     def get_all_conversations(self) -> list[str]:
         files = os.listdir(self.storage_folder)
         return [file.split('.')[0] for file in files if file.endswith('.json')]
 
     def create_conversation(self) -> str:
         new_conversation_id = str(uuid.uuid4())
-        file_path = os.path.join(self.storage_folder, f"{new_conversation_id}.json")
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump(asdict(ChatHistory(messages=[])), file, ensure_ascii=False, indent=4)
+        self._write(self._file_path(new_conversation_id), ChatHistory(messages=[]), version=0)
         return new_conversation_id
 
     def get_history(self, conversation_guid: str) -> Optional[ChatHistory]:
-        file_path = os.path.join(self.storage_folder, f"{conversation_guid}.json")
+        history, _ = self.get_history_with_version(conversation_guid)
+        return history
+
+    def add_message_to_history(self, conversation_guid: str, role_message: RoleMessage) -> Optional[ChatHistory]:
+        file_path = self._file_path(conversation_guid)
         if not os.path.exists(file_path):
             return None
-        with open(file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            messages = [RoleMessage(**msg) for msg in data.get('messages', [])]
-            return ChatHistory(messages)
+        with conversation_lock(file_path):
+            chat_history, version = self._read(file_path)
+            if chat_history is None:
+                return None
+            chat_history.messages.append(role_message)
+            self._write(file_path, chat_history, version + 1)
+        return chat_history
 
-    def add_message_to_history(self, conversation_guid: str, role_message: RoleMessage) -> Optional[ChatHistory]:
-        chat_history = self.get_history(conversation_guid)
-        if chat_history is None:
+    def add_messages_to_history(self, conversation_guid: str, role_messages: List[RoleMessage]) -> Optional[int]:
+        """
+        Append several messages with a single file rewrite.
+
+        Returns:
+            Number of messages written, None if the conversation does not exist
+        """
+        file_path = self._file_path(conversation_guid)
+        if not os.path.exists(file_path):
             return None
-        chat_history.messages.append(role_message)
-        file_path = os.path.join(self.storage_folder, f"{conversation_guid}.json")
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump(asdict(chat_history), file, ensure_ascii=False, indent=4)
-        return self.get_history(conversation_guid)
+        with conversation_lock(file_path):
+            chat_history, version = self._read(file_path)
+            if chat_history is None:
+                return None
+            chat_history.messages.extend(role_messages)
+            self._write(file_path, chat_history, version + 1)
+        return len(role_messages)
 
     def clear_history(self, conversation_guid: str) -> Optional[ChatHistory]:
-        file_path = os.path.join(self.storage_folder, f"{conversation_guid}.json")
+        file_path = self._file_path(conversation_guid)
         if not os.path.exists(file_path):
             return None
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump(asdict(ChatHistory(messages=[])), file, ensure_ascii=False, indent=4)
-        return self.get_history(conversation_guid)
+        with conversation_lock(file_path):
+            chat_history, version = self._read(file_path)
+            if chat_history is None:
+                return None
+            self._write(file_path, ChatHistory(messages=[]), version + 1)
+        return ChatHistory(messages=[])
+
+    # ------------------------------------------------------------------
+    # Paginated and ranged reads
+    # ------------------------------------------------------------------
+    def list_conversations(self, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """
+        Page through conversation ids in id order, with a bounded scan of the folder
+        (memory in the page size, no sort of the whole listing).
+
+        Returns:
+            (conversation ids, cursor of the next page or None on the last page)
+        """
+        return list_conversation_page(self.storage_folder, ".json", limit, cursor)
+
+    def get_messages(self, conversation_guid: str, since: int = 0, limit: Optional[int] = None) -> Optional[List[RoleMessage]]:
+        """
+        Read a range of messages. Not a native ranged read: a JSON document is parsed whole
+        before slicing, so the cost grows with the history (the jsonl and sqlite backends
+        read only the range).
+        """
+        chat_history = self.get_history(conversation_guid)
+        if chat_history is None:
+            return None
+        return chat_history.messages[since:None if limit is None else since + limit]
+
+    # ------------------------------------------------------------------
+    # Optimistic versioning
+    # ------------------------------------------------------------------
+    def get_history_with_version(self, conversation_guid: str) -> Tuple[Optional[ChatHistory], int]:
+        """Return the history and the version to pass to replace_history"""
+        return self._read(self._file_path(conversation_guid))
+
+    def replace_history(self, conversation_guid: str, chat_history: ChatHistory, expected_version: int) -> int:
+        """
+        Overwrite a history read earlier, unless someone else wrote it in between.
+
+        Args:
+            conversation_guid: Conversation to overwrite
+            chat_history: New content
+            expected_version: Version returned by get_history_with_version
+
+        Returns:
+            The new version
+
+        Raises:
+            ConcurrentModificationError: The stored version is not expected_version
+        """
+        file_path = self._file_path(conversation_guid)
+        if not os.path.exists(file_path):
+            raise ConcurrentModificationError(f"Conversation {conversation_guid} does not exist")
+        with conversation_lock(file_path):
+            _, version = self._read(file_path)
+            if version != expected_version:
+                raise ConcurrentModificationError(
+                    f"Conversation {conversation_guid} is at version {version}, expected {expected_version}"
+                )
+            self._write(file_path, chat_history, version + 1)
+        return version + 1
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _read(file_path: str) -> Tuple[Optional[ChatHistory], int]:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None, -1
+        messages = [RoleMessage(**msg) for msg in data.get('messages', [])]
+        # Files written before versioning count as version 0
+        return ChatHistory(messages), data.get('version', 0)
+
+    def _write(self, file_path: str, chat_history: ChatHistory, version: int):
+        """Write to a temp file in the same folder, then rename it over the target"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.storage_folder, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump({**asdict(chat_history), 'version': version}, file, ensure_ascii=False, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,302 @@
+import os
+import json
+import time
+import uuid
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import asdict
+
+from domain.model.chat_history import ChatHistory
+from domain.model.role_message import RoleMessage
+from domain.port.driven.chat_history_persistence_port import ChatHistoryPersistencePort
+from infrastructure.history.file_lock import conversation_lock
+from infrastructure.history.conversation_files import list_conversation_page
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+# Appended by clear_history: readers ignore everything before it, compaction drops it
+_CLEAR_RECORD = b'{"op": "clear"}'
+
+class JsonlHistoryRepository(ChatHistoryPersistencePort):
+    """
+    Append-only JSON Lines chat history: one file per conversation, one message per line.
+    - add_message_to_history appends a single line (O(1) in the history size)
+    - clear_history appends a clear marker, later removed by compaction
+    - tail reads the last N messages from the end of the file
+    """
+
+    _TAIL_BLOCK_SIZE = 8192
+
+    def __init__(self, storage_folder: str, fsync_policy: str = "interval", fsync_interval: float = 1.0,
+                 compact_every: int = 1000):
+        """
+        Args:
+            storage_folder: Folder holding one .jsonl file per conversation
+            fsync_policy: 'always' (every append), 'interval' (at most once per fsync_interval
+                seconds per conversation) or 'never' (left to the OS)
+            fsync_interval: Seconds between two fsyncs of a conversation with the 'interval' policy
+            compact_every: Writes between two compactions of cleared conversations
+        """
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync_policy}. Available: {list(FSYNC_POLICIES)}")
+        self.storage_folder = storage_folder
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+
+        self._last_fsync: Dict[str, float] = {}
+        self._needs_compaction: Set[str] = set()
+        self._writes_since_compaction = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.storage_folder, exist_ok=True)
+
+    def _file_path(self, conversation_guid: str) -> str:
+        return os.path.join(self.storage_folder, f"{conversation_guid}.jsonl")
+
+    # ------------------------------------------------------------------
+    # Port implementation
+    # ------------------------------------------------------------------
+    def get_all_conversations(self) -> list[str]:
+        with os.scandir(self.storage_folder) as entries:
+            return [entry.name[:-len(".jsonl")] for entry in entries if entry.name.endswith('.jsonl')]
+
+    def create_conversation(self) -> str:
+        new_conversation_id = str(uuid.uuid4())
+        with open(self._file_path(new_conversation_id), 'xb'):
+            pass
+        return new_conversation_id
+
+    def get_history(self, conversation_guid: str) -> Optional[ChatHistory]:
+        file_path = self._file_path(conversation_guid)
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, 'rb') as file:
+            lines = file.read().splitlines()
+        return ChatHistory(self._parse_messages(conversation_guid, lines))
+
+    def add_message_to_history(self, conversation_guid: str, role_message: RoleMessage) -> Optional[ChatHistory]:
+        if not self._append(conversation_guid, json.dumps(asdict(role_message), ensure_ascii=False).encode('utf-8')):
+            return None
+        return self.get_history(conversation_guid)
+
+    def add_messages_to_history(self, conversation_guid: str, role_messages: List[RoleMessage]) -> Optional[int]:
+        """
+        Append several messages with a single write.
+
+        Returns:
+            Number of messages written, None if the conversation does not exist
+        """
+        records = [json.dumps(asdict(message), ensure_ascii=False).encode('utf-8') for message in role_messages]
+        if not self._append(conversation_guid, *records):
+            return None
+        return len(records)
+
+    def clear_history(self, conversation_guid: str) -> Optional[ChatHistory]:
+        with self._lock:
+            self._needs_compaction.add(conversation_guid)
+        if not self._append(conversation_guid, _CLEAR_RECORD):
+            return None
+        return ChatHistory(messages=[])
+
+    # ------------------------------------------------------------------
+    # Paginated and ranged reads
+    # ------------------------------------------------------------------
+    def list_conversations(self, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """
+        Page through conversation ids in id order, with a bounded scan of the folder
+        (memory in the page size, no sort of the whole listing).
+
+        Returns:
+            (conversation ids, cursor of the next page or None on the last page)
+        """
+        return list_conversation_page(self.storage_folder, ".jsonl", limit, cursor)
+
+    def get_messages(self, conversation_guid: str, since: int = 0, limit: Optional[int] = None) -> Optional[List[RoleMessage]]:
+        """
+        Read a range of messages in one streaming pass. Positions only count records that
+        decode, as in get_history, so a torn line does not shift the pages after it.
+
+        Args:
+            conversation_guid: Conversation to read
+            since: Number of leading messages to skip
+            limit: Maximum number of messages to return, None for all the remaining ones
+
+        Returns:
+            The messages, or None if the conversation does not exist
+        """
+        file_path = self._file_path(conversation_guid)
+        if not os.path.exists(file_path):
+            return None
+
+        end = None if limit is None else since + limit
+        selected: List[RoleMessage] = []
+        index = 0
+        with open(file_path, 'rb') as file:
+            for line in file:
+                record = line.strip()
+                if not record:
+                    continue
+                if record == _CLEAR_RECORD:
+                    selected, index = [], 0
+                    with self._lock:
+                        self._needs_compaction.add(conversation_guid)
+                    continue
+                message = self._decode(record)
+                if message is None:
+                    continue
+                if index >= since and (end is None or index < end):
+                    selected.append(message)
+                index += 1
+        return selected
+
+    # ------------------------------------------------------------------
+    # Tail read and compaction
+    # ------------------------------------------------------------------
+    def tail(self, conversation_guid: str, count: int) -> List[RoleMessage]:
+        """Return the last `count` messages, reading the file backwards block by block"""
+        file_path = self._file_path(conversation_guid)
+        if count <= 0 or not os.path.exists(file_path):
+            return []
+
+        messages: List[RoleMessage] = []
+        with open(file_path, 'rb') as file:
+            position = file.seek(0, os.SEEK_END)
+            remainder = b""
+            while position > 0 and len(messages) < count:
+                read_size = min(self._TAIL_BLOCK_SIZE, position)
+                position -= read_size
+                file.seek(position)
+                lines = (file.read(read_size) + remainder).split(b"\n")
+                # The first piece may be a partial line unless we reached the file start
+                remainder = lines.pop(0) if position > 0 else b""
+                for line in reversed(lines):
+                    if line.strip() == _CLEAR_RECORD:
+                        position = 0
+                        break
+                    # Undecodable (torn) lines do not count towards `count`
+                    message = self._decode(line.strip()) if line.strip() else None
+                    if message is not None:
+                        messages.append(message)
+                        if len(messages) == count:
+                            break
+
+        messages.reverse()
+        return messages
+
+    def compact(self, conversation_guid: str) -> None:
+        """Rewrite a conversation file without the records hidden by clear markers"""
+        file_path = self._file_path(conversation_guid)
+        if not os.path.exists(file_path):
+            # Deleted: forget it, locking it would recreate its .lock sidecar
+            with self._lock:
+                self._needs_compaction.discard(conversation_guid)
+            return
+        # Exclusive across processes and threads: no append may land in the file being replaced
+        with conversation_lock(file_path):
+            try:
+                with open(file_path, 'rb') as file:
+                    lines = file.read().splitlines()
+            except FileNotFoundError:
+                # Deleted while we waited for the lock
+                with self._lock:
+                    self._needs_compaction.discard(conversation_guid)
+                return
+            live = self._live_records(lines)
+            tmp_path = file_path + ".tmp"
+            with open(tmp_path, 'wb') as file:
+                file.write(b"".join(line + b"\n" for line in live))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, file_path)
+        with self._lock:
+            self._needs_compaction.discard(conversation_guid)
+
+    def compact_all(self) -> None:
+        with self._lock:
+            pending = list(self._needs_compaction)
+        for conversation_guid in pending:
+            try:
+                self.compact(conversation_guid)
+            except OSError as e:
+                # Runs from the append of another conversation: never fail that write
+                print(f"Error compacting conversation {conversation_guid}: {e}")
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _append(self, conversation_guid: str, *records: bytes) -> bool:
+        file_path = self._file_path(conversation_guid)
+        if not os.path.exists(file_path):
+            return False
+        # The file lock keeps appends out of a compaction in progress (which replaces the file);
+        # O_APPEND writes are atomic, so concurrent appends only need it shared
+        with conversation_lock(file_path, shared=True):
+            try:
+                fd = os.open(file_path, os.O_RDWR | os.O_APPEND)
+            except FileNotFoundError:
+                return False
+            try:
+                data = b"".join(record + b"\n" for record in records)
+                if self._ends_with_partial_line(fd):
+                    # Terminate the line torn by a crash, or the new records would be glued to it
+                    data = b"\n" + data
+                # A single O_APPEND write keeps concurrent appends from interleaving
+                os.write(fd, data)
+                if self._should_fsync(conversation_guid):
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        with self._lock:
+            self._writes_since_compaction += len(records)
+            compact_now = self._writes_since_compaction >= self.compact_every
+            if compact_now:
+                self._writes_since_compaction = 0
+        if compact_now:
+            self.compact_all()
+        return True
+
+    @staticmethod
+    def _ends_with_partial_line(fd: int) -> bool:
+        if os.fstat(fd).st_size == 0:
+            return False
+        os.lseek(fd, -1, os.SEEK_END)
+        return os.read(fd, 1) != b"\n"
+
+    def _should_fsync(self, conversation_guid: str) -> bool:
+        if self.fsync_policy == "always":
+            return True
+        if self.fsync_policy == "never":
+            return False
+        now = time.monotonic()
+        if now - self._last_fsync.get(conversation_guid, 0.0) >= self.fsync_interval:
+            self._last_fsync[conversation_guid] = now
+            return True
+        return False
+
+    @staticmethod
+    def _live_records(lines: List[bytes]) -> List[bytes]:
+        """Records after the last clear marker"""
+        live: List[bytes] = []
+        for line in lines:
+            if line.strip() == _CLEAR_RECORD:
+                live = []
+            elif line.strip():
+                live.append(line)
+        return live
+
+    def _parse_messages(self, conversation_guid: str, lines: List[bytes]) -> List[RoleMessage]:
+        live = self._live_records(lines)
+        if len(live) < sum(1 for line in lines if line.strip()):
+            with self._lock:
+                self._needs_compaction.add(conversation_guid)
+
+        return [message for message in map(self._decode, live) if message is not None]
+
+    @staticmethod
+    def _decode(record: bytes) -> Optional[RoleMessage]:
+        try:
+            return RoleMessage(**json.loads(record))
+        except json.JSONDecodeError:
+            # Torn line after a crash mid-write
+            return None
@@ -0,0 +1,243 @@
+import os
+import json
+import base64
+import time
+import uuid
+import sqlite3
+import threading
+from typing import List, Optional, Tuple
+from dataclasses import asdict
+
+from domain.model.chat_history import ChatHistory
+from domain.model.role_message import RoleMessage
+from domain.port.driven.chat_history_persistence_port import ChatHistoryPersistencePort
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS conversations (
+        id TEXT PRIMARY KEY,
+        created_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS messages (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        conversation_id TEXT NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        payload TEXT NOT NULL,
+        UNIQUE (conversation_id, position)
+    );
+    CREATE INDEX IF NOT EXISTS idx_messages_conversation_seq ON messages(conversation_id, seq);
+    CREATE INDEX IF NOT EXISTS idx_conversations_created ON conversations(created_at, id);
+"""
+
+# Constant statements, compiled once per connection by sqlite3's statement cache
+_INSERT_CONVERSATION = "INSERT INTO conversations (id, created_at) VALUES (?, ?)"
+_CONVERSATION_EXISTS = "SELECT 1 FROM conversations WHERE id = ?"
+_SELECT_ALL_CONVERSATIONS = "SELECT id FROM conversations ORDER BY created_at, id"
+_SELECT_CONVERSATIONS_PAGE = "SELECT id, created_at FROM conversations ORDER BY created_at, id LIMIT ?"
+_SELECT_CONVERSATIONS_AFTER = """
+    SELECT id, created_at FROM conversations
+    WHERE created_at > ? OR (created_at = ? AND id > ?)
+    ORDER BY created_at, id LIMIT ?
+"""
+# Messages are ordered by seq alone: created_at is wall-clock time and may step backwards
+_SELECT_MESSAGES = "SELECT payload FROM messages WHERE conversation_id = ? ORDER BY seq"
+_SELECT_LAST_MESSAGES = """
+    SELECT payload FROM (
+        SELECT seq, payload FROM messages WHERE conversation_id = ?
+        ORDER BY seq DESC LIMIT ?
+    ) ORDER BY seq
+"""
+# Keyset on the (conversation_id, position) key: a range seek, no OFFSET scan
+_SELECT_MESSAGES_RANGE = """
+    SELECT payload FROM messages
+    WHERE conversation_id = ? AND position >= ? AND position < ?
+    ORDER BY seq
+"""
+_NEXT_POSITION = "SELECT COALESCE(MAX(position) + 1, 0) FROM messages WHERE conversation_id = ?"
+# Writes are serialized by SQLite, so positions are dense and follow seq within a conversation
+_INSERT_MESSAGE = """
+    INSERT INTO messages (conversation_id, position, created_at, payload)
+    SELECT ?, (SELECT COALESCE(MAX(position) + 1, 0) FROM messages WHERE conversation_id = ?), ?, ?
+    WHERE EXISTS (SELECT 1 FROM conversations WHERE id = ?)
+"""
+_INSERT_MESSAGES = "INSERT INTO messages (conversation_id, position, created_at, payload) VALUES (?, ?, ?, ?)"
+_DELETE_MESSAGES = "DELETE FROM messages WHERE conversation_id = ?"
+
+class InvalidCursorError(ValueError):
+    """A pagination cursor that was not returned by list_conversations"""
+
+def _encode_cursor(created_at: float, conversation_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([created_at, conversation_id]).encode("utf-8")).decode("ascii")
+
+def _decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        created_at, conversation_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(created_at), str(conversation_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+class SqliteHistoryRepository(ChatHistoryPersistencePort):
+    """
+    SQLite chat history in WAL mode.
+    Listing, lookup and append go through the primary keys and the (conversation_id, seq)
+    and (conversation_id, position) indexes instead of directory listings and file rewrites.
+    position is the 0-based index of a message in its conversation, the key of ranged reads.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, WAL lets readers run alongside the writer"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30, cached_statements=64, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def _to_messages(rows) -> List[RoleMessage]:
+        return [RoleMessage(**json.loads(payload)) for (payload,) in rows]
+
+    # ------------------------------------------------------------------
+    # Port implementation
+    # ------------------------------------------------------------------
+    def get_all_conversations(self) -> list[str]:
+        return [conversation_id for (conversation_id,) in self._connection().execute(_SELECT_ALL_CONVERSATIONS)]
+
+    def create_conversation(self) -> str:
+        new_conversation_id = str(uuid.uuid4())
+        self._connection().execute(_INSERT_CONVERSATION, (new_conversation_id, time.time()))
+        return new_conversation_id
+
+    def get_history(self, conversation_guid: str) -> Optional[ChatHistory]:
+        connection = self._connection()
+        if connection.execute(_CONVERSATION_EXISTS, (conversation_guid,)).fetchone() is None:
+            return None
+        return ChatHistory(self._to_messages(connection.execute(_SELECT_MESSAGES, (conversation_guid,))))
+
+    def add_message_to_history(self, conversation_guid: str, role_message: RoleMessage) -> Optional[ChatHistory]:
+        payload = json.dumps(asdict(role_message), ensure_ascii=False)
+        cursor = self._connection().execute(
+            _INSERT_MESSAGE, (conversation_guid, conversation_guid, time.time(), payload, conversation_guid)
+        )
+        if cursor.rowcount == 0:
+            return None
+        return self.get_history(conversation_guid)
+
+    def add_messages_to_history(self, conversation_guid: str, role_messages: List[RoleMessage]) -> Optional[int]:
+        """
+        Append several messages in one transaction.
+
+        Returns:
+            Number of messages written, None if the conversation does not exist
+        """
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if connection.execute(_CONVERSATION_EXISTS, (conversation_guid,)).fetchone() is None:
+                connection.execute("ROLLBACK")
+                return None
+            (position,) = connection.execute(_NEXT_POSITION, (conversation_guid,)).fetchone()
+            connection.executemany(_INSERT_MESSAGES, [
+                (conversation_guid, position + i, now, json.dumps(asdict(message), ensure_ascii=False))
+                for i, message in enumerate(role_messages)
+            ])
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return len(role_messages)
+
+    def clear_history(self, conversation_guid: str) -> Optional[ChatHistory]:
+        connection = self._connection()
+        if connection.execute(_CONVERSATION_EXISTS, (conversation_guid,)).fetchone() is None:
+            return None
+        connection.execute(_DELETE_MESSAGES, (conversation_guid,))
+        return ChatHistory(messages=[])
+
+    # ------------------------------------------------------------------
+    # Indexed reads
+    # ------------------------------------------------------------------
+    def list_conversations(self, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """
+        Page through conversations in creation order.
+
+        Args:
+            limit: Maximum number of ids to return
+            cursor: Opaque cursor returned by the previous page, None for the first page
+
+        Returns:
+            (conversation ids, cursor of the next page or None on the last page)
+
+        Raises:
+            InvalidCursorError: The cursor is malformed
+        """
+        connection = self._connection()
+        if cursor:
+            created_at, last_id = _decode_cursor(cursor)
+            rows = connection.execute(_SELECT_CONVERSATIONS_AFTER, (created_at, created_at, last_id, limit + 1)).fetchall()
+        else:
+            rows = connection.execute(_SELECT_CONVERSATIONS_PAGE, (limit + 1,)).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1][1], rows[-1][0]) if has_more and rows else None
+        return [conversation_id for conversation_id, _ in rows], next_cursor
+
+    def get_messages(self, conversation_guid: str, since: int = 0, limit: Optional[int] = None) -> Optional[List[RoleMessage]]:
+        """
+        Read a range of messages with a keyset seek on their position.
+
+        Args:
+            conversation_guid: Conversation to read
+            since: Number of leading messages to skip
+            limit: Maximum number of messages to return, None for all the remaining ones
+
+        Returns:
+            The messages, or None if the conversation does not exist
+        """
+        connection = self._connection()
+        if connection.execute(_CONVERSATION_EXISTS, (conversation_guid,)).fetchone() is None:
+            return None
+        if limit is None:
+            (end,) = connection.execute(_NEXT_POSITION, (conversation_guid,)).fetchone()
+        else:
+            end = since + limit
+        rows = connection.execute(_SELECT_MESSAGES_RANGE, (conversation_guid, since, end))
+        return self._to_messages(rows)
+
+    def tail(self, conversation_guid: str, count: int) -> List[RoleMessage]:
+        """Return the last `count` messages of a conversation"""
+        if count <= 0:
+            return []
+        return self._to_messages(self._connection().execute(_SELECT_LAST_MESSAGES, (conversation_guid, count)))
+
+    def import_conversation(self, conversation_guid: str, messages: List[RoleMessage], created_at: Optional[float] = None) -> None:
+        """Insert a whole conversation in one transaction (used by the JSON migration)"""
+        created_at = time.time() if created_at is None else created_at
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(_INSERT_CONVERSATION, (conversation_guid, created_at))
+            # Inserted in order, so seq keeps the original message order
+            connection.executemany(_INSERT_MESSAGES, [
+                (conversation_guid, i, created_at, json.dumps(asdict(message), ensure_ascii=False))
+                for i, message in enumerate(messages)
+            ])
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
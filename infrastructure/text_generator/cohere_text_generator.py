@@ -1,22 +1,25 @@
-from typing import List
+from typing import List, Optional
 
 from domain.model.chat_history import ChatHistory
 from domain.port.driven.text_generator_port import TextGeneratorPort
 from cohere import Client
 from domain.model.role_message import RoleMessage
 from config.env_config import EnvConfig
+from infrastructure.text_generator.history_window import ConversationHistoryManager
 
 class CohereTextGenerator(TextGeneratorPort):
     """
     Adapter for Cohere API.
     """
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, history_window_turns: int = 6):
         """
         Initialize the Cohere client.
         If api_key is not provided, it will be fetched from environment variables.
+        Only the last history_window_turns turns are sent verbatim, older ones as a rolling summary.
         """
         self.api_key = api_key or EnvConfig.get_cohere_api_key()
         self.client = Client(self.api_key)
+        self.history_manager = ConversationHistoryManager(self.summarize_history, window_turns=history_window_turns)
     
     def generate_text(self, prompt: str) -> str:
         """
@@ -27,28 +30,54 @@ class CohereTextGenerator(TextGeneratorPort):
         )
         return response.text
     
-    def generate_text_with_history(self, prompt: str, history: list[RoleMessage]) -> str:
+    def generate_text_with_history(self, prompt: str, history: list[RoleMessage], summary: Optional[str] = None) -> str:
         """
         Generate text using Cohere's chat model with conversation history.
+        An optional summary of older turns is passed as preamble.
         """
-        response = self.client.chat(
-            message=prompt,
-            chat_history=history
-        )
+        if summary:
+            response = self.client.chat(
+                message=prompt,
+                chat_history=history,
+                preamble=f"Summary of the earlier conversation:\n{summary}"
+            )
+        else:
+            response = self.client.chat(
+                message=prompt,
+                chat_history=history
+            )
         return response.text
-    def get_generated_text(self, chat_history: ChatHistory) -> str:
+
+    def summarize_history(self, previous_summary: Optional[str], messages: List[RoleMessage]) -> str:
+        """
+        Fold messages into a rolling summary of the conversation.
+        """
+        transcript = "\n".join(f"{m.role}: {m.message}" for m in messages)
+        previous = f"Current summary:\n{previous_summary}\n\n" if previous_summary else ""
+        return self.generate_text(
+            f"{previous}New messages:\n{transcript}\n\n"
+            "Update the summary of this conversation in a few sentences. Keep names, titles, "
+            "preferences and open questions; drop greetings and small talk. Reply with the summary only."
+        )
+
+    def get_generated_text(self, chat_history: ChatHistory, conversation_id: Optional[str] = None) -> str:
         """
         Utilise l'historique de conversation pour générer une réponse via l'API Cohere.
-        Le dernier message utilisateur est utilisé comme prompt, le reste est envoyé en contexte.
+        Le dernier message utilisateur est utilisé comme prompt ; seuls les derniers tours
+        sont envoyés tels quels, les plus anciens sous forme de résumé (mis en cache par
+        conversation_id ; sans identifiant l'historique complet est envoyé).
         """
         messages: List[RoleMessage] = chat_history.messages
 
         # On cherche le dernier message utilisateur comme prompt
-        last_user_message = next(
-            (m.message for m in reversed(messages) if m.role == "user"),
-            ""
+        last_user_index = next(
+            (i for i in range(len(messages) - 1, -1, -1) if messages[i].role == "user"),
+            None
         )
+        prompt = messages[last_user_index].message if last_user_index is not None else ""
+        previous = messages[:last_user_index] if last_user_index is not None else messages
 
-        # Envoi de l'historique complet en contexte
-        return self.generate_text_with_history(last_user_message, messages)
+        # Historique borné : résumé glissant + fenêtre des derniers tours
+        summary, window = self.history_manager.prepare(previous, conversation_id)
+        return self.generate_text_with_history(prompt, window, summary)
 
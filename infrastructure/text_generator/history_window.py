@@ -0,0 +1,126 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from domain.model.role_message import RoleMessage
+
+@dataclass
+class _RollingSummary:
+    covered: int  # number of leading messages folded into the summary
+    boundary: str  # fingerprint of the last covered message
+    text: str
+
+class ConversationHistoryManager:
+    """
+    Keeps the chat history sent to the model bounded.
+    The last N turns are sent verbatim; older messages are folded into a
+    rolling summary, computed in the background and cached per conversation id.
+    When summarization fails, the window is sent alone.
+    """
+
+    def __init__(self, summarizer: Callable[[Optional[str], List[RoleMessage]], str], window_turns: int = 6,
+                 max_conversations: int = 1000, max_workers: int = 2):
+        """
+        Args:
+            summarizer: Folds messages into a previous summary (None for the first one)
+            window_turns: User/assistant turns kept verbatim
+            max_conversations: Conversations whose summary stays cached
+            max_workers: Background summarization threads
+        """
+        self.summarizer = summarizer
+        self.window_messages = 2 * window_turns
+        self.max_conversations = max_conversations
+        self._summaries: "OrderedDict[str, _RollingSummary]" = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="history-summary")
+
+    @staticmethod
+    def _fingerprint(*messages: RoleMessage) -> str:
+        digest = hashlib.sha1()
+        for message in messages:
+            digest.update(f"{message.role}\x1f{message.message}\x1e".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _cached_summary(self, key: str, messages: List[RoleMessage]) -> Optional[_RollingSummary]:
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                return None
+            self._summaries.move_to_end(key)
+        if summary.covered > len(messages) or summary.boundary != self._fingerprint(messages[summary.covered - 1]):
+            # History was cleared or rewritten since the summary was computed
+            return None
+        return summary
+
+    def _summarize(self, key: str, previous: Optional[_RollingSummary], messages: List[RoleMessage], target: int) -> _RollingSummary:
+        start = previous.covered if previous else 0
+        text = self.summarizer(previous.text if previous else None, messages[start:target])
+        summary = _RollingSummary(covered=target, boundary=self._fingerprint(messages[target - 1]), text=text)
+        with self._lock:
+            current = self._summaries.get(key)
+            if current is None or current.covered <= target:
+                self._summaries[key] = summary
+                self._summaries.move_to_end(key)
+            while len(self._summaries) > self.max_conversations:
+                self._summaries.popitem(last=False)
+        return summary
+
+    def _summarize_in_background(self, key: str, previous: Optional[_RollingSummary], messages: List[RoleMessage], target: int):
+        try:
+            self._summarize(key, previous, messages, target)
+        except Exception as e:
+            # The current summary stays in use; the next turn schedules a new attempt
+            print(f"Error summarizing conversation {key}: {e}")
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _schedule(self, key: str, previous: Optional[_RollingSummary], messages: List[RoleMessage], target: int):
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending[key] = self._executor.submit(self._summarize_in_background, key, previous, list(messages), target)
+
+    def prepare(self, messages: List[RoleMessage], conversation_id: Optional[str] = None) -> Tuple[Optional[str], List[RoleMessage]]:
+        """
+        Split a history into a summary of older messages and a verbatim window.
+
+        Args:
+            messages: History preceding the current prompt
+            conversation_id: Conversation the history belongs to; without it no summary can be
+                kept and the full history is sent
+
+        Returns:
+            (summary text or None, messages to send verbatim)
+        """
+        if len(messages) <= self.window_messages:
+            return None, messages
+        if conversation_id is None:
+            return None, messages
+
+        key = conversation_id
+        target = len(messages) - self.window_messages
+        summary = self._cached_summary(key, messages)
+        covered = summary.covered if summary else 0
+
+        if covered < target:
+            if target - covered > self.window_messages:
+                # Too far behind (e.g. first request after a restart): fold now to keep the payload bounded
+                try:
+                    summary = self._summarize(key, summary, messages, target)
+                except Exception as e:
+                    print(f"Error summarizing conversation {key}, sending the recent turns only: {e}")
+                    return None, messages[-self.window_messages:]
+                covered = summary.covered
+            else:
+                # Use the current summary for this turn, refresh it in the background
+                self._schedule(key, summary, messages, target)
+
+        return (summary.text if summary else None), messages[covered:]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,169 @@
+import time
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, FrozenSet, Hashable, Iterable, List, Set
+
+@dataclass
+class _CacheEntry:
+    value: object
+    expires_at: float
+    tags: FrozenSet[str]
+
+class TaggedCache:
+    """
+    Read-through cache of community reads, shared by every request of a GraphQL worker.
+
+    Each entry carries tags naming the data it was built from (e.g. "author:alice",
+    "friends:bob"); mutations invalidate the tags they touch, which drops exactly the
+    entries depending on them. Reads racing an invalidation are returned but not stored,
+    so a write is never hidden by an older read. Invalidation is local to the process:
+    the TTL bounds how stale another worker's copy can get.
+
+    Meant for a single event loop (no locking).
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+        """
+        Args:
+            ttl: Seconds an entry may be served, 0 disables the cache
+            max_entries: Least recently used entries are evicted beyond this size
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[Hashable]] = {}
+        self._tag_versions: Dict[str, int] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable], tags: Iterable[str]):
+        """
+        Cached value of key, calling fetch() on a miss.
+        Concurrent misses of the same key share one fetch.
+        """
+        if not self.enabled:
+            return await fetch()
+        hit, value = self._lookup(key)
+        if hit:
+            return value
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+
+        self.misses += 1
+        tags = frozenset(tags)
+        versions = self._versions(tags)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it; don't warn when there are none
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        if self._versions(tags) == versions:
+            self._store(key, value, tags)
+        future.set_result(value)
+        return value
+
+    async def get_tagged(self, key: Hashable, fetch: Callable[[], Awaitable]):
+        """
+        Like get(), for values whose tags are only known once fetched:
+        fetch() returns (value, tags).
+        """
+        if not self.enabled:
+            return (await fetch())[0]
+        hit, value = self._lookup(key)
+        if hit:
+            return value
+        self.misses += 1
+        epoch = self._epoch
+        value, tags = await fetch()
+        # Any invalidation during the fetch may concern tags not known beforehand
+        if self._epoch == epoch:
+            self._store(key, value, frozenset(tags))
+        return value
+
+    async def get_many(self, namespace: str, keys: List[Hashable],
+                       fetch_many: Callable[[List[Hashable]], Awaitable[Dict[Hashable, object]]],
+                       tags_for: Callable[[Hashable], Iterable[str]]) -> Dict[Hashable, object]:
+        """
+        Batched variant for DataLoaders: cached keys are served from memory and the
+        missing ones are fetched with a single fetch_many call.
+        """
+        if not self.enabled:
+            return await fetch_many(keys)
+        values, missing = {}, []
+        for key in keys:
+            hit, value = self._lookup((namespace, key))
+            if hit:
+                values[key] = value
+            else:
+                missing.append(key)
+        if missing:
+            self.misses += len(missing)
+            tags = {key: frozenset(tags_for(key)) for key in missing}
+            versions = {key: self._versions(tags[key]) for key in missing}
+            fetched = await fetch_many(missing)
+            for key in missing:
+                value = fetched.get(key)
+                if self._versions(tags[key]) == versions[key]:
+                    self._store((namespace, key), value, tags[key])
+                values[key] = value
+        return values
+
+    def invalidate(self, *tags: str):
+        """Drop every entry carrying one of the tags"""
+        self._epoch += 1
+        for tag in tags:
+            self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+            for key in self._keys_by_tag.pop(tag, set()):
+                self._remove(key)
+
+    def clear(self):
+        for tag in list(self._keys_by_tag):
+            self.invalidate(tag)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _lookup(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry.expires_at < time.monotonic():
+            self._remove(key)
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry.value
+
+    def _versions(self, tags: FrozenSet[str]) -> tuple:
+        return tuple(self._tag_versions.get(tag, 0) for tag in sorted(tags))
+
+    def _store(self, key: Hashable, value, tags: FrozenSet[str]):
+        self._remove(key)
+        self._entries[key] = _CacheEntry(value, time.monotonic() + self.ttl, tags)
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
@@ -0,0 +1,72 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, List
+
+class DataLoader:
+    """
+    Request-scoped batching and deduplication of keyed lookups.
+    Keys loaded while resolvers run concurrently (same event-loop tick) are fetched
+    together with one call to the batch function; each key is fetched at most once
+    per GraphQL operation.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, object]]]):
+        """
+        Args:
+            batch_fn: Coroutine fetching a list of keys, returns a dict of values by key
+        """
+        self.batch_fn = batch_fn
+        self._cache: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+
+    def load(self, key: Hashable) -> asyncio.Future:
+        if key not in self._cache:
+            loop = asyncio.get_running_loop()
+            self._cache[key] = loop.create_future()
+            if not self._queue:
+                # Dispatch once the resolvers scheduled in this tick have queued their keys
+                loop.call_soon(self._dispatch)
+            self._queue.append(key)
+        return self._cache[key]
+
+    async def load_many(self, keys: Iterable[Hashable]) -> list:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: Hashable, value):
+        """Seed a value already fetched by another query"""
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    def _dispatch(self):
+        keys, self._queue = self._queue, []
+        asyncio.ensure_future(self._run_batch(keys))
+
+    async def _run_batch(self, keys: List[Hashable]):
+        try:
+            values = await self.batch_fn(keys)
+        except Exception as e:
+            for key in keys:
+                self._cache.pop(key).set_exception(e)
+            return
+        for key in keys:
+            self._cache[key].set_result(values.get(key))
+
+def create_loaders(repo, cache=None) -> Dict[str, DataLoader]:
+    """
+    Fresh loaders for one GraphQL operation (never share them between requests).
+    With a TaggedCache, keys cached by earlier requests are not fetched again.
+    """
+    if cache is None:
+        return {
+            "friends": DataLoader(repo.get_friends_for_users),
+            "reviews": DataLoader(repo.get_reviews_for_users),
+        }
+    return {
+        "friends": DataLoader(lambda usernames: cache.get_many(
+            "friends", usernames, repo.get_friends_for_users, lambda username: [f"friends:{username}"]
+        )),
+        "reviews": DataLoader(lambda usernames: cache.get_many(
+            "reviews", usernames, repo.get_reviews_for_users, lambda username: [f"author:{username}", "reviews", "content"]
+        )),
+    }
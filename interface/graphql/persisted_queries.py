@@ -0,0 +1,139 @@
+"""
+Automatic persisted queries (Apollo APQ protocol) and caching of parsed / validated documents.
+
+A client sends {"extensions": {"persistedQuery": {"version": 1, "sha256Hash": ...}}} without
+the query text; on PersistedQueryNotFound it retries once with the text, which registers
+the hash for every later call.
+"""
+import hashlib
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from ariadne.asgi.handlers import GraphQLHTTPHandler
+from graphql import DocumentNode, GraphQLError, GraphQLSchema, parse, validate
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+
+class _LRU:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable):
+        value = self._items.get(key)
+        if value is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+class PersistedQueryNotFoundError(Exception):
+    pass
+
+class _PersistedQueryError(Exception):
+    """Invalid persisted-query request, answered as a GraphQL error"""
+
+class PersistedQueryStore:
+    """sha256 hash -> query text, for the APQ handshake"""
+
+    def __init__(self, maxsize: int = 1000):
+        self._queries = _LRU(maxsize)
+
+    def resolve(self, data: dict) -> dict:
+        """
+        Fill in the query text of a persisted-query request.
+
+        Raises:
+            PersistedQueryNotFoundError: The hash is unknown and the request has no query text
+            GraphQLError: The query text does not match its hash
+        """
+        persisted = (data.get("extensions") or {}).get("persistedQuery")
+        if not isinstance(persisted, dict):
+            return data
+        if persisted.get("version") != 1:
+            raise GraphQLError("Unsupported persisted query version")
+        query_hash = persisted.get("sha256Hash")
+        query = data.get("query")
+        if query:
+            if hashlib.sha256(query.encode("utf-8")).hexdigest() != query_hash:
+                raise GraphQLError("provided sha does not match query")
+            self._queries.put(query_hash, query)
+            return data
+        query = self._queries.get(query_hash)
+        if query is None:
+            raise PersistedQueryNotFoundError(query_hash)
+        return {**data, "query": query}
+
+class CachedQueryParser:
+    """query_parser keeping the DocumentNode of recently seen query texts"""
+
+    def __init__(self, maxsize: int = 500):
+        self._documents = _LRU(maxsize)
+
+    def __call__(self, context_value, data: dict) -> DocumentNode:
+        query = data["query"]
+        document = self._documents.get(query)
+        if document is None:
+            document = parse(query)
+            self._documents.put(query, document)
+        return document
+
+class CachedQueryValidator:
+    """
+    query_validator remembering documents that passed validation. Used with
+    CachedQueryParser, a repeated query is the same DocumentNode object.
+    """
+
+    def __init__(self, maxsize: int = 500):
+        # id(document) -> document; keeping the document alive keeps its id from being reused
+        self._valid = _LRU(maxsize)
+
+    def __call__(self, schema: GraphQLSchema, document_ast: DocumentNode, rules=None, max_errors: Optional[int] = None, **kwargs):
+        key = (id(schema), id(document_ast), tuple(rules or ()), max_errors)
+        if self._valid.get(key) is document_ast:
+            return []
+        errors = validate(schema, document_ast, rules=rules, max_errors=max_errors, **kwargs)
+        if not errors:
+            self._valid.put(key, document_ast)
+        return errors
+
+class PersistedQueryHTTPHandler(GraphQLHTTPHandler):
+    """HTTP handler resolving APQ hashes before Ariadne validates the request data"""
+
+    def __init__(self, store: Optional[PersistedQueryStore] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store or PersistedQueryStore()
+
+    async def extract_data_from_json_request(self, request: Request) -> Any:
+        data = await super().extract_data_from_json_request(request)
+        if isinstance(data, list):
+            return [self._resolve(item) for item in data]
+        return self._resolve(data)
+
+    def _resolve(self, data):
+        if not isinstance(data, dict):
+            return data
+        try:
+            return self.store.resolve(data)
+        except GraphQLError as error:
+            raise _PersistedQueryError(error.message) from error
+
+    async def graphql_http_server(self, request: Request) -> Response:
+        try:
+            return await super().graphql_http_server(request)
+        except PersistedQueryNotFoundError:
+            message = PERSISTED_QUERY_NOT_FOUND
+            code = "PERSISTED_QUERY_NOT_FOUND"
+        except _PersistedQueryError as error:
+            message, code = str(error), "BAD_USER_INPUT"
+        # 200 with a GraphQL error, as APQ clients expect
+        return JSONResponse({"errors": [{"message": message, "extensions": {"code": code}}]})
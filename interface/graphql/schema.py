@@ -1,7 +1,20 @@
-from ariadne import gql, QueryType, make_executable_schema, MutationType
-from infrastructure.adapter.neo4j_review_repository import Neo4jReviewRepository
+import asyncio
+from ariadne import gql, QueryType, make_executable_schema, MutationType, ObjectType
+from infrastructure.adapter.async_neo4j_review_repository import AsyncNeo4jReviewRepository
+from infrastructure.adapter.neo4j_queries import encode_cursor
+from interface.graphql.cache import TaggedCache
+from interface.graphql.loaders import create_loaders
+from config.env_config import EnvConfig
 
-repo = Neo4jReviewRepository()
+# Uses the worker's shared async driver, created on the first query inside the server's event loop
+repo = AsyncNeo4jReviewRepository()
+
+# Shared by all requests of the worker. Tags: "users", "content", "public" (public feed),
+# "author:<name>" (reviews written by a user), "friends:<name>" (a user's friend list),
+# "reviews" (anything showing reviews, for deletes whose author is unknown),
+# "trending" (trendingContent); rating aggregates make "content" depend on reviews too,
+# so every entry embedding content (feeds, trends, recommendations) is tagged "content"
+cache = TaggedCache(ttl=EnvConfig.get_graphql_cache_ttl(), max_entries=EnvConfig.get_graphql_cache_size())
 
 type_defs = gql("""
     type Content {
@@ -9,6 +22,21 @@ type_defs = gql("""
         type: String
         platform: String
         posterUrl: String
+        averageRating: Float
+        reviewCount: Int
+        mediaId: String
+    }
+
+    type Recommendation {
+        content: Content
+        score: Float
+        recommenders: Int
+    }
+
+    type TrendingContent {
+        content: Content
+        recentReviews: Int
+        recentAverageRating: Float
     }
 
     type Review {
@@ -28,6 +56,42 @@ type_defs = gql("""
     type User {
         name: String
         avatarUrl: String
+        friends: [User]
+        reviews: [Review]
+    }
+
+    type PageInfo {
+        endCursor: String
+        hasNextPage: Boolean!
+    }
+
+    type ReviewEdge {
+        cursor: String!
+        node: Review
+    }
+
+    type ReviewConnection {
+        edges: [ReviewEdge]
+        pageInfo: PageInfo!
+    }
+
+    type FriendReviewEdge {
+        cursor: String!
+        node: FriendReview
+    }
+
+    type FriendReviewConnection {
+        edges: [FriendReviewEdge]
+        pageInfo: PageInfo!
+    }
+
+    type CommunityDashboard {
+        user: User
+        allUsers: [User]
+        friends: [User]
+        friendReviews(first: Int = 10, after: String): FriendReviewConnection
+        myReviews(first: Int = 10, after: String): ReviewConnection
+        allContent: [Content]
     }
 
     type Query {
@@ -37,6 +101,12 @@ type_defs = gql("""
         allUsers: [User]
         allContent: [Content]
         userFriends(username: String!): [User]
+        friendReviewsConnection(username: String!, first: Int = 20, after: String): FriendReviewConnection
+        userReviewsConnection(username: String!, first: Int = 20, after: String): ReviewConnection
+        publicReviewsConnection(first: Int = 20, after: String): ReviewConnection
+        communityDashboard(username: String!): CommunityDashboard
+        trendingContent(window: Int = 7, first: Int = 10): [TrendingContent]
+        recommendedContent(username: String!, k: Int = 10): [Recommendation]
     }
 
     type Mutation {
@@ -47,96 +117,222 @@ type_defs = gql("""
     }
 """)
 
+def content_to_dict(content):
+    return {
+        "title": content.title,
+        "type": content.type_,
+        "platform": content.platform,
+        "posterUrl": content.posterUrl,
+        "averageRating": content.averageRating,
+        "reviewCount": content.ratingCount,
+        "mediaId": content.mediaId
+    }
+
+def review_to_dict(review):
+    return {
+        "id": review.id,
+        "rating": review.rating,
+        "comment": review.comment,
+        "createdAt": review.createdAt,
+        "content": content_to_dict(review.content)
+    }
+
+def friend_review_to_dict(friend_review):
+    return {
+        "friend": vars(friend_review.friend),
+        "review": review_to_dict(friend_review.review)
+    }
+
+def page_to_connection(page, to_dict, to_review=lambda item: item):
+    return {
+        "edges": [{"cursor": encode_cursor(to_review(item)), "node": to_dict(item)} for item in page.items],
+        "pageInfo": {"endCursor": page.end_cursor, "hasNextPage": page.has_next_page}
+    }
+
+def get_context_value(request, data=None):
+    """Per-request context: the HTTP request and fresh DataLoaders"""
+    return {"request": request, "loaders": create_loaders(repo, cache)}
+
+def loaders(info):
+    return info.context["loaders"]
+
+def memoized(info, key, fetch):
+    """Run an unkeyed read at most once per request, sharing it between concurrent resolvers"""
+    memo = info.context.setdefault("memo", {})
+    if key not in memo:
+        memo[key] = asyncio.ensure_future(fetch())
+    return memo[key]
+
+async def get_all_users():
+    return await cache.get(("allUsers",), repo.get_all_users, ["users"])
+
+async def get_all_content():
+    return await cache.get(("allContent",), repo.get_all_content, ["content"])
+
+async def friend_feed_tags(info, username):
+    """A friend feed depends on the user's friend list, on what each friend wrote and on the content aggregates"""
+    friends = await loaders(info)["friends"].load(username)
+    return [f"friends:{username}", "reviews", "content"] + [f"author:{friend.name}" for friend in friends]
+
 query = QueryType()
 
 @query.field("friendReviews")
-def resolve_friend_reviews(_, info, username):
-    return [
-        {
-            "friend": {
-                "name": fr.friend.name,
-                "avatarUrl": fr.friend.avatarUrl
-            },
-            "review": {
-                "id": fr.review.id,
-                "rating": fr.review.rating,
-                "comment": fr.review.comment,
-                "createdAt": fr.review.createdAt,
-                "content": {
-                    "title": fr.review.content.title,
-                    "type": fr.review.content.type_,
-                    "platform": fr.review.content.platform,
-                    "posterUrl": fr.review.content.posterUrl
-                }
-            }
-        }
-        for fr in repo.get_friend_reviews(username)
-    ]
+async def resolve_friend_reviews(_, info, username):
+    friend_reviews = await cache.get(
+        ("friendReviews", username), lambda: repo.get_friend_reviews(username), await friend_feed_tags(info, username)
+    )
+    return [friend_review_to_dict(fr) for fr in friend_reviews]
+
+@query.field("friendReviewsConnection")
+async def resolve_friend_reviews_connection(_, info, username, first=20, after=None):
+    page = await cache.get(
+        ("friendReviewsPage", username, first, after),
+        lambda: repo.get_friend_reviews_page(username, first, after),
+        await friend_feed_tags(info, username)
+    )
+    return page_to_connection(page, friend_review_to_dict, lambda fr: fr.review)
+
+@query.field("userReviewsConnection")
+async def resolve_user_reviews_connection(_, info, username, first=20, after=None):
+    page = await cache.get(
+        ("userReviewsPage", username, first, after),
+        lambda: repo.get_user_reviews_page(username, first, after),
+        [f"author:{username}", "reviews", "content"]
+    )
+    return page_to_connection(page, review_to_dict)
+
+@query.field("publicReviewsConnection")
+async def resolve_public_reviews_connection(_, info, first=20, after=None):
+    page = await cache.get(
+        ("publicReviewsPage", first, after), lambda: repo.get_public_reviews_page(first, after),
+        ["public", "reviews", "content"]
+    )
+    return page_to_connection(page, review_to_dict)
 
 
 @query.field("publicReviews")
-def resolve_public_reviews(_, info):
-    return [
-        {
-            "rating": r.rating,
-            "comment": r.comment,
-            "content": vars(r.content)
-        }
-        for r in repo.get_public_reviews()
-    ]
+async def resolve_public_reviews(_, info):
+    reviews = await cache.get(("publicReviews",), repo.get_public_reviews, ["public", "reviews", "content"])
+    return [review_to_dict(r) for r in reviews]
 
 @query.field("allUsers")
-def resolve_all_users(_, info):
-    return [vars(u) for u in repo.get_all_users()]
+async def resolve_all_users(_, info):
+    return [vars(u) for u in await memoized(info, "allUsers", get_all_users)]
 
 @query.field("userFriends")
-def resolve_user_friends(_, info, username):
-    return [vars(f) for f in repo.get_user_friends(username)]
+async def resolve_user_friends(_, info, username):
+    return [vars(f) for f in await loaders(info)["friends"].load(username)]
 
 @query.field("userReviews")
-def resolve_user_reviews(_, info, username):
-    reviews = repo.get_user_reviews(username)
+async def resolve_user_reviews(_, info, username):
+    return [review_to_dict(r) for r in await loaders(info)["reviews"].load(username)]
+
+@query.field("communityDashboard")
+def resolve_community_dashboard(_, info, username):
+    # Fields are resolved lazily (and concurrently) by the CommunityDashboard type below
+    return {"username": username}
+
+@query.field("trendingContent")
+async def resolve_trending_content(_, info, window=7, first=10):
+    trending = await cache.get(
+        ("trendingContent", window, first),
+        lambda: repo.get_trending_content(window, first),
+        ["trending", "reviews", "content"]
+    )
     return [
         {
-            "id": r.id,
-            "rating": r.rating,
-            "comment": r.comment,
-            "createdAt": r.createdAt,
-            "content": vars(r.content)
+            "content": content_to_dict(item.content),
+            "recentReviews": item.recentReviews,
+            "recentAverageRating": item.recentAverageRating
         }
-        for r in reviews
+        for item in trending
+    ]
+
+async def fetch_recommendations(username, k):
+    """Cache miss path: the entry depends on the user's reviews, on every peer's reviews and friends
+    and on the content aggregates it embeds"""
+    recommendations = await repo.get_recommended_content(username, k)
+    tags = {f"author:{username}", f"friends:{username}", "reviews", "content"}
+    for peer in recommendations.peers:
+        tags.update((f"author:{peer}", f"friends:{peer}"))
+    return recommendations, tags
+
+@query.field("recommendedContent")
+async def resolve_recommended_content(_, info, username, k=10):
+    recommendations = await cache.get_tagged(("recommendedContent", username, k), lambda: fetch_recommendations(username, k))
+    return [
+        {"content": content_to_dict(item.content), "score": item.score, "recommenders": item.recommenders}
+        for item in recommendations.items
     ]
 
 @query.field("allContent")
-def resolve_all_content(_, info):
-    return [vars(c) for c in repo.get_all_content()]
+async def resolve_all_content(_, info):
+    return [content_to_dict(c) for c in await memoized(info, "allContent", get_all_content)]
+
+user_type = ObjectType("User")
+
+# Resolved concurrently for every user of a list, so the loaders fetch them in one batch
+@user_type.field("friends")
+async def resolve_user_friends_field(user, info):
+    return [vars(f) for f in await loaders(info)["friends"].load(user["name"])]
+
+@user_type.field("reviews")
+async def resolve_user_reviews_field(user, info):
+    return [review_to_dict(r) for r in await loaders(info)["reviews"].load(user["name"])]
+
+dashboard = ObjectType("CommunityDashboard")
+
+@dashboard.field("user")
+async def resolve_dashboard_user(parent, info):
+    users = await memoized(info, "allUsers", get_all_users)
+    return next((vars(u) for u in users if u.name == parent["username"]), None)
+
+@dashboard.field("allUsers")
+async def resolve_dashboard_all_users(parent, info):
+    return await resolve_all_users(None, info)
+
+@dashboard.field("friends")
+async def resolve_dashboard_friends(parent, info):
+    return await resolve_user_friends(None, info, parent["username"])
+
+@dashboard.field("friendReviews")
+async def resolve_dashboard_friend_reviews(parent, info, first=10, after=None):
+    return await resolve_friend_reviews_connection(None, info, parent["username"], first, after)
+
+@dashboard.field("myReviews")
+async def resolve_dashboard_my_reviews(parent, info, first=10, after=None):
+    return await resolve_user_reviews_connection(None, info, parent["username"], first, after)
+
+@dashboard.field("allContent")
+async def resolve_dashboard_all_content(parent, info):
+    return await resolve_all_content(None, info)
 
 mutation = MutationType()
 
 @mutation.field("addFriend")
-def resolve_add_friend(_, info, username, friendName):
-    user = repo.add_friend(username, friendName)
+async def resolve_add_friend(_, info, username, friendName):
+    user = await repo.add_friend(username, friendName)
+    cache.invalidate(f"friends:{username}")
     return vars(user) if user else None
 
 @mutation.field("removeFriend")
-def resolve_remove_friend(_, info, username, friendName):
-    return repo.remove_friend(username, friendName)
+async def resolve_remove_friend(_, info, username, friendName):
+    removed = await repo.remove_friend(username, friendName)
+    cache.invalidate(f"friends:{username}")
+    return removed
 
 @mutation.field("postReview")
-def resolve_post_review(_, info, username, contentTitle, rating, comment):
-    review = repo.create_review(username, contentTitle, rating, comment)
-    if review:
-        return {
-            "id": review.id,
-            "rating": review.rating,
-            "comment": review.comment,
-            "createdAt": review.createdAt,
-            "content": vars(review.content)
-        }
-    return None
+async def resolve_post_review(_, info, username, contentTitle, rating, comment):
+    review = await repo.create_review(username, contentTitle, rating, comment)
+    # The author's reviews, every friend feed following the author, the public feed and the aggregates
+    cache.invalidate(f"author:{username}", "public", "content", "trending")
+    return review_to_dict(review) if review else None
 
 @mutation.field("deleteReview")
-def resolve_delete_review(_, info, reviewId):
-    return repo.delete_review(reviewId)
+async def resolve_delete_review(_, info, reviewId):
+    deleted = await repo.delete_review(reviewId)
+    if deleted:
+        cache.invalidate("reviews", "content")
+    return deleted
 
-schema = make_executable_schema(type_defs, query, mutation)
+schema = make_executable_schema(type_defs, query, mutation, user_type, dashboard)
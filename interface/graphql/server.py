@@ -1,16 +1,44 @@
-from flask import Flask, request, jsonify
-from ariadne import graphql_sync
+"""
+ASGI GraphQL server: async resolvers over the Neo4j async driver, so a worker serves
+many concurrent requests from one event loop.
+
+Development: started by main.py on port 5050.
+Deployment:  uvicorn interface.graphql.server:app --host 0.0.0.0 --port 5050 --workers 4
+"""
+from contextlib import asynccontextmanager
+from ariadne.asgi import GraphQL
 from ariadne.explorer import ExplorerGraphiQL
-from interface.graphql.schema import schema
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from infrastructure.adapter.neo4j_driver import close_async_driver, pool_metrics
+from interface.graphql.schema import schema, get_context_value, repo
+from interface.graphql.persisted_queries import CachedQueryParser, CachedQueryValidator, PersistedQueryHTTPHandler
+
+graphql_app = GraphQL(
+    schema,
+    context_value=get_context_value,
+    explorer=ExplorerGraphiQL(),
+    http_handler=PersistedQueryHTTPHandler(),
+    query_parser=CachedQueryParser(),
+    query_validator=CachedQueryValidator()
+)
 
-app = Flask(__name__)
+@asynccontextmanager
+async def lifespan(app):
+    # Runs once per worker process
+    await repo.ensure_schema()
+    yield
+    await close_async_driver()
 
-@app.route("/graphql", methods=["GET"])
-def graphql_playground():
-    return ExplorerGraphiQL().html(None), 200
+async def neo4j_metrics(request):
+    """Connection pool and session counters of this worker's Neo4j driver"""
+    return JSONResponse(pool_metrics())
 
-@app.route("/graphql", methods=["POST"])
-def graphql_server():
-    data = request.get_json()
-    success, result = graphql_sync(schema, data, context_value=request)
-    return jsonify(result)
+app = Starlette(
+    routes=[
+        Route("/graphql", graphql_app, methods=["GET", "POST"]),
+        Route("/metrics/neo4j", neo4j_metrics, methods=["GET"]),
+    ],
+    lifespan=lifespan
+)
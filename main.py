@@ -87,23 +87,14 @@ def check_neo4j_connection():
     """Check if Neo4j is available for community features"""
     try:
         from config.env_config import EnvConfig
-        from neo4j import GraphDatabase
+        from infrastructure.adapter.neo4j_driver import get_driver
         
         if not EnvConfig.is_neo4j_configured():
             print("Neo4j environment variables not set - Community features will be limited")
             return False
             
-        driver = GraphDatabase.driver(
-            EnvConfig.get_neo4j_uri(), 
-            auth=(EnvConfig.get_neo4j_user(), EnvConfig.get_neo4j_password())
-        )
-        
-        # Test connection
-        with driver.session() as session:
-            result = session.run("RETURN 1")
-            result.single()
-        
-        driver.close()
+        # The shared driver stays open for the rest of the process (closed at exit)
+        get_driver().verify_connectivity()
         print("Neo4j connection successful - Community features available")
         return True
         
@@ -116,8 +107,14 @@ def start_graphql_server():
     """Start GraphQL server in a separate thread"""
     try:
         print("Starting GraphQL server on port 5050...")
-        from interface.graphql.server import app
-        app.run(host='0.0.0.0', port=5050, debug=False, use_reloader=False)
+        import uvicorn
+        # Single worker inside this thread; see interface/graphql/server.py for multi-worker deployment
+        uvicorn.run(
+            "interface.graphql.server:app",
+            host="0.0.0.0",
+            port=5050,
+            log_level="warning"
+        )
     except Exception as e:
         print(f"Error starting GraphQL server: {e}")
 
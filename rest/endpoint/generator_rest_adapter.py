@@ -1,4 +1,6 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse
 
 from rest.model.chat_request import ChatRequest
@@ -8,8 +10,15 @@ from domain.port.driving.generator_controller_port import GeneratorControllerPor
 
 # REST adapter to handle HTTP requests
 class GeneratorRestAdapter:
-    def __init__(self, controller: GeneratorControllerPort):
+    def __init__(self, controller: GeneratorControllerPort, history_repository=None):
+        """
+        Args:
+            controller: Generator controller
+            history_repository: Chat history repository serving paginated and ranged reads natively
+                (list_conversations / get_messages); without it they are sliced from full reads
+        """
         self.controller = controller
+        self.history_repository = history_repository
         
     async def get_generated_text(self, request: ChatRequest) -> JSONResponse:
         """
@@ -24,16 +33,36 @@ class GeneratorRestAdapter:
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
         
-    async def get_all_conversations(self) -> JSONResponse:
+    async def get_all_conversations(
+        self,
+        limit: Optional[int] = Query(default=None, ge=1, le=1000),
+        cursor: Optional[str] = None
+    ) -> JSONResponse:
         """
-        Retrieves all available conversations.
+        Retrieves the available conversations, one page at a time when a limit is given.
         """
         try:
-            conversations = self.controller.get_conversations()
+            if limit is None and cursor is None:
+                conversations = self.controller.get_conversations()
+                return JSONResponse(
+                    content={"conversation_ids": conversations},
+                    status_code=200
+                )
+
+            limit = limit or 50
+            if self.history_repository is not None:
+                conversations, next_cursor = self.history_repository.list_conversations(limit=limit, cursor=cursor)
+            else:
+                conversation_ids = sorted(self.controller.get_conversations())
+                conversations = [c for c in conversation_ids if cursor is None or c > cursor][:limit]
+                next_cursor = conversations[-1] if conversations and conversations[-1] != conversation_ids[-1] else None
             return JSONResponse(
-                content={"conversation_ids": conversations},
+                content={"conversation_ids": conversations, "next_cursor": next_cursor},
                 status_code=200
             )
+        except ValueError as e:
+            # Malformed cursor (InvalidCursorError)
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to retrieve conversations: {str(e)}")
     
@@ -50,15 +79,27 @@ class GeneratorRestAdapter:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to create a new conversation: {str(e)}")
     
-    async def get_conversation(self, conversation_guid: str) -> ConversationResponse:
+    async def get_conversation(
+        self,
+        conversation_guid: str,
+        since: int = Query(default=0, ge=0),
+        limit: Optional[int] = Query(default=None, ge=1, le=1000)
+    ) -> ConversationResponse:
         """
-        Retrieves the history of a specific conversation.
+        Retrieves the history of a specific conversation, or the messages
+        from position `since` (at most `limit` of them).
+        Ranged reads are native with the jsonl and sqlite backends; the json backend
+        (default) parses the whole conversation file and slices it.
         """
-        conversation = self.controller.get_history(conversation_guid)
-        if conversation is None:
+        if self.history_repository is not None and (since or limit is not None):
+            messages = self.history_repository.get_messages(conversation_guid, since=since, limit=limit)
+        else:
+            conversation = self.controller.get_history(conversation_guid)
+            messages = None if conversation is None else conversation.messages[since:None if limit is None else since + limit]
+        if messages is None:
             raise HTTPException(status_code=404, detail="Conversation not found")
         
-        return ConversationResponse(guid=conversation_guid, history=conversation.messages)
+        return ConversationResponse(guid=conversation_guid, history=messages, next_since=since + len(messages))
 
     async def generate_message_for_conversation(self, conversation_guid: str, request: ChatRequest) -> ConversationResponse:
         """
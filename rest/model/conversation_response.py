@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 from fastapi.encoders import jsonable_encoder
 
@@ -13,7 +15,12 @@ class ConversationResponse(BaseModel):
     history: list[RoleMessage] = Field(
         default=None,
         title="History",
-        description="The whole history for the conversation",
+        description="The history for the conversation, or the requested range of it",
+    )
+    next_since: Optional[int] = Field(
+        default=None,
+        title="Next since",
+        description="Value of `since` to poll for the messages after this range",
     )
 
     def to_dict(self) -> dict:
@@ -8,9 +8,41 @@ from domain.service.historic_service import HistoricService
 
 from infrastructure.text_generator.cohere_text_generator import CohereTextGenerator
 from infrastructure.history.json_history_repository import JsonHistoryRepository
+from infrastructure.history.jsonl_history_repository import JsonlHistoryRepository
+from infrastructure.history.sqlite_history_repository import SqliteHistoryRepository
+from infrastructure.history.cached_history_repository import CachedHistoryRepository
 
 from rest.endpoint.generator_rest_adapter import GeneratorRestAdapter
 
+def create_history_repository(storage_folder: str):
+    """
+    Builds the chat history repository selected by HISTORY_BACKEND,
+    behind the write-back cache when HISTORY_CACHE_SIZE is set.
+    """
+    if EnvConfig.get_history_cache_size() > 0:
+        # Each worker would serve its own copy of a conversation, missing the others' writes
+        if EnvConfig.get_api_workers() > 1:
+            raise ValueError("HISTORY_CACHE_SIZE requires a single API worker, set it to 0 or API_WORKERS to 1")
+        return CachedHistoryRepository(
+            create_history_backend(storage_folder),
+            capacity=EnvConfig.get_history_cache_size(),
+            flush_interval=EnvConfig.get_history_flush_interval()
+        )
+    return create_history_backend(storage_folder)
+
+def create_history_backend(storage_folder: str):
+    """
+    Builds the persistent chat history repository selected by HISTORY_BACKEND.
+    """
+    backend = EnvConfig.get_history_backend()
+    if backend == "jsonl":
+        return JsonlHistoryRepository(storage_folder, fsync_policy=EnvConfig.get_history_fsync_policy())
+    if backend == "sqlite":
+        return SqliteHistoryRepository(EnvConfig.get_history_sqlite_path(storage_folder))
+    if backend == "json":
+        return JsonHistoryRepository(storage_folder)
+    raise ValueError(f"Unknown HISTORY_BACKEND: {backend}")
+
 def setup_generator_dependencies() -> GeneratorRestAdapter:
     """
     Sets up the dependencies for the generator endpoint.
@@ -19,7 +51,7 @@ def setup_generator_dependencies() -> GeneratorRestAdapter:
     json_history_repository_path = EnvConfig.get_json_history_repository()
     
     text_generator = CohereTextGenerator(cohere_api_key)
-    chat_history_repository = JsonHistoryRepository(json_history_repository_path)
+    chat_history_repository = create_history_repository(json_history_repository_path)
     
     system_prompt_service = SystemPromptService(text_generator)
     
@@ -33,7 +65,7 @@ def setup_generator_dependencies() -> GeneratorRestAdapter:
     )
     
     generator_controller_adapter = GeneratorControllerAdapter(text_generation_service, chat_history_service)
-    return GeneratorRestAdapter(generator_controller_adapter)
+    return GeneratorRestAdapter(generator_controller_adapter, chat_history_repository)
 
 # Alias to maintain backward compatibility with rest.api import
 create_generator_rest_adapter = setup_generator_dependencies
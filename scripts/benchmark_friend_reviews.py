@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+import sys
+from pathlib import Path
+import time
+import random
+import argparse
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from domain.model.user import User
+from domain.model.content import Content
+from infrastructure.adapter.neo4j_review_repository import Neo4jReviewRepository
+from infrastructure.adapter.neo4j_driver import get_driver, close_driver, pool_metrics
+
+PREFIX = "bench_"
+
+def seed(repository: Neo4jReviewRepository, start: int, end: int, contents: int, friends: int, reviews: int, rng: random.Random):
+    """Add users start..end-1 with their friendships and reviews"""
+    repository.upsert_users_bulk([User(name=f"{PREFIX}user_{i}") for i in range(start, end)])
+    repository.add_friends_bulk([
+        (f"{PREFIX}user_{i}", f"{PREFIX}user_{rng.randrange(end)}")
+        for i in range(start, end)
+        for _ in range(friends)
+    ])
+    repository.create_reviews_bulk([
+        {
+            "username": f"{PREFIX}user_{i}",
+            "content_title": f"{PREFIX}content_{rng.randrange(contents)}",
+            "rating": rng.randint(1, 10),
+            "comment": "benchmark review"
+        }
+        for i in range(start, end)
+        for _ in range(reviews)
+    ])
+
+def measure(repository: Neo4jReviewRepository, users: int, queries: int, rng: random.Random) -> np.ndarray:
+    latencies = []
+    for _ in range(queries):
+        username = f"{PREFIX}user_{rng.randrange(users)}"
+        start_time = time.perf_counter()
+        repository.get_friend_reviews(username)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+    return np.array(latencies)
+
+def cleanup(driver):
+    with driver.session() as session:
+        session.run("""
+            MATCH (n) WHERE (n:User AND n.name STARTS WITH $prefix) OR (n:Content AND n.title STARTS WITH $prefix)
+            OPTIONAL MATCH (n)-[:WROTE]->(r:Review)
+            DETACH DELETE r, n
+        """, prefix=PREFIX).consume()
+
+def main():
+    """friendReviews latency as the number of users grows"""
+    parser = argparse.ArgumentParser(description="Benchmark get_friend_reviews against graph size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--contents", type=int, default=2000)
+    parser.add_argument("--friends", type=int, default=10, help="Friends per user")
+    parser.add_argument("--reviews", type=int, default=5, help="Reviews per user")
+    parser.add_argument("--queries", type=int, default=200, help="Timed queries per size")
+    parser.add_argument("--no-schema", action="store_true", help="Skip the schema bootstrap (label scans)")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark nodes afterwards")
+    args = parser.parse_args()
+
+    driver = get_driver()
+    repository = Neo4jReviewRepository(driver=driver, ensure_schema=not args.no_schema)
+    rng = random.Random(42)
+
+    print("Benchmarking friendReviews...")
+    print("=" * 50)
+    print(f"Schema: {'none' if args.no_schema else 'constraints + createdAt index'}")
+
+    cleanup(driver)
+    repository.upsert_content_bulk([
+        Content(title=f"{PREFIX}content_{j}", type_="movie", platform="bench") for j in range(args.contents)
+    ])
+
+    seeded = 0
+    try:
+        for size in sorted(args.sizes):
+            start_time = time.time()
+            seed(repository, seeded, size, args.contents, args.friends, args.reviews, rng)
+            seeded = size
+            seed_time = time.time() - start_time
+
+            measure(repository, size, 10, rng)  # warm up the plan cache
+            latencies = measure(repository, size, args.queries, rng)
+            print(f"\n{size:,} users (seeded in {seed_time:.1f}s)")
+            print(f"   - p50: {np.percentile(latencies, 50):.2f}ms")
+            print(f"   - p95: {np.percentile(latencies, 95):.2f}ms")
+            print(f"   - max: {latencies.max():.2f}ms")
+        print(f"\nPool: {pool_metrics()['sync']}")
+    finally:
+        if not args.keep:
+            cleanup(driver)
+        close_driver()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+import sys
+import os
+from pathlib import Path
+import time
+import tempfile
+import argparse
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from domain.adapter.json_media_repository import JSONMediaRepository
+from infrastructure.adapter.quantized_vector_index import QuantizedVectorIndex, STORAGE_MODES
+from config.rag_config import VECTOR_DB_CONFIG, TEXT_EMBEDDING_MODELS, PERFORMANCE_CONFIG
+
+def encode_catalog(repository, text_model):
+    """Encode the catalog with the text model used by the RAG service"""
+    from sentence_transformers import SentenceTransformer
+
+    items = repository.get_all_items()
+    encoder = SentenceTransformer(text_model)
+    embeddings = encoder.encode(
+        [item.content_for_embedding for item in items],
+        batch_size=PERFORMANCE_CONFIG["batch_size"],
+        show_progress_bar=True,
+        convert_to_numpy=True,
+        normalize_embeddings=True
+    )
+    return [item.id for item in items], embeddings.astype(np.float32)
+
+def exact_top_k(embeddings, queries, k):
+    """Ground truth neighbours with float32 brute force"""
+    scores = queries @ embeddings.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+def main():
+    """Compare float16 and PQ storage against exact float32 search"""
+    parser = argparse.ArgumentParser(description="Report bytes per item and recall@k of compressed vector storage")
+    parser.add_argument("--movies", default="data/processed/chunks/movies_part1.json")
+    parser.add_argument("--games", default=None)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    print("Vector Storage Benchmark")
+    print("=" * 50)
+
+    repository = JSONMediaRepository(movies_path=args.movies, games_path=args.games)
+    ids, embeddings = encode_catalog(repository, TEXT_EMBEDDING_MODELS["fast"])
+    print(f"Encoded {len(ids):,} items ({embeddings.shape[1]} dims)")
+
+    rng = np.random.default_rng(42)
+    query_rows = rng.choice(len(ids), size=min(args.queries, len(ids)), replace=False)
+    queries = embeddings[query_rows]
+    truth = exact_top_k(embeddings, queries, args.k)
+
+    storage = VECTOR_DB_CONFIG["storage"]
+    print(f"\n{'mode':10} {'bytes/item':>12} {'ratio':>8} {f'recall@{args.k}':>10} {'query ms':>10}")
+    print(f"{'float32':10} {embeddings.shape[1] * 4:12.1f} {1.0:8.1f} {1.0:10.3f} {'-':>10}")
+
+    for mode in STORAGE_MODES:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index = QuantizedVectorIndex(
+                os.path.join(tmp_dir, mode),
+                mode=mode,
+                pq_subvector_dim=storage["pq_subvector_dim"],
+                pq_centroids=storage["pq_centroids"],
+                rerank_candidates=storage["rerank_candidates"]
+            )
+            index.add(ids, embeddings)
+            index.save()
+            report = index.memory_report()
+
+            hits = 0
+            start_time = time.time()
+            for query, expected in zip(queries, truth):
+                found = {item_id for item_id, _ in index.search(query, k=args.k)}
+                hits += len(found & {ids[row] for row in expected})
+            query_ms = (time.time() - start_time) * 1000 / len(queries)
+
+            recall = hits / (len(queries) * args.k)
+            print(f"{mode:10} {report['bytes_per_item']:12.1f} {report['compression_ratio']:8.1f} {recall:10.3f} {query_ms:10.2f}")
+
+    print("\nbytes/item counts the vectors resident in RAM; float32 vectors stay on disk for re-scoring.")
+
+if __name__ == "__main__":
+    main()
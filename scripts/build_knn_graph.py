@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+import sys
+import os
+from pathlib import Path
+import time
+import argparse
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from domain.adapter.json_media_repository import JSONMediaRepository
+from application.rag_factory import create_rag_service
+from infrastructure.adapter.knn_graph import build_knn_graph
+from config.rag_config import SEARCH_CONFIG, PERFORMANCE_CONFIG
+
+def main():
+    """Build the item-item kNN graph used for similar-item lookups"""
+    graph_config = SEARCH_CONFIG["similar_items"]
+    parser = argparse.ArgumentParser(description="Precompute the top-K neighbours of every catalog item")
+    parser.add_argument("--movies", default="data/processed/chunks/movies_part1.json")
+    parser.add_argument("--games", default="data/processed/chunks/games_part1.json")
+    parser.add_argument("--output", default=graph_config["graph_path"])
+    parser.add_argument("--k", type=int, default=graph_config["graph_k"])
+    parser.add_argument("--block-size", type=int, default=graph_config["graph_block_size"])
+    parser.add_argument("--workers", type=int, default=PERFORMANCE_CONFIG["num_workers"])
+    args = parser.parse_args()
+
+    print("Building kNN Graph...")
+    print("=" * 50)
+
+    repository = JSONMediaRepository(
+        movies_path=args.movies if os.path.exists(args.movies) else None,
+        games_path=args.games if os.path.exists(args.games) else None
+    )
+    print(f"Loaded {len(repository.get_all_items()):,} media items")
+
+    # Reuse the indexed vectors, indexing missing items first
+    rag_service = create_rag_service(repository, ensure_index=True)
+    ids, embeddings = rag_service.export_text_embeddings()
+    if not ids:
+        print("No embeddings found, nothing to build.")
+        return
+    print(f"Exported {len(ids):,} vectors ({embeddings.shape[1]} dims)")
+
+    start_time = time.time()
+    graph = build_knn_graph(
+        ids,
+        embeddings,
+        args.output,
+        k=args.k,
+        block_size=args.block_size,
+        workers=args.workers
+    )
+    build_time = time.time() - start_time
+
+    size_mb = sum(f.stat().st_size for f in Path(args.output).iterdir()) / (1024 * 1024)
+    print(f"\nkNN graph ready in {build_time:.2f}s")
+    print(f"   - Items: {len(graph.ids):,}")
+    print(f"   - Neighbours per item: {graph.k}")
+    print(f"   - Location: {args.output} ({size_mb:.1f}MB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+import sys
+import os
+from pathlib import Path
+import time
+import argparse
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.env_config import EnvConfig
+from infrastructure.history.json_history_repository import JsonHistoryRepository
+from infrastructure.history.sqlite_history_repository import SqliteHistoryRepository
+
+def main():
+    """Copy the JSON chat history folder into a SQLite history database"""
+    parser = argparse.ArgumentParser(description="Migrate JSON chat histories to SQLite")
+    parser.add_argument("--source", default=None, help="JSON history folder (defaults to JSON_HISTORY_REPOSITORY)")
+    parser.add_argument("--target", default=None, help="SQLite database (defaults to HISTORY_SQLITE_PATH)")
+    args = parser.parse_args()
+
+    source = args.source or EnvConfig.get_json_history_repository()
+    target = args.target or EnvConfig.get_history_sqlite_path(source)
+
+    print("Migrating Chat History to SQLite...")
+    print("=" * 50)
+
+    json_repository = JsonHistoryRepository(source)
+    sqlite_repository = SqliteHistoryRepository(target)
+    existing = set(sqlite_repository.get_all_conversations())
+
+    start_time = time.time()
+    migrated, skipped, messages = 0, 0, 0
+    for conversation_id in json_repository.get_all_conversations():
+        if conversation_id in existing:
+            skipped += 1
+            continue
+        history = json_repository.get_history(conversation_id)
+        if history is None:
+            continue
+        # The file modification time is the best creation date we have
+        created_at = os.path.getmtime(os.path.join(source, f"{conversation_id}.json"))
+        sqlite_repository.import_conversation(conversation_id, history.messages, created_at=created_at)
+        migrated += 1
+        messages += len(history.messages)
+
+    print(f"\nMigration done in {time.time() - start_time:.2f}s")
+    print(f"   - Conversations migrated: {migrated:,} ({messages:,} messages)")
+    print(f"   - Already present, skipped: {skipped:,}")
+    print(f"   - Database: {target}")
+
+if __name__ == "__main__":
+    main()
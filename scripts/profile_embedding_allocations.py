@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+import sys
+from pathlib import Path
+import time
+import tempfile
+import tracemalloc
+import argparse
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from domain.adapter.json_media_repository import JSONMediaRepository
+from domain.model.media_filter import MediaFilter
+from application.rag_factory import create_rag_service
+
+class ProfiledCollection:
+    """
+    ChromaDB collection wrapper timing each add/query call and recording the peak Python
+    memory traced during it; the arguments of add() are kept to be replayed as lists.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.calls = {"add": [], "query": []}
+        self.added_batches = []
+
+    def _profiled(self, name, method, **kwargs):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        start_time = time.perf_counter()
+        result = method(**kwargs)
+        elapsed = time.perf_counter() - start_time
+        _, peak = tracemalloc.get_traced_memory()
+        self.calls[name].append((elapsed, peak - before))
+        return result
+
+    def add(self, **kwargs):
+        self.added_batches.append(kwargs)
+        return self._profiled("add", self.collection.add, **kwargs)
+
+    def query(self, **kwargs):
+        return self._profiled("query", self.collection.query, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+def report(label, calls):
+    if not calls:
+        print(f"   {label:40} no calls")
+        return
+    elapsed = np.array([c[0] for c in calls]) * 1000
+    peaks = np.array([c[1] for c in calls]) / (1024 * 1024)
+    print(f"   {label:40} {len(calls):5} calls   total {elapsed.sum():9.1f} ms   "
+          f"p50 {np.percentile(elapsed, 50):7.2f} ms   peak {peaks.max():7.2f} MB")
+
+def main():
+    """Profile the real ChromaDB hand-off of RAGServiceImpl: the indexing loop and _search"""
+    parser = argparse.ArgumentParser(description="Allocation profile of the embedding hand-off to ChromaDB")
+    parser.add_argument("--movies", default="data/processed/chunks/movies_part1.json")
+    parser.add_argument("--games", default="data/processed/chunks/games_part1.json")
+    parser.add_argument("--items", type=int, default=5000, help="Catalog items indexed")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    repository = JSONMediaRepository(movies_path=args.movies, games_path=args.games)
+    items = repository.get_all_items()[:args.items]
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as db_path:
+        # Default float32 storage: the service talks to ChromaDB (needs COHERE_API_KEY)
+        service = create_rag_service(repository, db_path=db_path, ensure_index=False, storage_mode="float32")
+        service.text_collection = ProfiledCollection(service.text_collection)
+
+        print("Embedding Hand-off Profile (RAGServiceImpl + ChromaDB)")
+        print("=" * 50)
+        print(f"{len(items):,} items, batch size {service.batch_size}, model {service.text_model}\n")
+
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        service._index_text_embeddings(items)
+        indexing_time = time.perf_counter() - start_time
+
+        sample = rng.choice(len(items), size=min(args.queries, len(items)), replace=False)
+        queries = [service.text_encoder.encode([items[i].title], normalize_embeddings=True)[0] for i in sample]
+        genres = sorted({genre for item in items for genre in item.genres})
+        genre_filter = MediaFilter(genres=genres[:1]) if genres else None
+        search_times = {"unfiltered": [], "genre filter": []}
+        for query in queries:
+            for label, media_filter in (("unfiltered", None), ("genre filter", genre_filter)):
+                start_time = time.perf_counter()
+                service._search(query, n_results=10, filters=media_filter)
+                search_times[label].append(time.perf_counter() - start_time)
+
+        collection = service.text_collection
+        print("NumPy hand-off (current path):")
+        print(f"   indexing loop (encode + add)             total {indexing_time * 1000:9.1f} ms")
+        report("text_collection.add", collection.calls["add"])
+        report("text_collection.query", collection.calls["query"])
+        for label, times in search_times.items():
+            print(f"   _search, {label:31} p50 {np.percentile(np.array(times) * 1000, 50):7.2f} ms")
+
+        # Same calls with the former list-of-floats arguments, on a fresh collection
+        list_collection = ProfiledCollection(service.chroma_client.get_or_create_collection(
+            name="text_embeddings_lists", metadata={"hnsw:space": "cosine"}
+        ))
+        for batch in collection.added_batches:
+            list_collection.add(**{**batch, "embeddings": batch["embeddings"].tolist()})
+        for query in queries:
+            list_collection.query(query_embeddings=[query.tolist()], n_results=10)
+        tracemalloc.stop()
+
+        print("\nList-of-floats hand-off (former path, same batches):")
+        report("collection.add(embeddings.tolist())", list_collection.calls["add"])
+        report("collection.query([query.tolist()])", list_collection.calls["query"])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import sys
+from pathlib import Path
+import time
+import random
+import argparse
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.adapter import neo4j_queries as queries
+from infrastructure.adapter.neo4j_driver import get_driver, close_driver
+from infrastructure.adapter.neo4j_review_repository import Neo4jReviewRepository
+
+# Operators meaning the query is not anchored on an index
+SCAN_OPERATORS = ("AllNodesScan", "NodeByLabelScan")
+
+def walk(plan, depth=0):
+    """Yield (depth, operator, rows, db hits) of a PROFILE plan, depth first"""
+    operator = plan["operatorType"].split("@")[0]
+    yield depth, operator, plan.get("rows", 0), plan.get("dbHits", 0)
+    for child in plan.get("children", []):
+        yield from walk(child, depth + 1)
+
+def profile(driver, username: str, k: int):
+    with driver.session() as session:
+        summary = session.run(
+            "PROFILE " + queries.RECOMMENDED_CONTENT, **queries.recommendation_parameters(username, k)
+        ).consume()
+    return list(walk(summary.profile))
+
+def main():
+    """PROFILE of recommendedContent plus its latency over a sample of users"""
+    parser = argparse.ArgumentParser(description="Profile the friend-of-friend recommendation query")
+    parser.add_argument("--user", help="User to print the plan for (default: a random one)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=100, help="Timed queries over random users")
+    args = parser.parse_args()
+
+    driver = get_driver()
+    repository = Neo4jReviewRepository(driver=driver)
+    rng = random.Random(42)
+    usernames = [user.name for user in repository.get_all_users()]
+    if not usernames:
+        print("No users in the graph: run setup_neo4j.py or scripts/benchmark_friend_reviews.py --keep first")
+        return
+
+    try:
+        username = args.user or rng.choice(usernames)
+        operators = profile(driver, username, args.k)
+        print(f"PROFILE recommendedContent(username={username!r}, k={args.k})")
+        print("=" * 50)
+        for depth, operator, rows, db_hits in operators:
+            print(f"{'  ' * depth}{operator:<{40 - 2 * depth}} rows={rows:<8} dbHits={db_hits}")
+        scans = [operator for _, operator, _, _ in operators if operator in SCAN_OPERATORS]
+        print(f"\nTotal db hits: {sum(db_hits for *_, db_hits in operators)}")
+        print("Index-driven: " + ("no, found " + ", ".join(scans) if scans else "yes"))
+
+        for name in rng.sample(usernames, min(10, len(usernames))):  # warm up the plan cache
+            repository.get_recommended_content(name, args.k)
+        latencies = []
+        for _ in range(args.queries):
+            start_time = time.perf_counter()
+            repository.get_recommended_content(rng.choice(usernames), args.k)
+            latencies.append((time.perf_counter() - start_time) * 1000)
+        latencies = np.array(latencies)
+        print(f"\nLatency over {args.queries} random users ({len(usernames):,} in the graph)")
+        print(f"   - p50: {np.percentile(latencies, 50):.2f}ms")
+        print(f"   - p95: {np.percentile(latencies, 95):.2f}ms")
+        print(f"   - max: {latencies.max():.2f}ms")
+    finally:
+        close_driver()
+
+if __name__ == "__main__":
+    main()
@@ -136,48 +136,48 @@ def setup_sample_data():
     
     try:
         from neo4j import GraphDatabase
+        from domain.model.user import User
+        from domain.model.content import Content
+        from infrastructure.adapter.neo4j_review_repository import Neo4jReviewRepository
         
         driver = GraphDatabase.driver(
             "bolt://localhost:7687", 
             auth=("neo4j", "password")
         )
+        repository = Neo4jReviewRepository(driver=driver)
         
-        with driver.session() as session:
-            # Create sample users
-            session.run("""
-            MERGE (u1:User {name: 'Alice', avatarUrl: 'https://via.placeholder.com/100'})
-            MERGE (u2:User {name: 'Bob', avatarUrl: 'https://via.placeholder.com/100'})
-            MERGE (u3:User {name: 'Charlie', avatarUrl: 'https://via.placeholder.com/100'})
-            """)
-            
-            # Create sample content
-            session.run("""
-            MERGE (c1:Content {
-                title: 'The Matrix', 
-                type: 'movie', 
-                platform: 'Netflix',
-                posterUrl: 'https://via.placeholder.com/200x300'
-            })
-            MERGE (c2:Content {
-                title: 'Cyberpunk 2077', 
-                type: 'game', 
-                platform: 'Steam',
-                posterUrl: 'https://via.placeholder.com/200x300'
-            })
-            """)
-            
-            # Create sample reviews
-            session.run("""
-            MATCH (u:User {name: 'Alice'}), (c:Content {title: 'The Matrix'})
-            MERGE (u)-[:REVIEWED]->(r:Review {
-                id: randomUUID(),
-                rating: 9,
-                comment: 'Amazing sci-fi movie with groundbreaking effects!',
-                createdAt: datetime()
-            })-[:ABOUT]->(c)
-            """)
-            
-            print("Sample data created successfully!")
+        # Each bulk call is one UNWIND statement per batch
+        repository.upsert_users_bulk([
+            User(name='Alice', avatarUrl='https://via.placeholder.com/100'),
+            User(name='Bob', avatarUrl='https://via.placeholder.com/100'),
+            User(name='Charlie', avatarUrl='https://via.placeholder.com/100')
+        ])
+        
+        repository.upsert_content_bulk([
+            Content(title='The Matrix', type_='movie', platform='Netflix',
+                    posterUrl='https://via.placeholder.com/200x300'),
+            Content(title='Cyberpunk 2077', type_='game', platform='Steam',
+                    posterUrl='https://via.placeholder.com/200x300')
+        ])
+        
+        repository.add_friends_bulk([
+            ('Alice', 'Bob'),
+            ('Bob', 'Alice'),
+            ('Charlie', 'Alice')
+        ])
+        
+        # Same relationships as the repository queries: (User)-[:WROTE]->(Review)-[:REVIEWS]->(Content)
+        if not repository.get_reviews_for_users(['Alice'])['Alice']:
+            repository.create_reviews_bulk([
+                {
+                    'username': 'Alice',
+                    'content_title': 'The Matrix',
+                    'rating': 9,
+                    'comment': 'Amazing sci-fi movie with groundbreaking effects!'
+                }
+            ])
+        
+        print("Sample data created successfully!")
         
         driver.close()
         return True
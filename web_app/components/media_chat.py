@@ -69,8 +69,8 @@ def start_media_chat(item, prompt: str, rag_service):
             }
         })
         
-        # Get response from RAG service
-        response = rag_service.query_with_text(enhanced_prompt, media_type=item.type)
+        # Get response from RAG service, reusing the item's stored vector for similar titles
+        response = rag_service.query_about_item(enhanced_prompt, item.id, media_type=item.type)
         
         # Add assistant response
         st.session_state.messages.append({
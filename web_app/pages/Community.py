@@ -293,11 +293,12 @@ st.markdown("""
 # Add error handling for GraphQL imports
 try:
     from infrastructure.adapter.graphql_review_client import (
-        get_all_users,
-        get_my_friends,
-        get_friend_reviews,
-        get_my_reviews,
-        get_all_content,
+        get_community_dashboard,
+        get_trending_content,
+        get_recommended_content,
+        fetch_concurrently,
+        get_friend_reviews_page,
+        get_my_reviews_page,
         add_friend,
         remove_friend,
         post_review,
@@ -311,6 +312,46 @@ except Exception as e:
 # Initialize session state
 if "current_user" not in st.session_state:
     st.session_state.current_user = None
+if "feeds" not in st.session_state:
+    st.session_state.feeds = {}
+
+FEED_PAGE_SIZE = 10
+TRENDING_WINDOW_DAYS = 7
+
+def result_or_error(fetch):
+    """Result of a side-panel query, or its error message: side panels must not block the page"""
+    try:
+        return fetch()
+    except Exception as e:
+        return str(e)
+
+def load_feed(key, first_page):
+    """Pages of a review feed loaded so far, starting from the dashboard's first page"""
+    if key not in st.session_state.feeds:
+        page = first_page
+        st.session_state.feeds[key] = {
+            "items": page["items"],
+            "cursor": page["endCursor"],
+            "has_next": page["hasNextPage"]
+        }
+    return st.session_state.feeds[key]
+
+def render_load_more(key, fetch_page):
+    """'Load more' button appending the next page of a feed"""
+    feed = st.session_state.feeds.get(key)
+    if feed and feed["has_next"] and st.button("Load more", key=f"more_{key}"):
+        try:
+            page = fetch_page(feed["cursor"])
+            feed["items"] += page["items"]
+            feed["cursor"] = page["endCursor"]
+            feed["has_next"] = page["hasNextPage"]
+            st.rerun()
+        except Exception as e:
+            st.error(f"❌ Unable to load more reviews: {e}")
+
+def reset_feeds():
+    """Forget loaded pages so feeds restart from the newest reviews"""
+    st.session_state.feeds = {}
 
 # Check if GraphQL services are available
 if not GRAPHQL_AVAILABLE:
@@ -353,11 +394,19 @@ if not GRAPHQL_AVAILABLE:
 with st.sidebar:
     st.title("Profile & Friends")
 
-    # Retrieve the list of users for the selector
+    # Users, friends, first feed pages and content in one request, trends in parallel
+    # Read on the script thread: pool threads have no ScriptRunContext, so no session state
+    username = st.session_state.current_user or ""
     try:
-        all_users = get_all_users()
+        page_data = fetch_concurrently(
+            dashboard=lambda: get_community_dashboard(username, FEED_PAGE_SIZE),
+            trending=lambda: result_or_error(lambda: get_trending_content(TRENDING_WINDOW_DAYS)),
+            recommended=lambda: result_or_error(lambda: get_recommended_content(username))
+        )
+        dashboard = page_data["dashboard"]
+        all_users = dashboard["allUsers"]
     except Exception as e:
-        st.error(f"❌ Unable to load users: {e}")
+        st.error(f"❌ Unable to load community data: {e}")
         st.info("Please ensure GraphQL server is running on port 5050")
         st.stop()
         
@@ -387,12 +436,7 @@ with st.sidebar:
     st.header("🤝 My Friends")
 
     current_user_name = st.session_state.current_user
-    
-    try:
-        my_friends = get_my_friends(current_user_name)
-    except Exception as e:
-        st.error(f"❌ Unable to load friends: {e}")
-        my_friends = []
+    my_friends = dashboard["friends"]
 
     # Display current friends with a remove button
     for friend in my_friends:
@@ -406,7 +450,7 @@ with st.sidebar:
                 try:
                     remove_friend(current_user_name, friend['name'])
                     st.toast(f"{friend['name']} has been removed from your friends.")
-                    st.cache_data.clear()  # Clear cache to refresh the list
+                    reset_feeds()
                     st.rerun()
                 except Exception as e:
                     st.error(f"❌ Error removing friend: {e}")
@@ -425,7 +469,7 @@ with st.sidebar:
             try:
                 add_friend(current_user_name, friend_to_add)
                 st.toast(f"You are now friends with {friend_to_add}!")
-                st.cache_data.clear()
+                reset_feeds()
                 st.rerun()
             except Exception as e:
                 st.error(f"❌ Error adding friend: {e}")
@@ -449,8 +493,10 @@ with main_col:
     with tab_friends:
         st.header("What's new with your friends?")
         
+        friends_feed_key = f"friends:{st.session_state.current_user}"
+        fetch_friend_reviews = lambda after: get_friend_reviews_page(st.session_state.current_user, FEED_PAGE_SIZE, after)
         try:
-            friend_reviews = get_friend_reviews(st.session_state.current_user)
+            friend_reviews = load_feed(friends_feed_key, dashboard["friendReviews"])["items"]
         except Exception as e:
             st.error(f"❌ Unable to load friend reviews: {e}")
             friend_reviews = []
@@ -485,12 +531,16 @@ with main_col:
                     with col_comment:
                         st.markdown(f"> _{review['comment']}_")
 
+            render_load_more(friends_feed_key, fetch_friend_reviews)
+
     # --- Tab 2: Manage your own reviews ---
     with tab_my_reviews:
         st.header("Your Publications")
         
+        my_feed_key = f"mine:{st.session_state.current_user}"
+        fetch_my_reviews = lambda after: get_my_reviews_page(st.session_state.current_user, FEED_PAGE_SIZE, after)
         try:
-            my_reviews = get_my_reviews(st.session_state.current_user)
+            my_reviews = load_feed(my_feed_key, dashboard["myReviews"])["items"]
         except Exception as e:
             st.error(f"❌ Unable to load your reviews: {e}")
             my_reviews = []
@@ -512,21 +562,19 @@ with main_col:
                             try:
                                 delete_review(review['id'])
                                 st.toast("Review deleted!")
-                                st.cache_data.clear()
+                                reset_feeds()
                                 st.rerun()
                             except Exception as e:
                                 st.error(f"❌ Error deleting review: {e}")
 
+            render_load_more(my_feed_key, fetch_my_reviews)
+
     # --- Tab 3: Publish a new review ---
     with tab_publish:
         st.header("Share your opinion")
 
-        # Retrieve the list of content for the form
-        try:
-            content_list = get_all_content()
-        except Exception as e:
-            st.error(f"❌ Unable to load content: {e}")
-            content_list = []
+        # List of content for the form, loaded with the dashboard
+        content_list = dashboard["allContent"]
 
         if not content_list:
             st.warning("No content to rate was found in the database.")
@@ -547,29 +595,51 @@ with main_col:
                             result = post_review(st.session_state.current_user, selected_content, rating, comment)
                             if result:
                                 st.success(f"Your review on **{selected_content}** has been published! 🎉")
-                                # Clear cache so the new review appears immediately
-                                st.cache_data.clear()
+                                reset_feeds()
                             else:
                                 st.error("An error occurred while publishing.")
                         except Exception as e:
                             st.error(f"❌ Error posting review: {e}")
 
-# --- RIGHT SIDEBAR: Global Trends (hardcoded data) ---
+# --- RIGHT SIDEBAR: Recommendations and community trends (computed in the graph) ---
 with right_sidebar:
-    st.header("🌍 Global Trends")
-    st.caption("Reviews and scores from the specialized press")
-
-    MOCK_GLOBAL_API_DATA = [
-        {"source": "IGN", "title": "Final Fantasy VII Rebirth", "snippet": "A masterpiece, 9/10."},
-        {"source": "Rotten Tomatoes", "title": "Fallout (Series)",
-         "snippet": "Score of 94% - A faithful and inspired adaptation."},
-        {"source": "JeuxVideo.com", "title": "Dragon's Dogma 2",
-         "snippet": "A unique adventure but technically dated. 16/20."},
-        {"source": "Le Monde", "title": "Oppenheimer", "snippet": "An intense and spectacular biopic."},
-    ]
-
-    for item in MOCK_GLOBAL_API_DATA:
-        with st.container(border=True):
-            st.markdown(f"**{item['title']}**")
-            st.markdown(f"_{item['snippet']}_")
-            st.caption(f"Source: {item['source']}")
\ No newline at end of file
+    st.header("💡 For you")
+    st.caption("Rated highly by your friends and their friends")
+
+    recommended = page_data["recommended"]
+    if isinstance(recommended, str):
+        st.error(f"❌ Unable to load recommendations: {recommended}")
+    elif not recommended:
+        st.info("Add friends to get recommendations.")
+    else:
+        for item in recommended:
+            content = item["content"]
+            with st.container(border=True):
+                st.markdown(f"**{content['title']}**")
+                st.caption(
+                    f"{content['type']} on {content['platform']} · "
+                    f"liked by {item['recommenders']} of your network"
+                )
+
+    st.header("🌍 Trending")
+    st.caption(f"Most reviewed by the community over the last {TRENDING_WINDOW_DAYS} days")
+
+    trending = page_data["trending"]
+    if isinstance(trending, str):
+        st.error(f"❌ Unable to load trends: {trending}")
+    elif not trending:
+        st.info(f"No reviews in the last {TRENDING_WINDOW_DAYS} days yet.")
+    else:
+        for item in trending:
+            content = item["content"]
+            with st.container(border=True):
+                st.markdown(f"**{content['title']}**")
+                st.markdown(
+                    f"_{item['recentReviews']} recent review(s) · "
+                    f"{item['recentAverageRating']:.1f}/10_"
+                )
+                if content["reviewCount"]:
+                    st.caption(
+                        f"{content['type']} on {content['platform']} · "
+                        f"{content['averageRating']:.1f}/10 over {content['reviewCount']} review(s)"
+                    )
@@ -18,7 +18,7 @@ from web_app.components.navigation import render_top_navigation
 from web_app.components.media_chat import render_media_chat_history
 
 # Import RAG service
-from application.rag_factory import create_rag_service
+from application.rag_factory import create_rag_service, connect_social_graph
 from domain.adapter.json_media_repository import JSONMediaRepository
 
 st.set_page_config(
@@ -343,7 +343,8 @@ def initialize_rag_service():
                     text_model="all-MiniLM-L6-v2",
                     enable_visual=True,  # Enable visual for poster queries
                     batch_size=32,
-                    ensure_index=False  # Prevent re-indexing in UI
+                    ensure_index=False,  # Prevent re-indexing in UI
+                    social_graph=connect_social_graph(repository)  # Friends' ratings of the Community page user
                 )
                 st.session_state.current_dataset = selected_dataset
                 st.session_state.dataset_name = dataset_name
@@ -448,7 +449,9 @@ def main():
         with st.chat_message("assistant"):
             with st.spinner("Thinking..."):
                 try:
-                    response = st.session_state.rag_service.query_with_text(prompt, media_type=media_type)
+                    response = st.session_state.rag_service.query_with_text(
+                        prompt, media_type=media_type, username=st.session_state.get("current_user")
+                    )
                     st.markdown(response)
                     st.session_state.messages.append({"role": "assistant", "content": response})
                 except Exception as e: